@@ -0,0 +1,32 @@
+"""Per-user unread notification counters
+
+Revision ID: 2a6d8f4c1e93
+Revises: 9c3e1f7a5d20
+Create Date: 2026-10-17 17:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2a6d8f4c1e93'
+down_revision: Union[str, None] = '9c3e1f7a5d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows are filled lazily on first read, so no backfill is needed
+    op.create_table(
+        'notification_counters',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('unread_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP')),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('notification_counters')
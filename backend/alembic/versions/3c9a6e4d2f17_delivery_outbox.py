@@ -0,0 +1,52 @@
+"""Email/SMS delivery outbox
+
+Revision ID: 3c9a6e4d2f17
+Revises: 8e5c1b7f3a64
+Create Date: 2026-10-17 23:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9a6e4d2f17'
+down_revision: Union[str, None] = '8e5c1b7f3a64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'delivery_outbox',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('channel', sa.String(length=10), nullable=False),
+        sa.Column('recipient', sa.String(length=255), nullable=False),
+        sa.Column('subject', sa.String(length=255), nullable=False),
+        sa.Column('body', sa.Text(), nullable=False),
+        sa.Column('notification_type', sa.String(length=50)),
+        sa.Column('related_contract_id', sa.Integer(), sa.ForeignKey('contracts.id', ondelete='CASCADE')),
+        sa.Column('related_document_id', sa.Integer(), sa.ForeignKey('documents.id', ondelete='CASCADE')),
+        sa.Column('dedupe_key', sa.String(length=255), unique=True),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=False,
+                  server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('locked_at', sa.DateTime(timezone=True)),
+        sa.Column('sent_at', sa.DateTime(timezone=True)),
+        sa.Column('last_error', sa.Text()),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP')),
+    )
+    op.create_index(
+        'idx_delivery_outbox_pending', 'delivery_outbox', ['channel', 'next_attempt_at'],
+        postgresql_where=sa.text("status = 'pending'")
+    )
+    op.create_index('idx_delivery_outbox_sent_at', 'delivery_outbox', ['sent_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_delivery_outbox_sent_at', table_name='delivery_outbox')
+    op.drop_index('idx_delivery_outbox_pending', table_name='delivery_outbox')
+    op.drop_table('delivery_outbox')
@@ -0,0 +1,36 @@
+"""Composite indexes for keyset pagination
+
+Revision ID: 3f1c2a9d8b01
+Revises:
+Create Date: 2026-10-17 10:00:00
+
+The base schema is created by init.sql; this is the first revision on top of it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9d8b01'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_contracts_created_at_id', 'contracts', ['created_at', 'id'], if_not_exists=True)
+    op.create_index('idx_contracts_end_date_id', 'contracts', ['end_date', 'id'], if_not_exists=True)
+    op.create_index('idx_documents_created_at_id', 'documents', ['created_at', 'id'], if_not_exists=True)
+    op.create_index(
+        'idx_notifications_user_created_at_id', 'notifications', ['user_id', 'created_at', 'id'],
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_notifications_user_created_at_id', table_name='notifications', if_exists=True)
+    op.drop_index('idx_documents_created_at_id', table_name='documents', if_exists=True)
+    op.drop_index('idx_contracts_end_date_id', table_name='contracts', if_exists=True)
+    op.drop_index('idx_contracts_created_at_id', table_name='contracts', if_exists=True)
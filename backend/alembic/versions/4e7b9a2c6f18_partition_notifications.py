@@ -0,0 +1,126 @@
+"""Range-partition notifications by month on created_at
+
+Revision ID: 4e7b9a2c6f18
+Revises: 2a6d8f4c1e93
+Create Date: 2026-10-17 18:00:00
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e7b9a2c6f18'
+down_revision: Union[str, None] = '2a6d8f4c1e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+COLUMNS = (
+    "id, user_id, title, message, type, is_read, related_contract_id, "
+    "related_document_id, scheduled_date, created_at"
+)
+
+INDEXES = [
+    ('idx_notifications_user_id', ['user_id']),
+    ('idx_notifications_is_read', ['is_read']),
+    ('idx_notifications_user_created_at_id', ['user_id', 'created_at', 'id']),
+]
+
+
+def add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def drop_indexes() -> None:
+    for index_name, _ in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+
+def create_indexes() -> None:
+    for index_name, columns in INDEXES:
+        op.create_index(index_name, 'notifications', columns)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    op.execute("ALTER TABLE notifications RENAME TO notifications_unpartitioned")
+    op.execute("ALTER TABLE notifications_unpartitioned RENAME CONSTRAINT notifications_pkey TO notifications_unpartitioned_pkey")
+    op.execute("ALTER SEQUENCE notifications_id_seq OWNED BY NONE")
+    op.execute("DROP INDEX IF EXISTS ix_notifications_id")
+    drop_indexes()
+
+    op.execute("""
+        CREATE TABLE notifications (
+            id INTEGER NOT NULL DEFAULT nextval('notifications_id_seq'),
+            user_id INTEGER REFERENCES users(id),
+            title VARCHAR(255) NOT NULL,
+            message TEXT NOT NULL,
+            type VARCHAR(50) DEFAULT 'info',
+            is_read BOOLEAN DEFAULT FALSE,
+            related_contract_id INTEGER REFERENCES contracts(id),
+            related_document_id INTEGER REFERENCES documents(id),
+            scheduled_date TIMESTAMP WITH TIME ZONE,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("ALTER SEQUENCE notifications_id_seq OWNED BY notifications.id")
+    op.execute("CREATE TABLE notifications_default PARTITION OF notifications DEFAULT")
+
+    # One partition per month from the oldest existing row to MONTHS_AHEAD months ahead
+    oldest = bind.execute(sa.text(
+        "SELECT min(created_at AT TIME ZONE 'UTC')::date FROM notifications_unpartitioned"
+    )).scalar()
+    current = date.today().replace(day=1)
+    month = (oldest or current).replace(day=1)
+    last = add_months(current, MONTHS_AHEAD)
+    while month <= last:
+        following = add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE notifications_p{month:%Y%m} PARTITION OF notifications "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{following.isoformat()} 00:00:00+00')"
+        )
+        month = following
+
+    op.execute(
+        f"INSERT INTO notifications ({COLUMNS}) "
+        f"SELECT id, user_id, title, message, type, is_read, related_contract_id, "
+        f"related_document_id, scheduled_date, COALESCE(created_at, CURRENT_TIMESTAMP) "
+        f"FROM notifications_unpartitioned"
+    )
+    op.drop_table('notifications_unpartitioned')
+    create_indexes()
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE notifications RENAME TO notifications_partitioned")
+    op.execute("ALTER TABLE notifications_partitioned RENAME CONSTRAINT notifications_pkey TO notifications_partitioned_pkey")
+    op.execute("ALTER SEQUENCE notifications_id_seq OWNED BY NONE")
+    drop_indexes()
+
+    op.execute("""
+        CREATE TABLE notifications (
+            id INTEGER PRIMARY KEY DEFAULT nextval('notifications_id_seq'),
+            user_id INTEGER REFERENCES users(id),
+            title VARCHAR(255) NOT NULL,
+            message TEXT NOT NULL,
+            type VARCHAR(50) DEFAULT 'info',
+            is_read BOOLEAN DEFAULT FALSE,
+            related_contract_id INTEGER REFERENCES contracts(id),
+            related_document_id INTEGER REFERENCES documents(id),
+            scheduled_date TIMESTAMP WITH TIME ZONE,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    op.execute("ALTER SEQUENCE notifications_id_seq OWNED BY notifications.id")
+    op.execute(f"INSERT INTO notifications ({COLUMNS}) SELECT {COLUMNS} FROM notifications_partitioned")
+    # Drops every partition with it
+    op.drop_table('notifications_partitioned')
+    create_indexes()
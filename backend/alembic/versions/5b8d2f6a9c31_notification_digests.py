@@ -0,0 +1,52 @@
+"""Notification digests
+
+Revision ID: 5b8d2f6a9c31
+Revises: 3c9a6e4d2f17
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8d2f6a9c31'
+down_revision: Union[str, None] = '3c9a6e4d2f17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('notifications', sa.Column('link', sa.String(length=255)))
+    op.add_column('broadcast_notifications', sa.Column('link', sa.String(length=255)))
+
+    op.create_table(
+        'notification_digest_items',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('notification_type', sa.String(length=50), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE')),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('related_contract_id', sa.Integer(), sa.ForeignKey('contracts.id', ondelete='CASCADE')),
+        sa.Column('related_document_id', sa.Integer(), sa.ForeignKey('documents.id', ondelete='CASCADE')),
+        sa.Column('due_date', sa.Date()),
+        sa.Column('dedupe_key', sa.String(length=255), nullable=False, unique=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('digested_at', sa.DateTime(timezone=True)),
+    )
+    op.create_index(
+        'idx_digest_items_pending', 'notification_digest_items', ['notification_type'],
+        postgresql_where=sa.text('digested_at IS NULL')
+    )
+    op.create_index('idx_digest_items_created_at', 'notification_digest_items', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_digest_items_created_at', table_name='notification_digest_items')
+    op.drop_index('idx_digest_items_pending', table_name='notification_digest_items')
+    op.drop_table('notification_digest_items')
+
+    op.drop_column('broadcast_notifications', 'link')
+    op.drop_column('notifications', 'link')
@@ -0,0 +1,32 @@
+"""Content-addressed document blobs
+
+Revision ID: 5b8f0d3e6a72
+Revises: c27e9f4a1d36
+Create Date: 2026-10-17 13:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8f0d3e6a72'
+down_revision: Union[str, None] = 'c27e9f4a1d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'document_blobs',
+        sa.Column('sha256', sa.String(length=64), primary_key=True),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='1'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('document_blobs')
@@ -0,0 +1,44 @@
+"""Persistent reminder event queue
+
+Revision ID: 6f3a9d2e8b47
+Revises: d1a4b7e9c263
+Create Date: 2026-10-17 21:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f3a9d2e8b47'
+down_revision: Union[str, None] = 'd1a4b7e9c263'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled by the scheduler on its first start (or scripts/rebuild_reminder_events.py)
+    op.create_table(
+        'reminder_events',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('notification_type', sa.String(length=50), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('due_date', sa.Date(), nullable=False),
+        sa.Column('tier', sa.Integer(), nullable=False),
+        sa.Column('fire_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('fired_at', sa.DateTime(timezone=True)),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP')),
+    )
+    op.create_index(
+        'idx_reminder_events_pending_fire_at', 'reminder_events', ['fire_at'],
+        postgresql_where=sa.text('fired_at IS NULL')
+    )
+    op.create_index('idx_reminder_events_entity', 'reminder_events', ['notification_type', 'entity_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_reminder_events_entity', table_name='reminder_events')
+    op.drop_index('idx_reminder_events_pending_fire_at', table_name='reminder_events')
+    op.drop_table('reminder_events')
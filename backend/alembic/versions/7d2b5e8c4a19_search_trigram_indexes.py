@@ -0,0 +1,42 @@
+"""Trigram and tag GIN indexes for contract and document search
+
+Revision ID: 7d2b5e8c4a19
+Revises: e41a7c9b2f58
+Create Date: 2026-10-17 15:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2b5e8c4a19'
+down_revision: Union[str, None] = 'e41a7c9b2f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = [
+    ('idx_contracts_contract_number_trgm', 'contracts', 'contract_number'),
+    ('idx_contracts_client_name_trgm', 'contracts', 'client_name'),
+    ('idx_contracts_property_address_trgm', 'contracts', 'property_address'),
+    ('idx_documents_title_trgm', 'documents', 'title'),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for index_name, table_name, column_name in TRIGRAM_INDEXES:
+        op.create_index(
+            index_name, table_name, [column_name],
+            postgresql_using='gin', postgresql_ops={column_name: 'gin_trgm_ops'}
+        )
+    op.create_index('idx_documents_tags', 'documents', ['tags'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('idx_documents_tags', table_name='documents')
+    for index_name, table_name, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(index_name, table_name=table_name)
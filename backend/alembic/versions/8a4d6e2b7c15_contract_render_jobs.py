@@ -0,0 +1,45 @@
+"""Contract render job queue
+
+Revision ID: 8a4d6e2b7c15
+Revises: 3f1c2a9d8b01
+Create Date: 2026-10-17 11:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a4d6e2b7c15'
+down_revision: Union[str, None] = '3f1c2a9d8b01'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('contracts', sa.Column('render_status', sa.String(length=50), server_default='pending'))
+    # Contracts rendered synchronously before this revision already have their PDF
+    op.execute("UPDATE contracts SET render_status = 'ready' WHERE contract_file_path IS NOT NULL")
+
+    op.create_table(
+        'contract_render_jobs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('contract_id', sa.Integer(), sa.ForeignKey('contracts.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('error', sa.Text()),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('started_at', sa.DateTime(timezone=True)),
+        sa.Column('finished_at', sa.DateTime(timezone=True)),
+    )
+    op.create_index('idx_render_jobs_status_id', 'contract_render_jobs', ['status', 'id'])
+    op.create_index('idx_render_jobs_contract_id', 'contract_render_jobs', ['contract_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_render_jobs_contract_id', table_name='contract_render_jobs')
+    op.drop_index('idx_render_jobs_status_id', table_name='contract_render_jobs')
+    op.drop_table('contract_render_jobs')
+    op.drop_column('contracts', 'render_status')
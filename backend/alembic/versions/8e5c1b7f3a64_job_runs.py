@@ -0,0 +1,40 @@
+"""Scheduled job run history
+
+Revision ID: 8e5c1b7f3a64
+Revises: 6f3a9d2e8b47
+Create Date: 2026-10-17 22:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e5c1b7f3a64'
+down_revision: Union[str, None] = '6f3a9d2e8b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'job_runs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('job_name', sa.String(length=100), nullable=False),
+        sa.Column('scheduled_for', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='running'),
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('finished_at', sa.DateTime(timezone=True)),
+        sa.Column('duration_ms', sa.Integer()),
+        sa.Column('rows_affected', sa.Integer()),
+        sa.Column('error', sa.Text()),
+        sa.Column('host', sa.String(length=255)),
+    )
+    op.create_index('idx_job_runs_job_name_started_at', 'job_runs', ['job_name', 'started_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_job_runs_job_name_started_at', table_name='job_runs')
+    op.drop_table('job_runs')
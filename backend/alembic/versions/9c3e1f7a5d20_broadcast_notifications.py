@@ -0,0 +1,61 @@
+"""Broadcast notifications stored once with per-user read state
+
+Revision ID: 9c3e1f7a5d20
+Revises: 7d2b5e8c4a19
+Create Date: 2026-10-17 16:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3e1f7a5d20'
+down_revision: Union[str, None] = '7d2b5e8c4a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'broadcast_notifications',
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('notifications_id_seq')"), primary_key=True),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('type', sa.String(length=50), server_default='info'),
+        sa.Column('related_contract_id', sa.Integer(), sa.ForeignKey('contracts.id', ondelete='CASCADE')),
+        sa.Column('related_document_id', sa.Integer(), sa.ForeignKey('documents.id', ondelete='CASCADE')),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP')),
+    )
+    op.create_index(
+        'idx_broadcast_notifications_created_at_id', 'broadcast_notifications', ['created_at', 'id']
+    )
+    op.create_index(
+        'idx_broadcast_notifications_contract_type', 'broadcast_notifications',
+        ['related_contract_id', 'type', 'created_at']
+    )
+
+    op.create_table(
+        'broadcast_receipts',
+        sa.Column('broadcast_id', sa.Integer(),
+                  sa.ForeignKey('broadcast_notifications.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('is_read', sa.Boolean()),
+        sa.Column('deleted_at', sa.DateTime(timezone=True)),
+    )
+
+    op.create_table(
+        'broadcast_watermarks',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('read_up_to_id', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('broadcast_watermarks')
+    op.drop_table('broadcast_receipts')
+    op.drop_index('idx_broadcast_notifications_contract_type', table_name='broadcast_notifications')
+    op.drop_index('idx_broadcast_notifications_created_at_id', table_name='broadcast_notifications')
+    op.drop_table('broadcast_notifications')
@@ -0,0 +1,27 @@
+"""Contract content fingerprint
+
+Revision ID: a7e3c5f1b902
+Revises: 5b8d2f6a9c31
+Create Date: 2026-10-18 01:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7e3c5f1b902'
+down_revision: Union[str, None] = '5b8d2f6a9c31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # NULL until the next render; such contracts re-render on their next edit
+    op.add_column('contracts', sa.Column('content_fingerprint', sa.String(length=64)))
+
+
+def downgrade() -> None:
+    op.drop_column('contracts', 'content_fingerprint')
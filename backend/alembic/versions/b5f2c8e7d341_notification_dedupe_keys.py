@@ -0,0 +1,85 @@
+"""Dedupe keys for generated notifications
+
+Revision ID: b5f2c8e7d341
+Revises: 4e7b9a2c6f18
+Create Date: 2026-10-17 19:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5f2c8e7d341'
+down_revision: Union[str, None] = '4e7b9a2c6f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same tiers as NotificationService; days left at the time the row was created
+TIER = "CASE WHEN {end} - {created}::date <= 1 THEN 1 WHEN {end} - {created}::date <= 7 THEN 7 ELSE 30 END"
+
+
+def upgrade() -> None:
+    op.add_column('notifications', sa.Column('dedupe_key', sa.String(length=255)))
+    op.add_column('broadcast_notifications', sa.Column('dedupe_key', sa.String(length=255)))
+    op.create_unique_constraint(
+        'broadcast_notifications_dedupe_key_key', 'broadcast_notifications', ['dedupe_key']
+    )
+    op.drop_index('idx_broadcast_notifications_contract_type', table_name='broadcast_notifications')
+
+    op.create_table(
+        'notification_keys',
+        sa.Column('dedupe_key', sa.String(length=255), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('related_contract_id', sa.Integer(), sa.ForeignKey('contracts.id', ondelete='CASCADE')),
+        sa.Column('related_document_id', sa.Integer(), sa.ForeignKey('documents.id', ondelete='CASCADE')),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP')),
+    )
+    op.create_index('idx_notification_keys_created_at', 'notification_keys', ['created_at'])
+
+    # Key the newest existing broadcast per period so the first run after the
+    # upgrade does not announce the same contracts again
+    contract_tier = TIER.format(end="c.end_date", created="b.created_at")
+    op.execute(f"""
+        UPDATE broadcast_notifications target SET dedupe_key = keyed.dedupe_key
+        FROM (
+            SELECT id, dedupe_key,
+                   row_number() OVER (PARTITION BY dedupe_key ORDER BY id DESC) AS position
+            FROM (
+                SELECT b.id, CASE b.type
+                    WHEN 'contract_expiry' THEN concat('contract_expiry:', c.id, ':', c.end_date, ':', {contract_tier})
+                    ELSE concat('payment_due:', c.id, ':', to_char(b.created_at, 'YYYY-MM'))
+                END AS dedupe_key
+                FROM broadcast_notifications b
+                JOIN contracts c ON c.id = b.related_contract_id
+                WHERE b.type IN ('contract_expiry', 'payment_due')
+            ) candidates
+        ) keyed
+        WHERE target.id = keyed.id AND keyed.position = 1
+    """)
+
+    document_tier = TIER.format(end="d.expiry_date", created="n.created_at")
+    op.execute(f"""
+        INSERT INTO notification_keys (dedupe_key, user_id, related_document_id, created_at)
+        SELECT concat('document_expiry:', d.id, ':', d.expiry_date, ':', {document_tier}, ':', n.user_id),
+               n.user_id, d.id, max(n.created_at)
+        FROM notifications n
+        JOIN documents d ON d.id = n.related_document_id
+        WHERE n.type = 'document_expiry' AND n.user_id IS NOT NULL AND d.expiry_date IS NOT NULL
+        GROUP BY 1, 2, 3
+        ON CONFLICT DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_notification_keys_created_at', table_name='notification_keys')
+    op.drop_table('notification_keys')
+    op.create_index(
+        'idx_broadcast_notifications_contract_type', 'broadcast_notifications',
+        ['related_contract_id', 'type', 'created_at']
+    )
+    op.drop_constraint('broadcast_notifications_dedupe_key_key', 'broadcast_notifications', type_='unique')
+    op.drop_column('broadcast_notifications', 'dedupe_key')
+    op.drop_column('notifications', 'dedupe_key')
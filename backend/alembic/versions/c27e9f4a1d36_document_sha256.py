@@ -0,0 +1,28 @@
+"""Document content hash
+
+Revision ID: c27e9f4a1d36
+Revises: 8a4d6e2b7c15
+Create Date: 2026-10-17 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c27e9f4a1d36'
+down_revision: Union[str, None] = '8a4d6e2b7c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('documents', sa.Column('sha256', sa.String(length=64)))
+    op.create_index('idx_documents_sha256', 'documents', ['sha256'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_documents_sha256', table_name='documents')
+    op.drop_column('documents', 'sha256')
@@ -0,0 +1,57 @@
+"""Contract data version counter
+
+Revision ID: c4e8a2f6b915
+Revises: f2c8a4d6e193
+Create Date: 2026-10-18 03:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a2f6b915'
+down_revision: Union[str, None] = 'f2c8a4d6e193'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'data_versions',
+        sa.Column('name', sa.String(), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+    )
+
+    # Runs at commit, once per transaction: the version is visible together with the
+    # changes it counts, unlike max(updated_at) (transaction start time)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_data_version() RETURNS trigger AS $$
+        BEGIN
+            IF current_setting('data_version.' || TG_TABLE_NAME, true) IS DISTINCT FROM 'bumped' THEN
+                INSERT INTO data_versions (name, version) VALUES (TG_TABLE_NAME, 1)
+                ON CONFLICT (name) DO UPDATE SET version = data_versions.version + 1;
+                PERFORM set_config('data_version.' || TG_TABLE_NAME, 'bumped', true);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE CONSTRAINT TRIGGER contracts_data_version
+        AFTER INSERT OR UPDATE OR DELETE ON contracts
+        DEFERRABLE INITIALLY DEFERRED
+        FOR EACH ROW EXECUTE FUNCTION bump_data_version()
+    """)
+
+    # Reports are no longer keyed by max(updated_at)
+    op.drop_index('idx_contracts_updated_at', table_name='contracts')
+
+
+def downgrade() -> None:
+    op.create_index('idx_contracts_updated_at', 'contracts', ['updated_at'])
+    op.execute("DROP TRIGGER IF EXISTS contracts_data_version ON contracts")
+    op.execute("DROP FUNCTION IF EXISTS bump_data_version()")
+    op.drop_table('data_versions')
@@ -0,0 +1,26 @@
+"""Index documents.expiry_date for reminder window scans
+
+Revision ID: d1a4b7e9c263
+Revises: b5f2c8e7d341
+Create Date: 2026-10-17 20:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1a4b7e9c263'
+down_revision: Union[str, None] = 'b5f2c8e7d341'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_documents_expiry_date', 'documents', ['expiry_date'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_documents_expiry_date', table_name='documents')
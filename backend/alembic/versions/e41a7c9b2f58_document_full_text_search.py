@@ -0,0 +1,54 @@
+"""Document full-text search
+
+Revision ID: e41a7c9b2f58
+Revises: 5b8f0d3e6a72
+Create Date: 2026-10-17 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41a7c9b2f58'
+down_revision: Union[str, None] = '5b8f0d3e6a72'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('documents', sa.Column('content_text', sa.Text()))
+    op.add_column('documents', sa.Column('search_vector', postgresql.TSVECTOR()))
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION documents_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('russian', coalesce(NEW.title, '')), 'A') ||
+                setweight(to_tsvector('russian', coalesce(array_to_string(NEW.tags, ' '), '')), 'B') ||
+                setweight(to_tsvector('russian', coalesce(NEW.description, '')), 'C') ||
+                setweight(to_tsvector('russian', coalesce(NEW.content_text, '')), 'D');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER documents_search_vector
+        BEFORE INSERT OR UPDATE OF title, description, tags, content_text ON documents
+        FOR EACH ROW EXECUTE FUNCTION documents_search_vector_update()
+    """)
+
+    # Index existing metadata; file contents are backfilled by scripts/reindex_documents.py
+    op.execute("UPDATE documents SET title = title")
+    op.create_index('idx_documents_search_vector', 'documents', ['search_vector'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('idx_documents_search_vector', table_name='documents')
+    op.execute("DROP TRIGGER IF EXISTS documents_search_vector ON documents")
+    op.execute("DROP FUNCTION IF EXISTS documents_search_vector_update()")
+    op.drop_column('documents', 'search_vector')
+    op.drop_column('documents', 'content_text')
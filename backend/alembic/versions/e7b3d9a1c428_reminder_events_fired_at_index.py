@@ -0,0 +1,27 @@
+"""Index fired reminder events for cleanup
+
+Revision ID: e7b3d9a1c428
+Revises: c4e8a2f6b915
+Create Date: 2026-10-18 04:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3d9a1c428'
+down_revision: Union[str, None] = 'c4e8a2f6b915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_reminder_events_fired_at', 'reminder_events', ['fired_at'],
+                    postgresql_where=sa.text('fired_at IS NOT NULL'))
+
+
+def downgrade() -> None:
+    op.drop_index('idx_reminder_events_fired_at', table_name='reminder_events')
@@ -0,0 +1,26 @@
+"""Index contracts.updated_at
+
+Revision ID: f2c8a4d6e193
+Revises: a7e3c5f1b902
+Create Date: 2026-10-18 02:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c8a4d6e193'
+down_revision: Union[str, None] = 'a7e3c5f1b902'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # max(updated_at) is read on every report download to find the data version
+    op.create_index('idx_contracts_updated_at', 'contracts', ['updated_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_contracts_updated_at', table_name='contracts')
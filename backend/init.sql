@@ -1,5 +1,7 @@
 CREATE DATABASE IF NOT EXISTS document_management;
 
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 CREATE TABLE IF NOT EXISTS users (
     id SERIAL PRIMARY KEY,
     email VARCHAR(255) UNIQUE NOT NULL,
@@ -25,11 +27,38 @@ CREATE TABLE IF NOT EXISTS contracts (
     end_date DATE NOT NULL,
     status VARCHAR(50) DEFAULT 'draft',
     contract_file_path VARCHAR(500),
+    render_status VARCHAR(50) DEFAULT 'pending',
+    content_fingerprint VARCHAR(64),
     created_by INTEGER REFERENCES users(id),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Change counters for cached reports. The constraint trigger runs at commit, so a
+-- version becomes visible together with the changes it counts, and the counter row
+-- is the last lock a transaction takes (no deadlocks with the contract rows).
+CREATE TABLE IF NOT EXISTS data_versions (
+    name VARCHAR PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION bump_data_version() RETURNS trigger AS $$
+BEGIN
+    -- Once per transaction and table
+    IF current_setting('data_version.' || TG_TABLE_NAME, true) IS DISTINCT FROM 'bumped' THEN
+        INSERT INTO data_versions (name, version) VALUES (TG_TABLE_NAME, 1)
+        ON CONFLICT (name) DO UPDATE SET version = data_versions.version + 1;
+        PERFORM set_config('data_version.' || TG_TABLE_NAME, 'bumped', true);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE CONSTRAINT TRIGGER contracts_data_version
+AFTER INSERT OR UPDATE OR DELETE ON contracts
+DEFERRABLE INITIALLY DEFERRED
+FOR EACH ROW EXECUTE FUNCTION bump_data_version();
+
 CREATE TABLE IF NOT EXISTS documents (
     id SERIAL PRIMARY KEY,
     title VARCHAR(255) NOT NULL,
@@ -37,16 +66,45 @@ CREATE TABLE IF NOT EXISTS documents (
     file_path VARCHAR(500) NOT NULL,
     file_type VARCHAR(50) NOT NULL,
     file_size INTEGER,
+    sha256 VARCHAR(64),
     contract_id INTEGER REFERENCES contracts(id),
     uploaded_by INTEGER REFERENCES users(id),
     tags TEXT[],
     expiry_date DATE,
+    content_text TEXT,
+    search_vector TSVECTOR,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Full-text search over title, tags, description and extracted file text
+CREATE OR REPLACE FUNCTION documents_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('russian', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('russian', coalesce(array_to_string(NEW.tags, ' '), '')), 'B') ||
+        setweight(to_tsvector('russian', coalesce(NEW.description, '')), 'C') ||
+        setweight(to_tsvector('russian', coalesce(NEW.content_text, '')), 'D');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER documents_search_vector
+BEFORE INSERT OR UPDATE OF title, description, tags, content_text ON documents
+FOR EACH ROW EXECUTE FUNCTION documents_search_vector_update();
+
+CREATE TABLE IF NOT EXISTS document_blobs (
+    sha256 VARCHAR(64) PRIMARY KEY,
+    size BIGINT NOT NULL,
+    ref_count INTEGER NOT NULL DEFAULT 1,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Partitioned by month so retention can drop whole partitions
+CREATE SEQUENCE IF NOT EXISTS notifications_id_seq;
+
 CREATE TABLE IF NOT EXISTS notifications (
-    id SERIAL PRIMARY KEY,
+    id INTEGER NOT NULL DEFAULT nextval('notifications_id_seq'),
     user_id INTEGER REFERENCES users(id),
     title VARCHAR(255) NOT NULL,
     message TEXT NOT NULL,
@@ -55,12 +113,172 @@ CREATE TABLE IF NOT EXISTS notifications (
     related_contract_id INTEGER REFERENCES contracts(id),
     related_document_id INTEGER REFERENCES documents(id),
     scheduled_date TIMESTAMP WITH TIME ZONE,
+    link VARCHAR(255),
+    dedupe_key VARCHAR(255),
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+ALTER SEQUENCE notifications_id_seq OWNED BY notifications.id;
+
+CREATE TABLE IF NOT EXISTS notifications_default PARTITION OF notifications DEFAULT;
+
+-- The current month and three ahead (UTC month bounds); the scheduler keeps creating them
+DO $$
+DECLARE
+    month_start DATE := date_trunc('month', CURRENT_DATE);
+BEGIN
+    FOR i IN 0..3 LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF notifications FOR VALUES FROM (%L) TO (%L)',
+            'notifications_p' || to_char(month_start + make_interval(months => i), 'YYYYMM'),
+            (month_start + make_interval(months => i))::timestamp AT TIME ZONE 'UTC',
+            (month_start + make_interval(months => i + 1))::timestamp AT TIME ZONE 'UTC'
+        );
+    END LOOP;
+END $$;
+
+-- Sent to every user but stored once; shares the notifications id sequence
+CREATE TABLE IF NOT EXISTS broadcast_notifications (
+    id INTEGER PRIMARY KEY DEFAULT nextval('notifications_id_seq'),
+    title VARCHAR(255) NOT NULL,
+    message TEXT NOT NULL,
+    type VARCHAR(50) DEFAULT 'info',
+    related_contract_id INTEGER REFERENCES contracts(id) ON DELETE CASCADE,
+    related_document_id INTEGER REFERENCES documents(id) ON DELETE CASCADE,
+    link VARCHAR(255),
+    dedupe_key VARCHAR(255) UNIQUE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Reminders held back for the next digest; user_id NULL = shared by every user
+CREATE TABLE IF NOT EXISTS notification_digest_items (
+    id SERIAL PRIMARY KEY,
+    notification_type VARCHAR(50) NOT NULL,
+    user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+    title VARCHAR(255) NOT NULL,
+    message TEXT NOT NULL,
+    related_contract_id INTEGER REFERENCES contracts(id) ON DELETE CASCADE,
+    related_document_id INTEGER REFERENCES documents(id) ON DELETE CASCADE,
+    due_date DATE,
+    dedupe_key VARCHAR(255) UNIQUE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    digested_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Dedupe keys of generated personal notifications (notifications is partitioned,
+-- so it cannot hold a unique index on the key alone)
+CREATE TABLE IF NOT EXISTS notification_keys (
+    dedupe_key VARCHAR(255) PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    related_contract_id INTEGER REFERENCES contracts(id) ON DELETE CASCADE,
+    related_document_id INTEGER REFERENCES documents(id) ON DELETE CASCADE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+CREATE TABLE IF NOT EXISTS broadcast_receipts (
+    broadcast_id INTEGER REFERENCES broadcast_notifications(id) ON DELETE CASCADE,
+    user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+    is_read BOOLEAN,
+    deleted_at TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (broadcast_id, user_id)
+);
+
+CREATE TABLE IF NOT EXISTS broadcast_watermarks (
+    user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    read_up_to_id INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS notification_counters (
+    user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    unread_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Reminder fire times, recomputed when contract end dates / document expiry dates change
+CREATE TABLE IF NOT EXISTS reminder_events (
+    id SERIAL PRIMARY KEY,
+    notification_type VARCHAR(50) NOT NULL,
+    entity_id INTEGER NOT NULL,
+    due_date DATE NOT NULL,
+    tier INTEGER NOT NULL,
+    fire_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    fired_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Scheduled job runs; the scheduler catches up on slots with no run
+CREATE TABLE IF NOT EXISTS job_runs (
+    id SERIAL PRIMARY KEY,
+    job_name VARCHAR(100) NOT NULL,
+    scheduled_for TIMESTAMP WITH TIME ZONE NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'running',
+    started_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP WITH TIME ZONE,
+    duration_ms INTEGER,
+    rows_affected INTEGER,
+    error TEXT,
+    host VARCHAR(255)
+);
+
+-- Emails/SMS written with their notification, sent by scripts/run_delivery_worker.py
+CREATE TABLE IF NOT EXISTS delivery_outbox (
+    id SERIAL PRIMARY KEY,
+    channel VARCHAR(10) NOT NULL,
+    recipient VARCHAR(255) NOT NULL,
+    subject VARCHAR(255) NOT NULL,
+    body TEXT NOT NULL,
+    notification_type VARCHAR(50),
+    related_contract_id INTEGER REFERENCES contracts(id) ON DELETE CASCADE,
+    related_document_id INTEGER REFERENCES documents(id) ON DELETE CASCADE,
+    dedupe_key VARCHAR(255) UNIQUE,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_at TIMESTAMP WITH TIME ZONE,
+    sent_at TIMESTAMP WITH TIME ZONE,
+    last_error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS contract_render_jobs (
+    id SERIAL PRIMARY KEY,
+    contract_id INTEGER NOT NULL REFERENCES contracts(id) ON DELETE CASCADE,
+    status VARCHAR(50) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE
+);
+
 -- Indexes for better performance
 CREATE INDEX idx_contracts_status ON contracts(status);
 CREATE INDEX idx_contracts_end_date ON contracts(end_date);
 CREATE INDEX idx_documents_contract_id ON documents(contract_id);
+CREATE INDEX idx_documents_expiry_date ON documents(expiry_date);
 CREATE INDEX idx_notifications_user_id ON notifications(user_id);
 CREATE INDEX idx_notifications_is_read ON notifications(is_read);
+CREATE INDEX idx_contracts_created_at_id ON contracts(created_at, id);
+CREATE INDEX idx_contracts_end_date_id ON contracts(end_date, id);
+CREATE INDEX idx_documents_created_at_id ON documents(created_at, id);
+CREATE INDEX idx_notifications_user_created_at_id ON notifications(user_id, created_at, id);
+CREATE INDEX idx_broadcast_notifications_created_at_id ON broadcast_notifications(created_at, id);
+CREATE INDEX idx_reminder_events_pending_fire_at ON reminder_events(fire_at) WHERE fired_at IS NULL;
+CREATE INDEX idx_reminder_events_entity ON reminder_events(notification_type, entity_id);
+CREATE INDEX idx_reminder_events_fired_at ON reminder_events(fired_at) WHERE fired_at IS NOT NULL;
+CREATE INDEX idx_job_runs_job_name_started_at ON job_runs(job_name, started_at);
+CREATE INDEX idx_digest_items_pending ON notification_digest_items(notification_type) WHERE digested_at IS NULL;
+CREATE INDEX idx_digest_items_created_at ON notification_digest_items(created_at);
+CREATE INDEX idx_delivery_outbox_pending ON delivery_outbox(channel, next_attempt_at) WHERE status = 'pending';
+CREATE INDEX idx_delivery_outbox_sent_at ON delivery_outbox(sent_at);
+CREATE INDEX idx_render_jobs_status_id ON contract_render_jobs(status, id);
+CREATE INDEX idx_render_jobs_contract_id ON contract_render_jobs(contract_id);
+CREATE INDEX idx_notification_keys_created_at ON notification_keys(created_at);
+CREATE INDEX idx_documents_sha256 ON documents(sha256);
+CREATE INDEX idx_documents_search_vector ON documents USING GIN (search_vector);
+CREATE INDEX idx_contracts_contract_number_trgm ON contracts USING GIN (contract_number gin_trgm_ops);
+CREATE INDEX idx_contracts_client_name_trgm ON contracts USING GIN (client_name gin_trgm_ops);
+CREATE INDEX idx_contracts_property_address_trgm ON contracts USING GIN (property_address gin_trgm_ops);
+CREATE INDEX idx_documents_title_trgm ON documents USING GIN (title gin_trgm_ops);
+CREATE INDEX idx_documents_tags ON documents USING GIN (tags);
@@ -1,15 +1,21 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, status, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
+import asyncio
 import os
 from dotenv import load_dotenv
 
-from models import user, contract, document, notification
+from models import user, contract, document, document_blob, notification, render_job, reminder_event, job_run, delivery
 from models.user import User, UserCreate, UserLogin
-from routes import auth, contracts, documents, notifications
+from routes import auth, contracts, documents, notifications, dashboard, admin
 from services.notification_service import NotificationService
+from services.notification_hub import notification_hub
+# Registers the listeners that schedule reminders when contract/document dates change
+from services import reminder_queue
+from utils.file_handler import MAX_FILE_SIZE
 
 load_dotenv()
 
@@ -26,13 +32,40 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Multipart framing and form fields on top of the file itself
+UPLOAD_BODY_OVERHEAD = 64 * 1024
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    """Reject uploads that declare an oversized body before it is read and spooled"""
+    content_length = request.headers.get("content-length", "")
+    if request.url.path.endswith("/upload") and content_length.isdigit() \
+            and int(content_length) > MAX_FILE_SIZE + UPLOAD_BODY_OVERHEAD:
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"File size exceeds maximum allowed size of {MAX_FILE_SIZE // (1024*1024)}MB"}
+        )
+    return await call_next(request)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(contracts.router, prefix="/api/contracts", tags=["contracts"])
 app.include_router(documents.router, prefix="/api/documents", tags=["documents"])
 app.include_router(notifications.router, prefix="/api/notifications", tags=["notifications"])
+app.include_router(dashboard.router, prefix="/api/dashboard", tags=["dashboard"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
+
+@app.on_event("startup")
+async def start_notification_hub():
+    # One LISTEN connection per worker feeds all of its notification streams
+    notification_hub.start(asyncio.get_running_loop())
+
+@app.on_event("shutdown")
+async def stop_notification_hub():
+    notification_hub.stop()
 
 @app.get("/")
 async def root():
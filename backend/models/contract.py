@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Numeric, Date, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, BigInteger, String, Numeric, Date, DateTime, ForeignKey, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel
@@ -23,6 +23,9 @@ class ContractDB(Base):
     end_date = Column(Date, nullable=False)
     status = Column(String, default="draft")
     contract_file_path = Column(String)
+    render_status = Column(String, default="pending")  # pending, rendering, ready, failed
+    # contract_fingerprint() of the content contract_file_path was rendered from
+    content_fingerprint = Column(String)
     created_by = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -30,6 +33,27 @@ class ContractDB(Base):
     # Relationships
     creator = relationship("UserDB", back_populates="contracts")
     documents = relationship("DocumentDB", back_populates="contract")
+    notifications = relationship("NotificationDB", back_populates="contract")
+
+    __table_args__ = (
+        # Keyset pagination: newest first, and expiring soonest first
+        Index("idx_contracts_created_at_id", "created_at", "id"),
+        Index("idx_contracts_end_date_id", "end_date", "id"),
+        # Substring search (pg_trgm)
+        Index("idx_contracts_contract_number_trgm", "contract_number",
+              postgresql_using="gin", postgresql_ops={"contract_number": "gin_trgm_ops"}),
+        Index("idx_contracts_client_name_trgm", "client_name",
+              postgresql_using="gin", postgresql_ops={"client_name": "gin_trgm_ops"}),
+        Index("idx_contracts_property_address_trgm", "property_address",
+              postgresql_using="gin", postgresql_ops={"property_address": "gin_trgm_ops"}),
+    )
+
+class DataVersionDB(Base):
+    """Per-table change counter, bumped by the data_version trigger once per committing transaction"""
+    __tablename__ = "data_versions"
+
+    name = Column(String, primary_key=True)  # table name
+    version = Column(BigInteger, nullable=False, default=0)
 
 class ContractBase(BaseModel):
     client_name: str
@@ -62,6 +86,7 @@ class Contract(ContractBase):
     contract_number: str
     status: str
     contract_file_path: Optional[str] = None
+    render_status: Optional[str] = None
     created_by: int
     created_at: datetime
     updated_at: datetime
@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from typing import Dict, List
+from datetime import date, datetime
+from decimal import Decimal
+
+class DashboardContract(BaseModel):
+    id: int
+    contract_number: str
+    client_name: str
+    rental_amount: Decimal
+    status: str
+    end_date: date
+
+class DashboardNotification(BaseModel):
+    id: int
+    title: str
+    message: str
+    type: str
+    is_read: bool
+    created_at: datetime
+
+class DashboardSummary(BaseModel):
+    total_contracts: int
+    active_contracts: int
+    contracts_by_status: Dict[str, int]
+    monthly_revenue: Decimal
+    expiring_contracts: int
+    expiring_days: int
+    total_documents: int
+    unread_notifications: int
+    recent_contracts: List[DashboardContract]
+    expiring_soon: List[DashboardContract]
+    recent_notifications: List[DashboardNotification]
+    generated_at: datetime
@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index, text
+from sqlalchemy.sql import func
+from pydantic import BaseModel
+from typing import Dict, Optional
+from datetime import datetime
+from . import Base
+
+class DeliveryDB(Base):
+    """An email or SMS waiting in the outbox.
+
+    Rows are written in the same transaction as the notification they deliver;
+    the delivery worker sends them afterwards, outside any request or scheduler job.
+    """
+    __tablename__ = "delivery_outbox"
+
+    id = Column(Integer, primary_key=True)
+    channel = Column(String, nullable=False)  # email, sms
+    recipient = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
+    notification_type = Column(String)
+    related_contract_id = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"))
+    related_document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"))
+    # notification dedupe key + channel + recipient: a reminder is sent once per address
+    dedupe_key = Column(String, unique=True)
+    status = Column(String, nullable=False, default="pending")  # pending, sending, sent, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_at = Column(DateTime(timezone=True))
+    sent_at = Column(DateTime(timezone=True))
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Workers claim the earliest due message of their channel
+        Index("idx_delivery_outbox_pending", "channel", "next_attempt_at", postgresql_where=text("status = 'pending'")),
+        Index("idx_delivery_outbox_sent_at", "sent_at"),
+    )
+
+class ChannelStats(BaseModel):
+    pending: int = 0
+    sending: int = 0
+    sent: int = 0
+    failed: int = 0
+    oldest_pending_at: Optional[datetime] = None
+    sent_last_5_minutes: int = 0
+    messages_per_second: float = 0.0
+
+class DeliveryStats(BaseModel):
+    channels: Dict[str, ChannelStats]
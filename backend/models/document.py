@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Date, ARRAY
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Date, ARRAY, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import date, datetime
@@ -15,16 +16,33 @@ class DocumentDB(Base):
     file_path = Column(String, nullable=False)
     file_type = Column(String, nullable=False)
     file_size = Column(Integer)
+    sha256 = Column(String(64))
     contract_id = Column(Integer, ForeignKey("contracts.id"))
     uploaded_by = Column(Integer, ForeignKey("users.id"))
     tags = Column(ARRAY(String))
     expiry_date = Column(Date)
+    # Extracted file text; search_vector is maintained by the documents_search_vector trigger
+    content_text = deferred(Column(Text))
+    search_vector = deferred(Column(TSVECTOR))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     contract = relationship("ContractDB", back_populates="documents")
     uploader = relationship("UserDB", back_populates="documents")
+    notifications = relationship("NotificationDB", back_populates="document")
+
+    __table_args__ = (
+        # Keyset pagination: newest first
+        Index("idx_documents_created_at_id", "created_at", "id"),
+        Index("idx_documents_sha256", "sha256"),
+        Index("idx_documents_search_vector", "search_vector", postgresql_using="gin"),
+        Index("idx_documents_title_trgm", "title",
+              postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("idx_documents_tags", "tags", postgresql_using="gin"),
+        # Reminder window scans
+        Index("idx_documents_expiry_date", "expiry_date"),
+    )
 
 class DocumentBase(BaseModel):
     title: str
@@ -47,9 +65,14 @@ class Document(DocumentBase):
     id: int
     file_path: str
     file_size: Optional[int] = None
+    sha256: Optional[str] = None
     uploaded_by: int
     created_at: datetime
     updated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class DocumentSearchResult(Document):
+    rank: float
+    snippet: Optional[str] = None
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, BigInteger, DateTime
+from sqlalchemy.sql import func
+from pydantic import BaseModel
+from . import Base
+
+class DocumentBlobDB(Base):
+    __tablename__ = "document_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=1)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class StorageStats(BaseModel):
+    blobs: int
+    references: int
+    stored_bytes: int
+    logical_bytes: int
+    dedup_saved_bytes: int
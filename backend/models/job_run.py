@@ -0,0 +1,55 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from sqlalchemy.sql import func
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from . import Base
+
+class JobRunDB(Base):
+    """One execution of a scheduled job.
+
+    scheduled_for is the schedule slot the run covers; the scheduler compares it
+    with the latest slot to catch up on runs missed while no scheduler was up.
+    """
+    __tablename__ = "job_runs"
+
+    id = Column(Integer, primary_key=True)
+    job_name = Column(String, nullable=False)
+    scheduled_for = Column(DateTime(timezone=True), nullable=False)
+    status = Column(String, nullable=False, default="running")  # running, success, failed, timeout, abandoned
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True))
+    duration_ms = Column(Integer)
+    rows_affected = Column(Integer)
+    error = Column(Text)
+    host = Column(String)
+
+    __table_args__ = (
+        Index("idx_job_runs_job_name_started_at", "job_name", "started_at"),
+    )
+
+class JobRun(BaseModel):
+    id: int
+    job_name: str
+    scheduled_for: datetime
+    status: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    duration_ms: Optional[int] = None
+    rows_affected: Optional[int] = None
+    error: Optional[str] = None
+    host: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class JobStats(BaseModel):
+    job_name: str
+    runs: int
+    failures: int
+    last_started_at: Optional[datetime] = None
+    last_status: Optional[str] = None
+    p50_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    max_ms: Optional[int] = None
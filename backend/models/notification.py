@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Text, Boolean, Index, Sequence, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel
@@ -6,10 +6,19 @@ from typing import Optional
 from datetime import datetime
 from . import Base
 
+# Personal and broadcast notifications share one id space, so clients can address
+# either kind through /api/notifications/{id}
+notification_id_seq = Sequence("notifications_id_seq")
+
 class NotificationDB(Base):
+    """Personal notifications, range-partitioned by month on created_at.
+
+    The partition key has to be part of the primary key; ids stay unique through
+    the shared sequence. Partitions are managed by services.notification_partitions.
+    """
     __tablename__ = "notifications"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, notification_id_seq, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     title = Column(String, nullable=False)
     message = Column(Text, nullable=False)
@@ -18,13 +27,120 @@ class NotificationDB(Base):
     related_contract_id = Column(Integer, ForeignKey("contracts.id"))
     related_document_id = Column(Integer, ForeignKey("documents.id"))
     scheduled_date = Column(DateTime(timezone=True))
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Frontend path of the list a digest summarizes
+    link = Column(String)
+    # Set for generated notifications; uniqueness is enforced through NotificationKeyDB
+    dedupe_key = Column(String)
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
 
     # Relationships
     user = relationship("UserDB", back_populates="notifications")
     contract = relationship("ContractDB", back_populates="notifications")
     document = relationship("DocumentDB", back_populates="notifications")
 
+    __table_args__ = (
+        # Keyset pagination of a user's notifications, newest first
+        Index("idx_notifications_user_created_at_id", "user_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+class BroadcastNotificationDB(Base):
+    """A notification shown to every user, stored once; read state is kept per user"""
+    __tablename__ = "broadcast_notifications"
+
+    id = Column(Integer, notification_id_seq, primary_key=True)
+    title = Column(String, nullable=False)
+    message = Column(Text, nullable=False)
+    type = Column(String, default="info")
+    related_contract_id = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"))
+    related_document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"))
+    link = Column(String)
+    # type:entity:period key of generated broadcasts; NULL for ad hoc ones
+    dedupe_key = Column(String, unique=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("idx_broadcast_notifications_created_at_id", "created_at", "id"),
+    )
+
+class NotificationKeyDB(Base):
+    """Dedupe keys of generated personal notifications.
+
+    A unique index on the partitioned notifications table would have to include
+    created_at, so keys are claimed here with ON CONFLICT DO NOTHING instead.
+    """
+    __tablename__ = "notification_keys"
+
+    dedupe_key = Column(String, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    related_contract_id = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"))
+    related_document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("idx_notification_keys_created_at", "created_at"),
+    )
+
+class NotificationDigestItemDB(Base):
+    """A reminder held back for the next digest of its type.
+
+    user_id is NULL for items every user would have received as a broadcast; those
+    become one shared digest. Digested items stay until cleanup as dedupe keys.
+    """
+    __tablename__ = "notification_digest_items"
+
+    id = Column(Integer, primary_key=True)
+    notification_type = Column(String, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    title = Column(String, nullable=False)
+    message = Column(Text, nullable=False)
+    related_contract_id = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"))
+    related_document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"))
+    # Digests list the items due soonest first
+    due_date = Column(Date)
+    dedupe_key = Column(String, unique=True, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    digested_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index("idx_digest_items_pending", "notification_type", postgresql_where=text("digested_at IS NULL")),
+        Index("idx_digest_items_created_at", "created_at"),
+    )
+
+class BroadcastReceiptDB(Base):
+    """Per-user state of a single broadcast; a row exists only once the user touches it.
+
+    is_read is NULL unless set explicitly, in which case it overrides the watermark.
+    """
+    __tablename__ = "broadcast_receipts"
+
+    broadcast_id = Column(Integer, ForeignKey("broadcast_notifications.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    is_read = Column(Boolean)
+    deleted_at = Column(DateTime(timezone=True))
+
+class BroadcastWatermarkDB(Base):
+    """Every broadcast with id <= read_up_to_id counts as read.
+
+    Written by "mark all read" before it switched to receipts; existing watermarks are still honoured.
+    """
+    __tablename__ = "broadcast_watermarks"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    read_up_to_id = Column(Integer, nullable=False, default=0)
+
+class NotificationCounterDB(Base):
+    """Per-user unread count (personal + broadcast), kept in step with every change.
+
+    A missing row means "not computed yet"; it is filled from the feed on first read,
+    and a periodic reconciliation corrects any drift.
+    """
+    __tablename__ = "notification_counters"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    unread_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 class NotificationBase(BaseModel):
     title: str
     message: str
@@ -32,6 +148,7 @@ class NotificationBase(BaseModel):
     related_contract_id: Optional[int] = None
     related_document_id: Optional[int] = None
     scheduled_date: Optional[datetime] = None
+    link: Optional[str] = None
 
 class NotificationCreate(NotificationBase):
     user_id: int
@@ -43,7 +160,11 @@ class Notification(NotificationBase):
     id: int
     user_id: int
     is_read: bool
+    is_broadcast: bool = False
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class UnreadCount(BaseModel):
+    unread_count: int
\ No newline at end of file
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, DateTime, Date, Index, text
+from sqlalchemy.sql import func
+from . import Base
+
+class ReminderEventDB(Base):
+    """A reminder tier scheduled to fire at a fixed time.
+
+    Rows are (re)computed whenever a contract's end_date or status or a document's
+    expiry_date is written; the scheduler only ever reads the earliest unfired ones.
+    Fired rows are purged by the notification cleanup.
+    """
+    __tablename__ = "reminder_events"
+
+    id = Column(Integer, primary_key=True)
+    notification_type = Column(String, nullable=False)  # contract_expiry, document_expiry
+    entity_id = Column(Integer, nullable=False)
+    due_date = Column(Date, nullable=False)
+    tier = Column(Integer, nullable=False)
+    fire_at = Column(DateTime(timezone=True), nullable=False)
+    fired_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # The queue head: earliest unfired event
+        Index("idx_reminder_events_pending_fire_at", "fire_at", postgresql_where=text("fired_at IS NULL")),
+        Index("idx_reminder_events_entity", "notification_type", "entity_id"),
+        # Cleanup of fired events
+        Index("idx_reminder_events_fired_at", "fired_at", postgresql_where=text("fired_at IS NOT NULL")),
+    )
@@ -0,0 +1,46 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from . import Base
+
+class RenderJobDB(Base):
+    __tablename__ = "contract_render_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    contract_id = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"), nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending, running, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+
+    # Relationships
+    contract = relationship("ContractDB")
+
+    __table_args__ = (
+        # Workers claim the oldest open job
+        Index("idx_render_jobs_status_id", "status", "id"),
+        Index("idx_render_jobs_contract_id", "contract_id"),
+    )
+
+class RenderJob(BaseModel):
+    id: int
+    status: str
+    attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class RenderStatus(BaseModel):
+    contract_id: int
+    render_status: Optional[str] = None
+    contract_file_ready: bool
+    job: Optional[RenderJob] = None
@@ -0,0 +1,74 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from models import get_db
+from models.delivery import DeliveryStats
+from models.document_blob import StorageStats
+from models.job_run import JobRun, JobStats
+from models.user import UserDB
+from routes.auth import require_admin, principal_cache
+from services.blob_store import blob_store
+from services.dashboard_service import summary_cache
+from services.delivery_queue import DeliveryQueue
+from services.job_runs import JobRunService
+from services.notification_hub import notification_hub
+from services.notification_service import NotificationService
+from services.report_cache import report_cache
+
+router = APIRouter()
+
+@router.get("/cache-stats")
+def read_cache_stats(current_user: UserDB = Depends(require_admin)):
+    return {
+        "principal_cache": principal_cache.stats(),
+        "dashboard_summary_cache": summary_cache.stats(),
+        "report_cache": report_cache.stats()
+    }
+
+@router.get("/storage-stats", response_model=StorageStats)
+def read_storage_stats(
+    db: Session = Depends(get_db),
+    current_user: UserDB = Depends(require_admin)
+):
+    return blob_store.stats(db)
+
+@router.get("/delivery-stats", response_model=DeliveryStats)
+def read_delivery_stats(
+    db: Session = Depends(get_db),
+    current_user: UserDB = Depends(require_admin)
+):
+    """Email/SMS outbox depth per channel and the send rate over the last 5 minutes"""
+    return DeliveryQueue(db).stats()
+
+@router.get("/stream-stats")
+def read_stream_stats(current_user: UserDB = Depends(require_admin)):
+    """Notification stream connections held by this worker"""
+    return notification_hub.stats()
+
+@router.get("/reminders/preview")
+def preview_reminders(
+    db: Session = Depends(get_db),
+    current_user: UserDB = Depends(require_admin)
+):
+    """Dry run of today's expiry reminders: what would fire, nothing is written"""
+    return NotificationService(db).preview_reminders()
+
+@router.get("/jobs/runs", response_model=List[JobRun])
+def read_job_runs(
+    job_name: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: UserDB = Depends(require_admin)
+):
+    """Latest scheduled job runs, newest first"""
+    return JobRunService(db).history(job_name, limit)
+
+@router.get("/jobs/stats", response_model=List[JobStats])
+def read_job_stats(
+    days: int = Query(7, ge=1, le=365),
+    db: Session = Depends(get_db),
+    current_user: UserDB = Depends(require_admin)
+):
+    """Run counts, failures and duration percentiles per scheduled job"""
+    return JobRunService(db).stats(days)
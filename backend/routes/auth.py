@@ -1,13 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 import os
 
 from models import get_db
 from models.user import UserDB, UserCreate, UserLogin, User, Token, TokenData
+from utils.password_hasher import password_hasher
+from utils.ttl_cache import TTLCache
 
 router = APIRouter()
 
@@ -15,23 +18,42 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/token")
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+# Resolved principals per worker, keyed by token subject (email). Changes made in
+# this process invalidate immediately; other workers pick them up within the TTL.
+principal_cache = TTLCache(
+    maxsize=int(os.getenv("PRINCIPAL_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+)
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+@event.listens_for(UserDB, "after_update")
+@event.listens_for(UserDB, "after_delete")
+def invalidate_principal(mapper, connection, target):
+    """Drop cached principals when a user row changes (role, activation, email...)"""
+    principal_cache.pop(target.email)
+    for old_email in inspect(target).attrs.email.history.deleted:
+        principal_cache.pop(old_email)
+
+def snapshot_user(user: UserDB) -> UserDB:
+    """Copy a user's column values into a transient, session-independent UserDB"""
+    return UserDB(**{column.key: getattr(user, column.key) for column in UserDB.__table__.columns})
+
+async def verify_password(plain_password, hashed_password):
+    # bcrypt runs on the bounded hasher pool; raises 503 when it is saturated
+    return await password_hasher.verify(plain_password, hashed_password)
+
+async def get_password_hash(password):
+    return await password_hasher.hash(password)
 
 def get_user(db: Session, email: str):
     return db.query(UserDB).filter(UserDB.email == email).first()
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = get_user(db, email)
+async def authenticate_user(db: Session, email: str, password: str):
+    user = await run_in_threadpool(get_user, db, email)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password(password, user.hashed_password):
         return False
     return user
 
@@ -46,6 +68,10 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     return encoded_jwt
 
 async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    return user_from_token(token, db)
+
+def user_from_token(token: str, db: Session) -> UserDB:
+    """Resolve a bearer token to a (cached) user; raise 401 when it is invalid"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -59,35 +85,50 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         token_data = TokenData(email=email)
     except JWTError:
         raise credentials_exception
-    user = get_user(db, email=token_data.email)
+    
+    user = principal_cache.get(token_data.email)
     if user is None:
-        raise credentials_exception
+        db_user = get_user(db, email=token_data.email)
+        if db_user is None:
+            raise credentials_exception
+        user = snapshot_user(db_user)
+        principal_cache.set(token_data.email, user)
     return user
 
+def require_admin(current_user: UserDB = Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+    return current_user
+
+def save_user(db: Session, db_user: UserDB) -> UserDB:
+    db.add(db_user)
+    db.commit()
+    db.refresh(db_user)
+    return db_user
+
+# The auth routes are async: they wait for bcrypt on the event loop and run their
+# queries on the threadpool, so a login burst does not tie up the sync routes' threads
 @router.post("/register", response_model=User)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = get_user(db, email=user.email)
+async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+    db_user = await run_in_threadpool(get_user, db, user.email)
     if db_user:
         raise HTTPException(
             status_code=400,
             detail="Email already registered"
         )
     
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash(user.password)
     db_user = UserDB(
         email=user.email,
         hashed_password=hashed_password,
         full_name=user.full_name,
         role=user.role
     )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    return await run_in_threadpool(save_user, db, db_user)
 
 @router.post("/token", response_model=Token)
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, form_data.username, form_data.password)
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,15 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Query, Response, Header
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 import os
 import uuid
 
 from models import get_db
 from models.contract import ContractDB, ContractCreate, ContractUpdate, Contract
+from models.render_job import RenderStatus, RenderJob
 from models.user import UserDB
 from routes.auth import get_current_user
-from services.contract_generator import ContractGenerator
+from services.contract_generator import contract_fingerprint
+from services.contract_report import ContractReportService
+from services.render_queue import enqueue_render, get_latest_job
+from utils.pagination import paginate, NEXT_CURSOR_HEADER
+from utils.search_filters import contract_search_filter
 
 router = APIRouter()
 
@@ -28,15 +34,9 @@ def create_contract(
         **contract.dict()
     )
     db.add(db_contract)
-    db.commit()
-    db.refresh(db_contract)
     
-    # Generate contract document
-    generator = ContractGenerator()
-    contract_path = generator.generate_contract(db_contract)
-    
-    # Update contract with file path
-    db_contract.contract_file_path = contract_path
+    # The PDF is rendered by the render workers (scripts/run_render_worker.py)
+    enqueue_render(db, db_contract)
     db.commit()
     db.refresh(db_contract)
     
@@ -44,10 +44,12 @@ def create_contract(
 
 @router.get("/", response_model=List[Contract])
 def read_contracts(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     status: Optional[str] = None,
     expiring_soon: Optional[bool] = None,
+    search: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: UserDB = Depends(get_current_user)
 ):
@@ -56,14 +58,58 @@ def read_contracts(
     if status:
         query = query.filter(ContractDB.status == status)
     
+    if search:
+        # Partial contract number, client name or property address (trigram indexes)
+        query = query.filter(contract_search_filter(search))
+    
     if expiring_soon:
-        # Contracts expiring in the next 30 days
+        # Contracts expiring in the next 30 days, soonest first
         expiry_threshold = date.today() + timedelta(days=30)
         query = query.filter(ContractDB.end_date <= expiry_threshold)
+        contracts, next_cursor = paginate(
+            query, "end_date", [ContractDB.end_date, ContractDB.id], limit, cursor, descending=False
+        )
+    else:
+        # Newest first
+        contracts, next_cursor = paginate(
+            query, "created_at", [ContractDB.created_at, ContractDB.id], limit, cursor
+        )
     
-    contracts = query.offset(skip).limit(limit).all()
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return contracts
 
+@router.get("/report")
+def download_contracts_report(
+    status: Optional[str] = None,
+    expiring_soon: Optional[bool] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: UserDB = Depends(get_current_user)
+):
+    """Contract summary report (PDF): totals from SQL, the list streamed from the database in batches.
+
+    Reports are cached on disk by parameters and data version; an unchanged report
+    is served from the cache (or answered with 304) without touching the contracts.
+    """
+    service = ContractReportService(db)
+    key = service.cache_key(status=status, expiring_soon=expiring_soon)
+    headers = {"ETag": f'"{key}"', "Cache-Control": "private, no-cache"}
+    if if_none_match and headers["ETag"] in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    
+    report = service.cached_pdf(key, status=status, expiring_soon=expiring_soon)
+    return StreamingResponse(
+        report.chunks,
+        media_type="application/pdf",
+        headers={
+            **headers,
+            "Content-Length": str(report.size),
+            "Content-Disposition": f'attachment; filename="contracts_report_{date.today().isoformat()}.pdf"',
+            "X-Cache": "HIT" if report.cache_hit else "MISS"
+        }
+    )
+
 @router.get("/{contract_id}", response_model=Contract)
 def read_contract(
     contract_id: int,
@@ -90,17 +136,12 @@ def update_contract(
     for field, value in update_data.items():
         setattr(contract, field, value)
     
+    # Re-render only when the PDF content changes; the edit form resends every field
+    if contract_fingerprint(contract) != contract.content_fingerprint or contract.render_status == "failed":
+        enqueue_render(db, contract)
+    
     db.commit()
     db.refresh(contract)
-    
-    # Regenerate contract if necessary
-    if any(field in update_data for field in ['client_name', 'property_address', 'rental_amount', 'start_date', 'end_date']):
-        generator = ContractGenerator()
-        contract_path = generator.generate_contract(contract)
-        contract.contract_file_path = contract_path
-        db.commit()
-        db.refresh(contract)
-    
     return contract
 
 @router.delete("/{contract_id}")
@@ -117,9 +158,28 @@ def delete_contract(
     db.commit()
     return {"message": "Contract deleted successfully"}
 
+@router.get("/{contract_id}/render-status", response_model=RenderStatus)
+def read_render_status(
+    contract_id: int,
+    db: Session = Depends(get_db),
+    current_user: UserDB = Depends(get_current_user)
+):
+    contract = db.query(ContractDB).filter(ContractDB.id == contract_id).first()
+    if contract is None:
+        raise HTTPException(status_code=404, detail="Contract not found")
+    
+    job = get_latest_job(db, contract_id)
+    return RenderStatus(
+        contract_id=contract.id,
+        render_status=contract.render_status,
+        contract_file_ready=bool(contract.contract_file_path) and os.path.exists(contract.contract_file_path),
+        job=RenderJob.model_validate(job) if job else None
+    )
+
 @router.get("/{contract_id}/download")
 def download_contract(
     contract_id: int,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: UserDB = Depends(get_current_user)
 ):
@@ -127,11 +187,27 @@ def download_contract(
     if contract is None:
         raise HTTPException(status_code=404, detail="Contract not found")
     
+    if not contract.contract_file_path and contract.render_status in ("pending", "rendering"):
+        raise HTTPException(
+            status_code=409,
+            detail=f"Contract file is being generated (render_status={contract.render_status})",
+            headers={"Retry-After": "2"}
+        )
+    
     if not contract.contract_file_path or not os.path.exists(contract.contract_file_path):
         raise HTTPException(status_code=404, detail="Contract file not found")
     
+    # Strong validator: the file is a function of the fingerprinted content
+    headers = {"Cache-Control": "private, no-cache"}
+    if contract.content_fingerprint:
+        etag = f'"{contract.content_fingerprint}"'
+        headers["ETag"] = etag
+        if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+            return Response(status_code=304, headers=headers)
+    
     return FileResponse(
         path=contract.contract_file_path,
         filename=f"{contract.contract_number}.pdf",
-        media_type="application/pdf"
+        media_type="application/pdf",
+        headers=headers
     )
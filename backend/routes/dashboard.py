@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from models import get_db
+from models.dashboard import DashboardSummary
+from models.user import UserDB
+from routes.auth import get_current_user
+from services.dashboard_service import DashboardService
+
+router = APIRouter()
+
+@router.get("/summary", response_model=DashboardSummary)
+def read_dashboard_summary(
+    expiring_days: int = Query(30, ge=1, le=365),
+    recent_limit: int = Query(5, ge=1, le=20),
+    db: Session = Depends(get_db),
+    current_user: UserDB = Depends(get_current_user)
+):
+    return DashboardService(db).get_summary(current_user, expiring_days, recent_limit)
@@ -1,20 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Query, Response
 from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import date, datetime, timedelta
 import os
-import uuid
-import shutil
 
 from models import get_db
-from models.document import DocumentDB, DocumentCreate, DocumentUpdate, Document
+from models.document import DocumentDB, DocumentCreate, DocumentUpdate, Document, DocumentSearchResult
 from models.user import UserDB
 from routes.auth import get_current_user
+from utils.pagination import paginate, NEXT_CURSOR_HEADER
+from utils.file_handler import FileHandler
+from services.blob_store import blob_store
+from services.document_service import DocumentService
+from utils.text_extractor import extract_text
+from utils.search_filters import contains_any, tags_filter
 
 router = APIRouter()
 
-UPLOAD_DIR = "uploads/documents"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# Uploads land in the blob store's incoming directory, then move into the store
+file_handler = FileHandler(blob_store.incoming_dir)
+
+def save_document(db: Session, db_document: DocumentDB, incoming_path: str, filename: str) -> DocumentDB:
+    # Identical content was already extracted for another document
+    db_document.content_text = db.query(DocumentDB.content_text).filter(
+        DocumentDB.sha256 == db_document.sha256,
+        DocumentDB.content_text.isnot(None)
+    ).limit(1).scalar()
+    if db_document.content_text is None:
+        db_document.content_text = extract_text(incoming_path, filename)
+    
+    try:
+        db_document.file_path = blob_store.add(db, incoming_path, db_document.sha256, db_document.file_size)
+        db.add(db_document)
+        db.commit()
+    except Exception:
+        # e.g. an unknown contract_id: do not leave a new blob file without its row
+        db.rollback()
+        if os.path.exists(incoming_path):
+            os.remove(incoming_path)
+        blob_store.discard(db, db_document.sha256)
+        raise
+    db.refresh(db_document)
+    return db_document
 
 @router.post("/upload", response_model=Document)
 async def upload_document(
@@ -27,15 +56,6 @@ async def upload_document(
     db: Session = Depends(get_db),
     current_user: UserDB = Depends(get_current_user)
 ):
-    # Generate unique filename
-    file_extension = os.path.splitext(file.filename)[1]
-    unique_filename = f"{uuid.uuid4().hex}{file_extension}"
-    file_path = os.path.join(UPLOAD_DIR, unique_filename)
-    
-    # Save file
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    
     # Parse tags
     tag_list = [tag.strip() for tag in tags.split(",")] if tags else []
     
@@ -47,50 +67,71 @@ async def upload_document(
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid expiry date format")
     
+    # Stream to disk off the event loop; enforces the size limit and hashes as it goes
+    stored = await file_handler.save_upload(file)
+    
     db_document = DocumentDB(
         title=title or file.filename,
         description=description,
-        file_path=file_path,
         file_type=file.content_type,
-        file_size=file.size,
+        file_size=stored["file_size"],
+        sha256=stored["sha256"],
         contract_id=contract_id,
         uploaded_by=current_user.id,
         tags=tag_list,
         expiry_date=expiry_date_obj
     )
     
-    db.add(db_document)
-    db.commit()
-    db.refresh(db_document)
-    
-    return db_document
+    return await run_in_threadpool(save_document, db, db_document, stored["file_path"], file.filename)
 
 @router.get("/", response_model=List[Document])
 def read_documents(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     contract_id: Optional[int] = None,
     search: Optional[str] = None,
     tags: Optional[str] = None,
+    tags_match: str = Query("all", pattern="^(all|any)$"),
+    expiring_soon: Optional[bool] = None,
     db: Session = Depends(get_db),
     current_user: UserDB = Depends(get_current_user)
 ):
     query = db.query(DocumentDB)
     
+    if expiring_soon:
+        # Documents expiring in the next 30 days (idx_documents_expiry_date)
+        today = date.today()
+        query = query.filter(DocumentDB.expiry_date >= today, DocumentDB.expiry_date <= today + timedelta(days=30))
+    
     if contract_id:
         query = query.filter(DocumentDB.contract_id == contract_id)
     
     if search:
-        query = query.filter(DocumentDB.title.ilike(f"%{search}%"))
+        query = query.filter(contains_any([DocumentDB.title], search))
     
     if tags:
-        tag_list = [tag.strip() for tag in tags.split(",")]
-        for tag in tag_list:
-            query = query.filter(DocumentDB.tags.contains([tag]))
+        tag_list = [tag.strip() for tag in tags.split(",") if tag.strip()]
+        query = query.filter(tags_filter(DocumentDB.tags, tag_list, match_all=tags_match == "all"))
     
-    documents = query.offset(skip).limit(limit).all()
+    documents, next_cursor = paginate(
+        query, "created_at", [DocumentDB.created_at, DocumentDB.id], limit, cursor
+    )
+    
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return documents
 
+@router.get("/search", response_model=List[DocumentSearchResult])
+def search_documents(
+    q: str = Query(..., min_length=2),
+    limit: int = Query(20, ge=1, le=100),
+    contract_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: UserDB = Depends(get_current_user)
+):
+    return DocumentService(db).full_text_search(q, limit, contract_id)
+
 @router.get("/{document_id}", response_model=Document)
 def read_document(
     document_id: int,
@@ -127,16 +168,9 @@ def delete_document(
     db: Session = Depends(get_db),
     current_user: UserDB = Depends(get_current_user)
 ):
-    document = db.query(DocumentDB).filter(DocumentDB.id == document_id).first()
-    if document is None:
+    if not DocumentService(db).delete_document(document_id):
         raise HTTPException(status_code=404, detail="Document not found")
     
-    # Delete file from filesystem
-    if os.path.exists(document.file_path):
-        os.remove(document.file_path)
-    
-    db.delete(document)
-    db.commit()
     return {"message": "Document deleted successfully"}
 
 @router.get("/{document_id}/download")
@@ -1,53 +1,123 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
+import asyncio
+import json
+import os
 
-from models import get_db
-from models.notification import NotificationDB, NotificationCreate, NotificationUpdate, Notification
+from models import get_db, SessionLocal
+from models.notification import NotificationCreate, NotificationUpdate, Notification, UnreadCount
 from models.user import UserDB
-from routes.auth import get_current_user
+from routes.auth import get_current_user, user_from_token
+from services.notification_hub import notification_hub
+from services.notification_service import NotificationService
+from utils.pagination import paginate, NEXT_CURSOR_HEADER
 
 router = APIRouter()
 
+# Comment frames keep idle streams open through proxies
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("NOTIFICATION_STREAM_HEARTBEAT", "25"))
+
+def authenticate_stream(token: str) -> UserDB:
+    # Short-lived session: the stream itself must not pin a pooled connection
+    db = SessionLocal()
+    try:
+        return user_from_token(token, db)
+    finally:
+        db.close()
+
+def format_event(event: dict) -> str:
+    return f"event: {event['event']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
 @router.post("/", response_model=Notification)
 def create_notification(
     notification: NotificationCreate,
     db: Session = Depends(get_db),
     current_user: UserDB = Depends(get_current_user)
 ):
-    db_notification = NotificationDB(**notification.dict())
-    db.add(db_notification)
-    db.commit()
-    db.refresh(db_notification)
-    return db_notification
+    return NotificationService(db).create_notification(notification)
 
 @router.get("/", response_model=List[Notification])
 def read_notifications(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     unread_only: Optional[bool] = None,
     db: Session = Depends(get_db),
     current_user: UserDB = Depends(get_current_user)
 ):
-    query = db.query(NotificationDB).filter(NotificationDB.user_id == current_user.id)
+    # Personal notifications and broadcasts in one newest-first feed
+    feed = NotificationService(db).feed(current_user)
+    query = db.query(feed)
     
     if unread_only:
-        query = query.filter(NotificationDB.is_read == False)
+        query = query.filter(feed.c.is_read.is_not(True))
+    
+    notifications, next_cursor = paginate(
+        query, "created_at", [feed.c.created_at, feed.c.id], limit, cursor
+    )
     
-    notifications = query.order_by(NotificationDB.created_at.desc()).offset(skip).limit(limit).all()
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return notifications
 
+@router.get("/unread-count", response_model=UnreadCount)
+def read_unread_count(
+    db: Session = Depends(get_db),
+    current_user: UserDB = Depends(get_current_user)
+):
+    return UnreadCount(unread_count=NotificationService(db).unread_count(current_user))
+
+@router.get("/stream")
+async def stream_notifications(request: Request, token: str = Query(...)):
+    """Server-Sent Events feed of the user's notification changes.
+
+    EventSource cannot send headers, so the access token comes as a query parameter.
+    Events: notification, broadcast, unread, read, deleted, read_all and resync
+    (the client should reload its list). Each carries unread_delta or unread_count.
+    """
+    user = await run_in_threadpool(authenticate_stream, token)
+    
+    async def event_stream():
+        queue = notification_hub.subscribe(user.id)
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_event(event)
+        finally:
+            notification_hub.unsubscribe(user.id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.put("/mark-all-read")
+def mark_all_notifications_read(
+    db: Session = Depends(get_db),
+    current_user: UserDB = Depends(get_current_user)
+):
+    NotificationService(db).mark_all_read(current_user)
+    return {"message": "All notifications marked as read"}
+
 @router.get("/{notification_id}", response_model=Notification)
 def read_notification(
     notification_id: int,
     db: Session = Depends(get_db),
     current_user: UserDB = Depends(get_current_user)
 ):
-    notification = db.query(NotificationDB).filter(
-        NotificationDB.id == notification_id,
-        NotificationDB.user_id == current_user.id
-    ).first()
+    notification = NotificationService(db).get_feed_item(current_user, notification_id)
     if notification is None:
         raise HTTPException(status_code=404, detail="Notification not found")
     return notification
@@ -59,32 +129,16 @@ def update_notification(
     db: Session = Depends(get_db),
     current_user: UserDB = Depends(get_current_user)
 ):
-    notification = db.query(NotificationDB).filter(
-        NotificationDB.id == notification_id,
-        NotificationDB.user_id == current_user.id
-    ).first()
+    service = NotificationService(db)
+    notification = service.get_feed_item(current_user, notification_id)
     if notification is None:
         raise HTTPException(status_code=404, detail="Notification not found")
     
     update_data = notification_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(notification, field, value)
+    if update_data.get("is_read") is not None:
+        service.set_read(current_user.id, notification, update_data["is_read"])
     
-    db.commit()
-    db.refresh(notification)
-    return notification
-
-@router.put("/mark-all-read")
-def mark_all_notifications_read(
-    db: Session = Depends(get_db),
-    current_user: UserDB = Depends(get_current_user)
-):
-    db.query(NotificationDB).filter(
-        NotificationDB.user_id == current_user.id,
-        NotificationDB.is_read == False
-    ).update({"is_read": True})
-    db.commit()
-    return {"message": "All notifications marked as read"}
+    return service.get_feed_item(current_user, notification_id)
 
 @router.delete("/{notification_id}")
 def delete_notification(
@@ -92,13 +146,10 @@ def delete_notification(
     db: Session = Depends(get_db),
     current_user: UserDB = Depends(get_current_user)
 ):
-    notification = db.query(NotificationDB).filter(
-        NotificationDB.id == notification_id,
-        NotificationDB.user_id == current_user.id
-    ).first()
+    service = NotificationService(db)
+    notification = service.get_feed_item(current_user, notification_id)
     if notification is None:
         raise HTTPException(status_code=404, detail="Notification not found")
     
-    db.delete(notification)
-    db.commit()
-    return {"message": "Notification deleted successfully"}
\ No newline at end of file
+    service.delete(current_user.id, notification)
+    return {"message": "Notification deleted successfully"}
@@ -0,0 +1,85 @@
+"""
+Email delivery throughput benchmark
+Sends N messages through the delivery worker's SMTP sender into a local aiosmtpd
+sink and reports messages/sec for each pool size / batch size combination.
+Run with: python scripts/benchmark_delivery.py --messages 2000 --pool-sizes 1,4,8
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import time
+
+from aiosmtpd.controller import Controller
+
+from services.delivery_queue import OutboxMessage
+from services.delivery_worker import SmtpSender
+
+class CountingHandler:
+    """SMTP sink that only counts accepted messages"""
+
+    def __init__(self):
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return "250 OK"
+
+def make_messages(count):
+    return [
+        OutboxMessage(
+            id=index,
+            channel="email",
+            recipient=f"client{index}@example.kz",
+            subject="Скоро истекает договор аренды",
+            body=f"Договор № BENCH-{index} истекает через 7 дней",
+            attempts=1
+        )
+        for index in range(count)
+    ]
+
+async def run_case(host, port, messages, pool_size, batch_size):
+    sender = SmtpSender(host=host, port=port, pool_size=pool_size, batch_size=batch_size, rate_limit=0)
+    started = time.perf_counter()
+    results = await sender.send_batch(messages)
+    elapsed = time.perf_counter() - started
+    await sender.close()
+    failed = sum(1 for result in results if result.error is not None)
+    return elapsed, failed
+
+def run_benchmark(count, pool_sizes, batch_sizes, host, port):
+    handler = CountingHandler()
+    controller = None
+    if host is None:
+        controller = Controller(handler, hostname="127.0.0.1", port=port)
+        controller.start()
+        host = "127.0.0.1"
+
+    messages = make_messages(count)
+    print(f"Email delivery: {count} messages to {host}:{port}")
+    print(f"  {'pool':>4} {'batch':>5} {'seconds':>8} {'msg/s':>8} {'failed':>6}")
+    try:
+        for pool_size in pool_sizes:
+            for batch_size in batch_sizes:
+                elapsed, failed = asyncio.run(run_case(host, port, messages, pool_size, batch_size))
+                print(f"  {pool_size:>4} {batch_size:>5} {elapsed:>8.2f} {count / elapsed:>8.1f} {failed:>6}")
+    finally:
+        if controller is not None:
+            controller.stop()
+            print(f"  sink received {handler.received} messages")
+
+def int_list(value):
+    return [int(part) for part in value.split(",") if part.strip()]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Email delivery throughput benchmark")
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--pool-sizes", type=int_list, default=[1, 4, 8])
+    parser.add_argument("--batch-sizes", type=int_list, default=[1, 50])
+    parser.add_argument("--host", help="send to this SMTP server instead of a local aiosmtpd sink")
+    parser.add_argument("--port", type=int, default=8025)
+    args = parser.parse_args()
+
+    run_benchmark(args.messages, args.pool_sizes, args.batch_sizes, args.host, args.port)
@@ -0,0 +1,82 @@
+"""
+Login burst benchmark
+Measures logins/sec and the latency of other routes while logins are running.
+Run with: python scripts/benchmark_login.py --email admin@kyzylzhar.kz --password admin123
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, int(round(pct / 100 * len(ordered))) - 1)
+    return ordered[index]
+
+def login_loop(base_url, email, password, deadline, results):
+    session = requests.Session()
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        response = session.post(
+            f"{base_url}/api/auth/token",
+            data={"username": email, "password": password}
+        )
+        elapsed = time.perf_counter() - started
+        results.append((response.status_code, elapsed))
+
+def probe_loop(base_url, path, headers, deadline, latencies):
+    session = requests.Session()
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        session.get(f"{base_url}{path}", headers=headers)
+        latencies.append(time.perf_counter() - started)
+        time.sleep(0.01)
+
+def run_benchmark(base_url, email, password, concurrency, duration, probe_path):
+    token_response = requests.post(
+        f"{base_url}/api/auth/token",
+        data={"username": email, "password": password}
+    )
+    token_response.raise_for_status()
+    headers = {"Authorization": f"Bearer {token_response.json()['access_token']}"}
+
+    # Baseline latency of the probed route with no login load
+    baseline = []
+    probe_loop(base_url, probe_path, headers, time.monotonic() + 3, baseline)
+
+    login_results = []
+    probe_latencies = []
+    deadline = time.monotonic() + duration
+
+    with ThreadPoolExecutor(max_workers=concurrency + 1) as executor:
+        executor.submit(probe_loop, base_url, probe_path, headers, deadline, probe_latencies)
+        for _ in range(concurrency):
+            executor.submit(login_loop, base_url, email, password, deadline, login_results)
+
+    ok = [elapsed for code, elapsed in login_results if code == 200]
+    rejected = sum(1 for code, _ in login_results if code == 503)
+
+    print(f"Login burst: {concurrency} concurrent clients for {duration}s")
+    print(f"  logins/sec:          {len(ok) / duration:.1f}")
+    print(f"  login p50 / p99:     {statistics.median(ok) * 1000 if ok else 0:.1f} / {percentile(ok, 99) * 1000:.1f} ms")
+    print(f"  rejected (503):      {rejected}")
+    print(f"Other route {probe_path}:")
+    print(f"  p99 idle:            {percentile(baseline, 99) * 1000:.1f} ms")
+    print(f"  p99 during logins:   {percentile(probe_latencies, 99) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Login burst benchmark")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=int, default=20)
+    parser.add_argument("--probe-path", default="/api/auth/me")
+    args = parser.parse_args()
+
+    run_benchmark(args.base_url, args.email, args.password, args.concurrency, args.duration, args.probe_path)
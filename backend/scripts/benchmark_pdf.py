@@ -0,0 +1,72 @@
+"""
+Contract PDF rendering microbenchmark
+Renders N sample contracts into memory and reports contracts/sec, first with the
+fonts, styles and fixed fragments rebuilt for every contract (the old
+generator-per-render pattern), then with the shared process-wide engine.
+Run with: python scripts/benchmark_pdf.py --contracts 200
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import io
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from services.contract_generator import ContractGenerator
+from services.pdf_engine import PdfEngine, get_pdf_engine
+
+def make_contracts(count):
+    start = date(2026, 1, 1)
+    return [
+        SimpleNamespace(
+            contract_number=f"BENCH-{index:05d}",
+            client_name=f"ИП Клиент {index}",
+            client_phone="+7 (701) 000-00-00",
+            client_email=f"client{index}@example.kz",
+            property_address=f"г. Петропавловск, ул. Конституции, {index}",
+            property_type="Офис",
+            rental_amount=250000.0 + index,
+            deposit_amount=500000.0,
+            start_date=start,
+            end_date=start + timedelta(days=365)
+        )
+        for index in range(count)
+    ]
+
+def render_all(contracts, generator_for):
+    started = time.perf_counter()
+    size = 0
+    for contract in contracts:
+        buffer = io.BytesIO()
+        generator_for().generate_contract(contract, output=buffer)
+        size += buffer.tell()
+    return time.perf_counter() - started, size / len(contracts)
+
+def run_benchmark(count):
+    contracts = make_contracts(count)
+    engine = get_pdf_engine()
+    # Warm up (font registration, imports) outside the timed runs
+    ContractGenerator(engine).generate_contract(contracts[0], output=io.BytesIO())
+
+    cases = [
+        ("setup per render", lambda: ContractGenerator(PdfEngine())),
+        ("shared engine", lambda: ContractGenerator(engine)),
+    ]
+    print(f"Contract PDF rendering: {count} contracts, font {engine.font}")
+    print(f"  {'mode':<18} {'seconds':>8} {'contracts/s':>12} {'avg KB':>8}")
+    results = {}
+    for name, generator_for in cases:
+        elapsed, average_size = render_all(contracts, generator_for)
+        results[name] = count / elapsed
+        print(f"  {name:<18} {elapsed:>8.2f} {results[name]:>12.1f} {average_size / 1024:>8.1f}")
+    print(f"  speedup: {results['shared engine'] / results['setup per render']:.2f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Contract PDF rendering microbenchmark")
+    parser.add_argument("--contracts", type=int, default=200)
+    args = parser.parse_args()
+
+    run_benchmark(args.contracts)
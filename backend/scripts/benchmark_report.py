@@ -0,0 +1,108 @@
+"""
+Contract summary report benchmark
+Builds the report for 1k / 10k / 100k generated contracts, each size in a fresh
+process, and reports build time, PDF size and peak RSS. Rows are produced lazily,
+the way the report endpoint streams them from the database. --single-table adds
+the previous layout (the whole list in one table) for comparison.
+Run with: python scripts/benchmark_report.py [--sizes 1000,10000,100000] [--single-table]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import multiprocessing
+import resource
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.platypus import SimpleDocTemplate, Table
+
+from services.contract_report import PdfChunks
+from utils.pdf_generator import PDFGenerator, ReportSummary
+
+STATUSES = ("active", "draft", "expired")
+
+def generate_contracts(count):
+    start = date(2025, 1, 1)
+    for index in range(count):
+        yield SimpleNamespace(
+            contract_number=f"KZH-2025-01-{index:06d}",
+            client_name=f"ТОО Арендатор номер {index}",
+            property_address=f"г. Петропавловск, ул. Конституции Казахстана, {index % 500}",
+            rental_amount=Decimal(150000 + index % 1000 * 100),
+            status=STATUSES[index % len(STATUSES)],
+            start_date=start + timedelta(days=index % 365),
+            end_date=start + timedelta(days=index % 365 + 365)
+        )
+
+def summarize(count):
+    active = [contract.rental_amount for contract in generate_contracts(count) if contract.status == "active"]
+    return ReportSummary(count, len(active), sum(active, Decimal(0)))
+
+def build_single_table(generator, summary, contracts, output):
+    """The previous layout: every contract in one Table that ReportLab splits across pages"""
+    story = list(generator._report_story(summary, []))
+    rows = [['№ Договора', 'Клиент', 'Адрес', 'Сумма', 'Статус', 'Срок']]
+    for contract in contracts:
+        rows.append([
+            contract.contract_number, contract.client_name[:25], contract.property_address[:30],
+            f"{contract.rental_amount:,.0f}", contract.status,
+            f"{contract.start_date.strftime('%d.%m.%y')} - {contract.end_date.strftime('%d.%m.%y')}"
+        ])
+    table = Table(rows, colWidths=[3*cm, 3.5*cm, 4*cm, 2*cm, 2*cm, 3*cm])
+    table.setStyle(generator.engine.report_list_table_style)
+    story.append(table)
+    SimpleDocTemplate(output, pagesize=A4, rightMargin=2*cm, leftMargin=2*cm).build(story)
+
+def run_case(mode, count, results):
+    generator = PDFGenerator()
+    summary = summarize(count)
+    # Fonts and styles are loaded; what remains is the cost of the report itself
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    output = PdfChunks()
+
+    started = time.perf_counter()
+    if mode == "chunked":
+        generator.build_contract_summary_report(summary, generate_contracts(count), output)
+    else:
+        build_single_table(generator, summary, generate_contracts(count), output)
+    elapsed = time.perf_counter() - started
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((elapsed, output.size, baseline, peak))
+
+def run_benchmark(sizes, single_table, single_table_max):
+    context = multiprocessing.get_context("spawn")
+    modes = ["chunked"] + (["single table"] if single_table else [])
+    print("Contract summary report (peak RSS is for the whole process, KB from ru_maxrss)")
+    print(f"  {'mode':<13} {'contracts':>9} {'seconds':>8} {'rows/s':>8} {'PDF MB':>7} {'peak RSS MB':>12} {'growth MB':>10}")
+    for mode in modes:
+        for count in sizes:
+            if mode == "single table" and count > single_table_max:
+                print(f"  {mode:<13} {count:>9}  skipped (above --single-table-max)")
+                continue
+            results = context.Queue()
+            process = context.Process(target=run_case, args=(mode, count, results))
+            process.start()
+            elapsed, size, baseline, peak = results.get()
+            process.join()
+            print(f"  {mode:<13} {count:>9} {elapsed:>8.2f} {count / elapsed:>8.0f} {size / 1024 / 1024:>7.1f} "
+                  f"{peak / 1024:>12.1f} {(peak - baseline) / 1024:>10.1f}")
+
+def int_list(value):
+    return [int(part) for part in value.split(",") if part.strip()]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Contract summary report benchmark")
+    parser.add_argument("--sizes", type=int_list, default=[1000, 10000, 100000])
+    parser.add_argument("--single-table", action="store_true", help="also measure the one-table layout")
+    parser.add_argument("--single-table-max", type=int, default=10000,
+                        help="largest size to run the one-table layout for (it grows much slower)")
+    args = parser.parse_args()
+
+    run_benchmark(args.sizes, args.single_table, args.single_table_max)
@@ -0,0 +1,64 @@
+"""
+Check with EXPLAIN that contract and document search filters use their indexes
+Run with: python scripts/explain_search_indexes.py
+Exits with status 1 if any filter is planned without its index.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+
+from models import engine
+from models.contract import ContractDB
+from models.document import DocumentDB
+from utils.search_filters import contract_search_filter, contains_any, tags_filter
+
+CHECKS = [
+    (
+        "contracts search=",
+        select(ContractDB.id).where(contract_search_filter("Алматы")),
+        ["idx_contracts_contract_number_trgm", "idx_contracts_client_name_trgm", "idx_contracts_property_address_trgm"],
+    ),
+    (
+        "documents search=",
+        select(DocumentDB.id).where(contains_any([DocumentDB.title], "паспорт")),
+        ["idx_documents_title_trgm"],
+    ),
+    (
+        "documents tags= (all)",
+        select(DocumentDB.id).where(tags_filter(DocumentDB.tags, ["договор", "паспорт"])),
+        ["idx_documents_tags"],
+    ),
+    (
+        "documents tags= (any)",
+        select(DocumentDB.id).where(tags_filter(DocumentDB.tags, ["договор", "паспорт"], match_all=False)),
+        ["idx_documents_tags"],
+    ),
+]
+
+def explain(connection, statement) -> str:
+    compiled = statement.compile(dialect=engine.dialect)
+    rows = connection.exec_driver_sql(f"EXPLAIN {compiled}", compiled.params)
+    return "\n".join(row[0] for row in rows)
+
+def run_checks() -> bool:
+    all_passed = True
+    
+    with engine.connect() as connection:
+        # Small tables are cheaper to scan; this asks whether the index *can* serve the filter
+        connection.exec_driver_sql("SET enable_seqscan = off")
+        
+        for name, statement, expected_indexes in CHECKS:
+            plan = explain(connection, statement)
+            missing = [index for index in expected_indexes if index not in plan]
+            if missing:
+                all_passed = False
+                print(f"❌ {name}: plan does not use {', '.join(missing)}\n{plan}\n")
+            else:
+                print(f"✓ {name}: {', '.join(expected_indexes)}")
+    
+    return all_passed
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks() else 1)
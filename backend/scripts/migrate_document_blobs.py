@@ -0,0 +1,76 @@
+"""
+Move documents uploaded before the blob store into it, then remove unreferenced blobs
+Run with: python scripts/migrate_document_blobs.py [--dry-run]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import hashlib
+import shutil
+import uuid
+
+from models import get_db
+from models import user, contract, document, document_blob, notification
+from models.document import DocumentDB
+from services.blob_store import blob_store
+from utils.file_handler import CHUNK_SIZE
+
+def hash_file(path):
+    sha256 = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            sha256.update(chunk)
+            size += len(chunk)
+    return sha256.hexdigest(), size
+
+def migrate_documents(dry_run=False):
+    """Hash every legacy document file and re-point it at its blob"""
+    db = next(get_db())
+    migrated = missing = 0
+    
+    try:
+        document_ids = [row.id for row in db.query(DocumentDB.id).order_by(DocumentDB.id)]
+        
+        for document_id in document_ids:
+            doc = db.get(DocumentDB, document_id)
+            if doc is None or (doc.sha256 and doc.file_path == blob_store.path_for(doc.sha256)):
+                continue
+            if not os.path.exists(doc.file_path):
+                print(f"⚠ Document {doc.id}: file not found ({doc.file_path})")
+                missing += 1
+                continue
+            
+            sha256, size = hash_file(doc.file_path)
+            if dry_run:
+                print(f"Document {doc.id}: {doc.file_path} -> {blob_store.path_for(sha256)}")
+                migrated += 1
+                continue
+            
+            # Move via the incoming directory so add() can rename within one filesystem
+            temp_path = os.path.join(blob_store.incoming_dir, uuid.uuid4().hex)
+            shutil.move(doc.file_path, temp_path)
+            doc.file_path = blob_store.add(db, temp_path, sha256, size)
+            doc.sha256 = sha256
+            doc.file_size = size
+            db.commit()
+            migrated += 1
+        
+        # Blobs left unreferenced by deletes that did not get to purge them
+        purged = 0 if dry_run else blob_store.purge(db)
+        
+        stats = blob_store.stats(db)
+        print(f"✅ Migrated {migrated} documents ({missing} missing files), removed {purged} unreferenced blobs")
+        print(f"Stored {stats.stored_bytes / 1024 / 1024:.2f} MB for {stats.logical_bytes / 1024 / 1024:.2f} MB of documents, "
+              f"dedup saves {stats.dedup_saved_bytes / 1024 / 1024:.2f} MB")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move legacy document files into the blob store")
+    parser.add_argument("--dry-run", action="store_true", help="only list what would be moved")
+    args = parser.parse_args()
+    
+    migrate_documents(args.dry_run)
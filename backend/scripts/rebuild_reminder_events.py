@@ -0,0 +1,24 @@
+"""
+Recompute reminder events for every contract and document with a future due date
+(e.g. after changing reminder tiers or importing data outside the API)
+Run with: python scripts/rebuild_reminder_events.py
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import get_db
+from models import user, contract, document, document_blob, notification, reminder_event
+from services.reminder_queue import ReminderQueue
+
+def rebuild_reminder_events():
+    db = next(get_db())
+    
+    try:
+        count = ReminderQueue(db).rebuild()
+        print(f"✅ Scheduled reminders for {count} contracts and documents")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild_reminder_events()
@@ -0,0 +1,54 @@
+"""
+Extract and index the text of documents uploaded before full-text search
+Run with: python scripts/reindex_documents.py [--all]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import mimetypes
+
+from models import get_db
+from models import user, contract, document, document_blob, notification
+from models.document import DocumentDB
+from utils.text_extractor import extract_text
+
+def original_filename(doc):
+    """Best guess at the uploaded file name; blobs are stored without an extension"""
+    if os.path.splitext(doc.title)[1]:
+        return doc.title
+    return doc.title + (mimetypes.guess_extension(doc.file_type or "") or "")
+
+def reindex_documents(reindex_all=False):
+    db = next(get_db())
+    indexed = 0
+    
+    try:
+        query = db.query(DocumentDB.id).order_by(DocumentDB.id)
+        if not reindex_all:
+            query = query.filter(DocumentDB.content_text.is_(None))
+        document_ids = [row.id for row in query]
+        
+        for document_id in document_ids:
+            doc = db.get(DocumentDB, document_id)
+            if not os.path.exists(doc.file_path):
+                continue
+            
+            text = extract_text(doc.file_path, original_filename(doc))
+            if text:
+                # The trigger refreshes search_vector
+                doc.content_text = text
+                db.commit()
+                indexed += 1
+        
+        print(f"✅ Indexed text of {indexed} of {len(document_ids)} documents")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract document text for full-text search")
+    parser.add_argument("--all", action="store_true", help="re-extract documents that already have text")
+    args = parser.parse_args()
+    
+    reindex_documents(args.all)
@@ -0,0 +1,264 @@
+"""
+Re-render contract PDFs in bulk (e.g. after changing the contract template or lessor details)
+Streams contracts in id order over a server-side cursor and renders them on a process
+pool. Progress is checkpointed after every batch, so an interrupted run resumes where it
+stopped. Contracts whose PDF already matches their content fingerprint are skipped
+unless --force is given.
+Run with: python scripts/rerender_contracts.py [--workers 8] [--status active,draft] [--from 2025-01-01 --to 2025-12-31]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import logging
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from typing import NamedTuple, Optional
+
+from sqlalchemy import select, func, update, case, values, column, Integer, String, DateTime
+
+from models import SessionLocal
+from models import user, contract, document, document_blob, notification, render_job  # noqa: F401 (mappers)
+from models.contract import ContractDB
+from services.contract_generator import ContractGenerator, RENDERED_FIELDS, contract_fingerprint
+from services.render_queue import enqueue_render
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("rerender_contracts")
+
+DATE_FIELDS = ("created_at", "start_date", "end_date")
+# Contracts per pool task: large enough to amortize pickling, small enough to balance the workers
+TASK_SIZE = 20
+
+class RenderResult(NamedTuple):
+    contract_id: int
+    status: str  # rendered, skipped, failed
+    path: Optional[str] = None
+    fingerprint: Optional[str] = None
+    error: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+_generator = None
+
+def init_worker():
+    """Build the PDF engine (fonts, styles) once per pool process"""
+    global _generator
+    _generator = ContractGenerator()
+
+def render_contracts(rows, force):
+    """Render a slice of contracts inside a pool process"""
+    results = []
+    for row in rows:
+        contract_data = SimpleNamespace(**row)
+        fingerprint = contract_fingerprint(contract_data)
+        if (not force and fingerprint == contract_data.content_fingerprint and contract_data.contract_file_path
+                and os.path.exists(contract_data.contract_file_path)):
+            results.append(RenderResult(contract_data.id, "skipped"))
+            continue
+        try:
+            path = _generator.generate_contract(contract_data)
+            results.append(RenderResult(contract_data.id, "rendered", path, fingerprint,
+                                        updated_at=contract_data.updated_at))
+        except Exception as e:
+            results.append(RenderResult(contract_data.id, "failed", error=str(e)))
+    return results
+
+def contract_query(filters, after_id):
+    query = select(
+        ContractDB.id, ContractDB.updated_at, ContractDB.contract_file_path, ContractDB.content_fingerprint,
+        *(getattr(ContractDB, field) for field in RENDERED_FIELDS)
+    ).where(ContractDB.id > after_id)
+    
+    if filters["status"]:
+        query = query.where(ContractDB.status.in_(filters["status"]))
+    date_column = getattr(ContractDB, filters["date_field"])
+    if filters["from"]:
+        query = query.where(date_column >= date.fromisoformat(filters["from"]))
+    if filters["to"]:
+        # Inclusive, also for the created_at timestamp
+        query = query.where(date_column < date.fromisoformat(filters["to"]) + timedelta(days=1))
+    return query.order_by(ContractDB.id)
+
+def load_checkpoint(path, filters, restart):
+    if restart or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint["filters"] != filters:
+        raise SystemExit(f"Checkpoint {path} was written for other filters {checkpoint['filters']}; "
+                         f"rerun with the same filters or with --restart")
+    return checkpoint
+
+def save_checkpoint(path, checkpoint):
+    """Write the checkpoint atomically: a crash leaves the previous one intact"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(temp_path, path)
+
+def record_results(db, results):
+    """Point the contracts at their new files in one round trip per batch; returns the ids re-queued.
+
+    A contract edited (or re-rendered by the render worker) since it was read is
+    left alone: its file may now hold this run's stale render, so it is queued
+    for the render worker with its fingerprint cleared.
+    """
+    rendered = [result for result in results if result.status == "rendered"]
+    if not rendered:
+        return []
+    
+    rows = values(
+        column("id", Integer), column("path", String), column("fingerprint", String),
+        column("updated_at", DateTime(timezone=True)),
+        name="rendered"
+    ).data([(result.contract_id, result.path, result.fingerprint, result.updated_at) for result in rendered])
+    recorded = set(db.execute(
+        update(ContractDB)
+        .where(ContractDB.id == rows.c.id, ContractDB.updated_at == rows.c.updated_at)
+        .values(
+            contract_file_path=rows.c.path,
+            content_fingerprint=rows.c.fingerprint,
+            render_status=case((ContractDB.render_status == "failed", "ready"), else_=ContractDB.render_status)
+        )
+        .returning(ContractDB.id)
+        .execution_options(synchronize_session=False)
+    ).scalars())
+    
+    changed_ids = [result.contract_id for result in rendered if result.contract_id not in recorded]
+    for changed in db.query(ContractDB).filter(ContractDB.id.in_(changed_ids)):
+        changed.content_fingerprint = None
+        enqueue_render(db, changed)
+    db.commit()
+    return changed_ids
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+class Progress:
+    def __init__(self, total, interval):
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self.started = time.perf_counter()
+        self.reported = self.started
+
+    def advance(self, count, counts):
+        self.done += count
+        now = time.perf_counter()
+        if now - self.reported < self.interval and self.done < self.total:
+            return
+        self.reported = now
+        rate = self.done / (now - self.started) if now > self.started else 0
+        eta = format_duration((self.total - self.done) / rate) if rate else "?"
+        percent = self.done / self.total * 100 if self.total else 100
+        logger.info(f"{self.done}/{self.total} ({percent:.1f}%), {rate:.1f} contracts/s, ETA {eta} "
+                    f"- rendered {counts['rendered']}, skipped {counts['skipped']}, failed {counts['failed']}")
+
+def rerender_contracts(args):
+    filters = {
+        "status": sorted(part.strip() for part in args.status.split(",") if part.strip()) if args.status else [],
+        "date_field": args.date_field,
+        "from": args.date_from,
+        "to": args.date_to,
+    }
+    checkpoint = load_checkpoint(args.checkpoint, filters, args.restart) or {
+        "filters": filters,
+        "last_id": 0,
+        "counts": {"rendered": 0, "skipped": 0, "failed": 0, "requeued": 0},
+    }
+    counts = checkpoint["counts"]
+    counts.setdefault("requeued", 0)
+    if checkpoint["last_id"]:
+        logger.info(f"Resuming after contract {checkpoint['last_id']} ({counts})")
+    os.makedirs(os.path.dirname(os.path.abspath(args.checkpoint)), exist_ok=True)
+    
+    read_db = SessionLocal()
+    write_db = SessionLocal()
+    # spawn: pool processes must not inherit (and later close) the parent's database connections
+    pool = ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker
+    )
+    failed_ids = []
+
+    def finish_batch(last_id, futures):
+        results = [result for future in futures for result in future.result()]
+        changed_ids = record_results(write_db, results)
+        if changed_ids:
+            counts["requeued"] += len(changed_ids)
+            logger.info(f"Contracts {', '.join(map(str, changed_ids))} changed during the run; queued for the render worker")
+        for result in results:
+            counts[result.status] += 1
+            if result.status == "failed":
+                failed_ids.append(result.contract_id)
+                logger.warning(f"Contract {result.contract_id} failed: {result.error}")
+        checkpoint["last_id"] = last_id
+        save_checkpoint(args.checkpoint, checkpoint)
+        progress.advance(len(results), counts)
+    
+    try:
+        query = contract_query(filters, checkpoint["last_id"])
+        total = read_db.execute(select(func.count()).select_from(query.subquery())).scalar()
+        logger.info(f"Re-rendering {total} contracts on {args.workers} processes")
+        progress = Progress(total, args.progress_interval)
+        
+        # yield_per streams over a server-side (named) cursor: one batch in memory at a time
+        stream = read_db.execute(query.execution_options(yield_per=args.batch_size)).mappings()
+        in_flight = deque()
+        for batch in stream.partitions():
+            rows = [dict(row) for row in batch]
+            futures = [
+                pool.submit(render_contracts, rows[start:start + TASK_SIZE], args.force)
+                for start in range(0, len(rows), TASK_SIZE)
+            ]
+            in_flight.append((rows[-1]["id"], futures))
+            # The next batch keeps the pool busy while the oldest one is recorded;
+            # batches finish in id order, so the checkpoint never skips a contract
+            if len(in_flight) > 1:
+                finish_batch(*in_flight.popleft())
+        while in_flight:
+            finish_batch(*in_flight.popleft())
+    except KeyboardInterrupt:
+        pool.shutdown(wait=False, cancel_futures=True)
+        logger.warning(f"Interrupted after contract {checkpoint['last_id']}; run again to resume")
+        raise SystemExit(1)
+    finally:
+        pool.shutdown()
+        read_db.close()
+        write_db.close()
+    
+    if os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    print(f"✅ Rendered {counts['rendered']}, skipped {counts['skipped']} up-to-date, failed {counts['failed']}, "
+          f"re-queued {counts['requeued']} changed during the run in {format_duration(time.perf_counter() - progress.started)}")
+    if failed_ids:
+        print(f"⚠ Failed contracts: {', '.join(map(str, failed_ids[:50]))}{' ...' if len(failed_ids) > 50 else ''}")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-render contract PDFs in bulk")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="render processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=500, help="contracts fetched and checkpointed per batch")
+    parser.add_argument("--status", help="only contracts with these statuses, e.g. active,draft")
+    parser.add_argument("--date-field", choices=DATE_FIELDS, default="created_at", help="field --from/--to apply to")
+    parser.add_argument("--from", dest="date_from", help="YYYY-MM-DD, inclusive")
+    parser.add_argument("--to", dest="date_to", help="YYYY-MM-DD, inclusive")
+    parser.add_argument("--force", action="store_true", help="also re-render PDFs that match their fingerprint")
+    parser.add_argument("--checkpoint", default="logs/rerender_contracts.checkpoint.json")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("--progress-interval", type=float, default=5, help="seconds between progress lines")
+    args = parser.parse_args()
+    
+    rerender_contracts(args)
@@ -0,0 +1,19 @@
+"""
+Run the email/SMS delivery worker
+Run with: python scripts/run_delivery_worker.py
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.delivery_worker import run_worker
+import asyncio
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())
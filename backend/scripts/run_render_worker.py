@@ -0,0 +1,47 @@
+"""
+Run contract PDF render workers
+Run with: python scripts/run_render_worker.py [--workers N]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.render_queue import run_worker_process
+import argparse
+import multiprocessing
+import signal
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+processes = []
+
+def signal_handler(signum, frame):
+    """Handle shutdown signals"""
+    print("\nShutting down render workers...")
+    for process in processes:
+        process.terminate()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Contract PDF render workers")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("RENDER_WORKERS", os.cpu_count() or 1)),
+        help="number of worker processes (default: RENDER_WORKERS or CPU count)"
+    )
+    args = parser.parse_args()
+
+    for _ in range(args.workers):
+        process = multiprocessing.Process(target=run_worker_process)
+        process.start()
+        processes.append(process)
+
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+    for process in processes:
+        process.join()
@@ -0,0 +1,127 @@
+import os
+import logging
+from sqlalchemy.orm import Session
+from sqlalchemy import update, delete, func
+from sqlalchemy.dialects.postgresql import insert
+
+from models.document_blob import DocumentBlobDB, StorageStats
+
+logger = logging.getLogger(__name__)
+
+class BlobStore:
+    """Content-addressed store for uploaded documents.
+
+    Each distinct file is stored once under its SHA-256 in a two-level
+    directory fan-out (ab/cd/abcd...), and `document_blobs.ref_count` tracks
+    how many documents point at it. The reference row is locked by the
+    UPDATE/INSERT for the rest of the caller's transaction, which serializes
+    adding and releasing references to the same content.
+    """
+
+    def __init__(self, root: str = "uploads/documents"):
+        self.root = root
+        self.incoming_dir = os.path.join(root, "incoming")
+        os.makedirs(self.incoming_dir, exist_ok=True)
+
+    def path_for(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def add(self, db: Session, temp_path: str, sha256: str, size: int) -> str:
+        """Take a reference to the content of `temp_path` and return the blob path; the caller commits.
+
+        `temp_path` must be on the same filesystem (see `incoming_dir`); it is
+        moved into place for new content and removed for duplicates.
+        """
+        ref_count = db.execute(
+            insert(DocumentBlobDB)
+            .values(sha256=sha256, size=size, ref_count=1)
+            .on_conflict_do_update(
+                index_elements=[DocumentBlobDB.sha256],
+                set_={"ref_count": DocumentBlobDB.ref_count + 1}
+            )
+            .returning(DocumentBlobDB.ref_count)
+        ).scalar_one()
+
+        blob_path = self.path_for(sha256)
+        if ref_count == 1 or not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            os.replace(temp_path, blob_path)
+        else:
+            os.remove(temp_path)
+        return blob_path
+
+    def owns(self, sha256: str, file_path: str) -> bool:
+        """Whether `file_path` is the stored blob for `sha256` (documents uploaded before the store are not)"""
+        return bool(sha256) and file_path == self.path_for(sha256)
+
+    def release(self, db: Session, sha256: str) -> bool:
+        """Drop one reference; the caller commits. Returns True when it was the last one.
+
+        The blob is not unlinked here: a rolled-back delete would lose the file.
+        Call `purge` once the release is committed.
+        """
+        ref_count = db.execute(
+            update(DocumentBlobDB)
+            .where(DocumentBlobDB.sha256 == sha256)
+            .values(ref_count=DocumentBlobDB.ref_count - 1)
+            .returning(DocumentBlobDB.ref_count)
+        ).scalar()
+        return ref_count is not None and ref_count <= 0
+
+    def purge(self, db: Session, sha256: str = None) -> int:
+        """Remove unreferenced blobs (or just `sha256`) with their files, and commit.
+
+        A concurrent `add` of the same content either took its reference first
+        (the row no longer matches) or waits on the deleted row and stores the file
+        again. If the commit fails after the unlink, the row stays at zero
+        references and the next `add` puts the file back.
+        """
+        query = delete(DocumentBlobDB).where(DocumentBlobDB.ref_count <= 0)
+        if sha256:
+            query = query.where(DocumentBlobDB.sha256 == sha256)
+        purged = db.execute(query.returning(DocumentBlobDB.sha256)).scalars().all()
+        
+        for blob_sha256 in purged:
+            blob_path = self.path_for(blob_sha256)
+            if os.path.exists(blob_path):
+                os.remove(blob_path)
+            logger.info(f"Removed blob {blob_sha256}")
+        db.commit()
+        return len(purged)
+
+    def discard(self, db: Session, sha256: str) -> bool:
+        """After a rolled-back `add`, remove the blob file it may have left without a row.
+
+        A zero-reference placeholder row is inserted first. It conflicts with (or
+        waits for) any other upload of the same content, whose file is kept, and
+        holds off concurrent `add`s while `purge` unlinks the file.
+        """
+        placeholder = db.execute(
+            insert(DocumentBlobDB)
+            .values(sha256=sha256, size=0, ref_count=0)
+            .on_conflict_do_nothing(index_elements=[DocumentBlobDB.sha256])
+            .returning(DocumentBlobDB.sha256)
+        ).scalar()
+        if placeholder is None:
+            db.rollback()
+            return False
+        return self.purge(db, sha256) > 0
+
+    def stats(self, db: Session) -> StorageStats:
+        """Physical vs. logical size of the store"""
+        row = db.query(
+            func.count(DocumentBlobDB.sha256).label("blobs"),
+            func.coalesce(func.sum(DocumentBlobDB.ref_count), 0).label("references"),
+            func.coalesce(func.sum(DocumentBlobDB.size), 0).label("stored_bytes"),
+            func.coalesce(func.sum(DocumentBlobDB.size * DocumentBlobDB.ref_count), 0).label("logical_bytes"),
+        ).one()
+
+        return StorageStats(
+            blobs=row.blobs,
+            references=row.references,
+            stored_bytes=row.stored_bytes,
+            logical_bytes=row.logical_bytes,
+            dedup_saved_bytes=row.logical_bytes - row.stored_bytes
+        )
+
+blob_store = BlobStore()
@@ -1,44 +1,57 @@
-from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch, cm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from datetime import datetime
+from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
+from reportlab.lib.units import cm
+from datetime import date, datetime
+from decimal import Decimal
+import hashlib
+import json
 import os
+import uuid
+
+from services.pdf_engine import PdfEngine, get_pdf_engine
+
+# Bump whenever the contract layout or fixed text changes, so every PDF is rendered again
+TEMPLATE_VERSION = 1
+
+# Contract fields that appear in the rendered PDF
+RENDERED_FIELDS = (
+    'contract_number', 'client_name', 'client_phone', 'client_email', 'property_address',
+    'property_type', 'rental_amount', 'deposit_amount', 'start_date', 'end_date'
+)
+
+def _canonical(value):
+    if value is None:
+        return None
+    if isinstance(value, (Decimal, float, int)):
+        # 250000 from a request and 250000.00 from the database render the same
+        return f"{Decimal(value):.2f}"
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+def contract_fingerprint(contract) -> str:
+    """SHA-256 over the rendered fields and TEMPLATE_VERSION; equal fingerprints mean identical PDF content"""
+    payload = {field: _canonical(getattr(contract, field)) for field in RENDERED_FIELDS}
+    payload['template_version'] = TEMPLATE_VERSION
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
 
 class ContractGenerator:
-    def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self.contract_dir = "uploads/contracts"
-        os.makedirs(self.contract_dir, exist_ok=True)
-        
-        # Custom styles
-        self.title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=16,
-            spaceAfter=30,
-            alignment=1,  # Center alignment
-            fontName='Helvetica-Bold'
-        )
-        
-        self.normal_style = ParagraphStyle(
-            'CustomNormal',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            spaceAfter=12,
-            fontName='Helvetica'
-        )
+    def __init__(self, engine: PdfEngine = None):
+        # Fonts, styles and the fixed contract text are shared process-wide
+        self.engine = engine or get_pdf_engine()
+        self.contract_dir = self.engine.contract_dir
+        self.title_style = self.engine.contract_title_style
+        self.normal_style = self.engine.contract_normal_style
 
-    def generate_contract(self, contract):
-        """Generate PDF contract document"""
+    def generate_contract(self, contract, output=None):
+        """Generate PDF contract document; `output` (a path or file object) overrides the contracts folder"""
         filename = f"{contract.contract_number}.pdf"
-        filepath = os.path.join(self.contract_dir, filename)
+        filepath = output if output is not None else os.path.join(self.contract_dir, filename)
+        # Build next to the target and rename it into place: downloads never see a partial file
+        target = f"{filepath}.{uuid.uuid4().hex}.tmp" if output is None else output
         
         doc = SimpleDocTemplate(
-            filepath,
+            target,
             pagesize=A4,
             rightMargin=2*cm,
             leftMargin=2*cm,
@@ -49,8 +62,7 @@ class ContractGenerator:
         story = []
         
         # Title
-        title = Paragraph("ДОГОВОР АРЕНДЫ НЕДВИЖИМОСТИ", self.title_style)
-        story.append(title)
+        story.append(self.engine.contract_title())
         
         # Contract number and date
         contract_info = Paragraph(
@@ -62,16 +74,7 @@ class ContractGenerator:
         story.append(Spacer(1, 20))
         
         # Company info
-        company_info = Paragraph(
-            "<b>АРЕНДОДАТЕЛЬ:</b><br/>"
-            "ТОО 'Кызыл Жар'<br/>"
-            "БИН: 123456789012<br/>"
-            "Адрес: г. Алматы, ул. Абая, 123<br/>"
-            "Телефон: +7 (727) 123-45-67<br/>"
-            "Email: info@kyzylzhar.kz",
-            self.normal_style
-        )
-        story.append(company_info)
+        story.append(self.engine.lessor_block())
         story.append(Spacer(1, 20))
         
         # Client info
@@ -98,33 +101,13 @@ class ContractGenerator:
         ]
         
         contract_table = Table(contract_data, colWidths=[6*cm, 10*cm])
-        contract_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-        ]))
+        contract_table.setStyle(self.engine.details_table_style)
         
         story.append(contract_table)
         story.append(Spacer(1, 30))
         
         # Terms and conditions
-        terms = Paragraph(
-            "<b>УСЛОВИЯ ДОГОВОРА:</b><br/><br/>"
-            "1. Арендатор обязуется использовать арендованное имущество исключительно по назначению.<br/>"
-            "2. Арендная плата вносится до 10 числа каждого месяца.<br/>"
-            "3. Арендатор несет ответственность за сохранность арендованного имущества.<br/>"
-            "4. При досрочном расторжении договора залоговая сумма не возвращается.<br/>"
-            "5. Все споры решаются в соответствии с законодательством Республики Казахстан.",
-            self.normal_style
-        )
-        story.append(terms)
+        story.append(self.engine.terms_block())
         story.append(Spacer(1, 30))
         
         # Signatures
@@ -138,17 +121,18 @@ class ContractGenerator:
         ]
         
         signature_table = Table(signature_data, colWidths=[6*cm, 4*cm, 6*cm])
-        signature_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        signature_table.setStyle(self.engine.signature_table_style)
         
         story.append(signature_table)
         
         # Build PDF
-        doc.build(story)
+        try:
+            doc.build(story)
+            if output is None:
+                os.replace(target, filepath)
+        finally:
+            if output is None and os.path.exists(target):
+                os.remove(target)
         return filepath
 
     def generate_contract_extension(self, contract, new_end_date):
@@ -159,8 +143,7 @@ class ContractGenerator:
         doc = SimpleDocTemplate(filepath, pagesize=A4)
         story = []
         
-        title = Paragraph("ДОПОЛНИТЕЛЬНОЕ СОГЛАШЕНИЕ К ДОГОВОРУ АРЕНДЫ", self.title_style)
-        story.append(title)
+        story.append(self.engine.extension_title())
         
         extension_text = Paragraph(
             f"Дополнительное соглашение к договору аренды № {contract.contract_number}<br/><br/>"
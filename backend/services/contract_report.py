@@ -0,0 +1,126 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, case
+from datetime import date, timedelta
+from typing import Iterator, NamedTuple, Optional
+import hashlib
+import json
+import os
+
+from models.contract import ContractDB, DataVersionDB
+from services.report_cache import report_cache
+from utils.pdf_generator import PDFGenerator, ReportSummary
+
+# Contracts fetched per round trip while the report is written
+REPORT_BATCH_SIZE = int(os.getenv("REPORT_BATCH_SIZE", "1000"))
+STREAM_CHUNK_SIZE = 64 * 1024
+# Bump when the report layout changes, so cached reports are rebuilt
+REPORT_VERSION = 1
+
+class ReportFile(NamedTuple):
+    key: str
+    size: int
+    chunks: Iterator[bytes]
+    cache_hit: bool
+
+class ContractReportService:
+    """The contract summary report, built from SQL aggregates and a streamed contract list"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _filtered(self, query, status: Optional[str] = None, expiring_soon: Optional[bool] = None):
+        if status:
+            query = query.where(ContractDB.status == status)
+        if expiring_soon:
+            query = query.where(ContractDB.end_date <= date.today() + timedelta(days=30))
+        return query
+
+    def summary(self, status: Optional[str] = None, expiring_soon: Optional[bool] = None) -> ReportSummary:
+        """Totals in a single aggregate query"""
+        row = self.db.execute(self._filtered(select(
+            func.count(ContractDB.id),
+            func.count(case((ContractDB.status == "active", 1))),
+            func.coalesce(func.sum(case((ContractDB.status == "active", ContractDB.rental_amount))), 0)
+        ), status, expiring_soon)).one()
+        return ReportSummary(*row)
+
+    def contracts(self, status: Optional[str] = None, expiring_soon: Optional[bool] = None,
+                  batch_size: int = REPORT_BATCH_SIZE) -> Iterator:
+        """Report rows in contract number order, fetched `batch_size` at a time over a server-side cursor"""
+        query = self._filtered(select(
+            ContractDB.contract_number,
+            ContractDB.client_name,
+            ContractDB.property_address,
+            ContractDB.rental_amount,
+            ContractDB.status,
+            ContractDB.start_date,
+            ContractDB.end_date
+        ), status, expiring_soon).order_by(ContractDB.contract_number)
+        yield from self.db.execute(query.execution_options(yield_per=batch_size))
+
+    def data_version(self) -> int:
+        """Contracts change counter, bumped at commit by every transaction that writes contracts.
+
+        Unlike max(updated_at), the writing transaction's start time, it cannot stay
+        put when a transaction that began before a report was built commits after it.
+        """
+        version = self.db.query(DataVersionDB.version).filter(DataVersionDB.name == ContractDB.__tablename__).scalar()
+        return version or 0
+
+    def cache_key(self, status: Optional[str] = None, expiring_soon: Optional[bool] = None) -> str:
+        """Identifies the report content: parameters, data version and the date printed on it"""
+        payload = {
+            "report": "contract_summary",
+            "version": REPORT_VERSION,
+            "params": {"status": status, "expiring_soon": bool(expiring_soon)},
+            "data_version": self.data_version(),
+            "date": date.today().isoformat(),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def cached_pdf(self, key: str, status: Optional[str] = None, expiring_soon: Optional[bool] = None) -> ReportFile:
+        """The report for `key` from the report cache, built and stored on a miss"""
+        cached = report_cache.open(key)
+        if cached is not None:
+            return ReportFile(key, os.fstat(cached.fileno()).st_size, iter_file(cached), cache_hit=True)
+        
+        pdf = PdfChunks()
+        self.write_pdf(pdf, status=status, expiring_soon=expiring_soon)
+        report_cache.put(key, pdf.parts)
+        return ReportFile(key, pdf.size, pdf.chunks(), cache_hit=False)
+
+    def write_pdf(self, output, status: Optional[str] = None, expiring_soon: Optional[bool] = None):
+        summary = self.summary(status, expiring_soon)
+        PDFGenerator().build_contract_summary_report(summary, self.contracts(status, expiring_soon), output)
+        return summary
+
+class PdfChunks:
+    """File object for ReportLab, which writes a finished document in a single call.
+
+    The bytes are kept as written (no BytesIO copy) and handed out in chunks.
+    """
+
+    def __init__(self, chunk_size: int = STREAM_CHUNK_SIZE):
+        self.parts = []
+        self.chunk_size = chunk_size
+
+    def write(self, data: bytes):
+        self.parts.append(data)
+
+    @property
+    def size(self) -> int:
+        return sum(len(part) for part in self.parts)
+
+    def chunks(self) -> Iterator[bytes]:
+        while self.parts:
+            view = memoryview(self.parts.pop(0))
+            for start in range(0, len(view), self.chunk_size):
+                yield bytes(view[start:start + self.chunk_size])
+
+def iter_file(f, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    with f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
@@ -0,0 +1,100 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from datetime import datetime, timedelta, date
+import os
+
+from models.contract import ContractDB
+from models.document import DocumentDB
+from models.user import UserDB
+from models.dashboard import DashboardSummary, DashboardContract, DashboardNotification
+from services.notification_service import NotificationService
+from utils.ttl_cache import TTLCache
+
+# Per-worker cache: (user_id, expiring_days, recent_limit) -> summary
+summary_cache = TTLCache(maxsize=1024, ttl=float(os.getenv("DASHBOARD_CACHE_TTL", "30")))
+
+class DashboardService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_summary(self, user: UserDB, expiring_days: int = 30, recent_limit: int = 5) -> DashboardSummary:
+        """Return the dashboard summary, served from a short-lived per-user cache"""
+        key = (user.id, expiring_days, recent_limit)
+        summary = summary_cache.get(key)
+        if summary is None:
+            summary = self.build_summary(user, expiring_days, recent_limit)
+            summary_cache.set(key, summary)
+        return summary
+
+    def build_summary(self, user: UserDB, expiring_days: int = 30, recent_limit: int = 5) -> DashboardSummary:
+        """Compute dashboard statistics with a single aggregate query plus small top-N lookups"""
+        today = date.today()
+        expiry_threshold = today + timedelta(days=expiring_days)
+        expiring_filter = ContractDB.end_date.between(today, expiry_threshold)
+
+        # One scan of contracts grouped by status; everything else is folded from it
+        per_status = self.db.query(
+            func.coalesce(ContractDB.status, 'draft').label("status"),
+            func.count(ContractDB.id).label("total"),
+            func.sum(ContractDB.rental_amount).label("revenue"),
+            func.count(ContractDB.id).filter(expiring_filter).label("expiring"),
+        ).group_by(func.coalesce(ContractDB.status, 'draft')).subquery()
+
+        is_active = per_status.c.status == 'active'
+        total_documents = self.db.query(func.count(DocumentDB.id)).scalar_subquery()
+
+        row = self.db.query(
+            func.coalesce(func.sum(per_status.c.total), 0).label("total_contracts"),
+            func.coalesce(func.sum(per_status.c.total).filter(is_active), 0).label("active_contracts"),
+            func.json_object_agg(per_status.c.status, per_status.c.total).label("contracts_by_status"),
+            func.coalesce(func.sum(per_status.c.revenue).filter(is_active), 0).label("monthly_revenue"),
+            func.coalesce(func.sum(per_status.c.expiring).filter(is_active), 0).label("expiring_contracts"),
+            total_documents.label("total_documents"),
+        ).select_from(per_status).one()
+
+        contract_columns = (
+            ContractDB.id,
+            ContractDB.contract_number,
+            ContractDB.client_name,
+            ContractDB.rental_amount,
+            ContractDB.status,
+            ContractDB.end_date,
+        )
+
+        recent_contracts = self.db.query(*contract_columns).order_by(
+            ContractDB.created_at.desc(), ContractDB.id.desc()
+        ).limit(recent_limit).all()
+
+        expiring_soon = self.db.query(*contract_columns).filter(
+            ContractDB.status == 'active',
+            expiring_filter
+        ).order_by(ContractDB.end_date, ContractDB.id).limit(recent_limit).all()
+
+        # Personal notifications and broadcasts together
+        notification_service = NotificationService(self.db)
+        feed = notification_service.feed(user)
+        recent_notifications = self.db.query(
+            feed.c.id,
+            feed.c.title,
+            feed.c.message,
+            feed.c.type,
+            feed.c.is_read,
+            feed.c.created_at,
+        ).order_by(
+            feed.c.created_at.desc(), feed.c.id.desc()
+        ).limit(recent_limit).all()
+
+        return DashboardSummary(
+            total_contracts=row.total_contracts,
+            active_contracts=row.active_contracts,
+            contracts_by_status=row.contracts_by_status or {},
+            monthly_revenue=row.monthly_revenue,
+            expiring_contracts=row.expiring_contracts,
+            expiring_days=expiring_days,
+            total_documents=row.total_documents,
+            unread_notifications=notification_service.unread_count(user),
+            recent_contracts=[DashboardContract(**c._asdict()) for c in recent_contracts],
+            expiring_soon=[DashboardContract(**c._asdict()) for c in expiring_soon],
+            recent_notifications=[DashboardNotification(**n._asdict()) for n in recent_notifications],
+            generated_at=datetime.now(),
+        )
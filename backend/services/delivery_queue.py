@@ -0,0 +1,222 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, delete, func, case, or_, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional
+import logging
+import os
+import random
+
+from models.contract import ContractDB
+from models.delivery import DeliveryDB, DeliveryStats, ChannelStats
+from models.user import UserDB
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = int(os.getenv("DELIVERY_MAX_ATTEMPTS", "6"))
+BACKOFF_BASE_SECONDS = float(os.getenv("DELIVERY_BACKOFF_BASE_SECONDS", "30"))
+BACKOFF_MAX_SECONDS = float(os.getenv("DELIVERY_BACKOFF_MAX_SECONDS", "3600"))
+# A message claimed this long ago by a worker that never reported back is sent again
+STALE_CLAIM_MINUTES = int(os.getenv("DELIVERY_STALE_CLAIM_MINUTES", "10"))
+SENT_RETENTION_DAYS = int(os.getenv("DELIVERY_RETENTION_DAYS", "30"))
+
+def enabled_channels() -> set:
+    """Channels with a configured provider; nothing is queued for the others"""
+    channels = set()
+    if os.getenv("SMTP_HOST"):
+        channels.add("email")
+    if os.getenv("SMS_GATEWAY_URL"):
+        channels.add("sms")
+    return channels
+
+class OutboxMessage(NamedTuple):
+    id: int
+    channel: str
+    recipient: str
+    subject: str
+    body: str
+    attempts: int
+
+class DeliveryResult(NamedTuple):
+    message_id: int
+    error: Optional[str] = None
+    permanent: bool = False
+
+def backoff_seconds(attempts: int) -> float:
+    """Exponential backoff with jitter: 30s, 1m, 2m, ... capped at BACKOFF_MAX_SECONDS"""
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+def _message(channel: str, recipient: Optional[str], row, **related) -> Optional[dict]:
+    recipient = (recipient or "").strip()
+    if not recipient:
+        return None
+    return {
+        "channel": channel,
+        "recipient": recipient,
+        "subject": row.title,
+        "body": row.message,
+        "notification_type": row.type,
+        "dedupe_key": f"{row.dedupe_key}:{channel}:{recipient}" if row.dedupe_key else None,
+        **related,
+    }
+
+def enqueue(db: Session, messages: Iterable[Optional[dict]]) -> int:
+    """Add messages to the outbox in the caller's transaction; already queued keys are skipped"""
+    messages = [message for message in messages if message is not None]
+    if not messages:
+        return 0
+    result = db.execute(
+        pg_insert(DeliveryDB).values(messages).on_conflict_do_nothing(index_elements=['dedupe_key'])
+    )
+    return result.rowcount
+
+def enqueue_contract_messages(db: Session, broadcasts, staff: bool = True) -> int:
+    """Email/SMS the client of each contract broadcast, and (`staff`) email the staff member who created it.
+
+    `broadcasts` are RETURNING rows with related_contract_id, title, message, type and dedupe_key.
+    """
+    channels = enabled_channels()
+    if not broadcasts or not channels:
+        return 0
+
+    contracts = {
+        row.id: row for row in db.execute(
+            select(ContractDB.id, ContractDB.client_email, ContractDB.client_phone, UserDB.email.label("staff_email"))
+            .outerjoin(UserDB, and_(UserDB.id == ContractDB.created_by, UserDB.is_active == True))
+            .where(ContractDB.id.in_({row.related_contract_id for row in broadcasts}))
+        )
+    }
+
+    messages = []
+    for row in broadcasts:
+        contract = contracts.get(row.related_contract_id)
+        if contract is None:
+            continue
+        related = {"related_contract_id": contract.id}
+        if "email" in channels:
+            messages.append(_message("email", contract.client_email, row, **related))
+            if staff:
+                messages.append(_message("email", contract.staff_email, row, **related))
+        if "sms" in channels:
+            messages.append(_message("sms", contract.client_phone, row, **related))
+    return enqueue(db, messages)
+
+def enqueue_user_messages(db: Session, notifications) -> int:
+    """Email the recipients of personal notifications.
+
+    `notifications` are RETURNING rows with user_id, related_document_id, title, message, type and dedupe_key.
+    """
+    if not notifications or "email" not in enabled_channels():
+        return 0
+
+    emails = dict(db.execute(
+        select(UserDB.id, UserDB.email).where(
+            UserDB.id.in_({row.user_id for row in notifications}),
+            UserDB.is_active == True
+        )
+    ).all())
+    return enqueue(db, [
+        _message("email", emails.get(row.user_id), row, related_document_id=row.related_document_id)
+        for row in notifications
+    ])
+
+class DeliveryQueue:
+    """Claims outbox messages and records send outcomes; every call is its own short transaction"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def claim(self, channel: str, limit: int) -> List[OutboxMessage]:
+        """Atomically take up to `limit` due messages (and abandoned claims) of one channel"""
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(minutes=STALE_CLAIM_MINUTES)
+
+        due = select(DeliveryDB.id).where(
+            DeliveryDB.channel == channel,
+            or_(
+                and_(DeliveryDB.status == "pending", DeliveryDB.next_attempt_at <= now),
+                # A worker died mid-send
+                and_(DeliveryDB.status == "sending", DeliveryDB.locked_at < stale_before)
+            )
+        ).order_by(DeliveryDB.next_attempt_at).limit(limit).with_for_update(skip_locked=True)
+
+        rows = self.db.execute(
+            update(DeliveryDB).where(DeliveryDB.id.in_(due.scalar_subquery())).values(
+                status="sending",
+                locked_at=now,
+                attempts=DeliveryDB.attempts + 1
+            ).returning(
+                DeliveryDB.id, DeliveryDB.channel, DeliveryDB.recipient,
+                DeliveryDB.subject, DeliveryDB.body, DeliveryDB.attempts
+            )
+        ).all()
+        self.db.commit()
+        return [OutboxMessage(*row) for row in rows]
+
+    def record(self, messages: List[OutboxMessage], results: List[DeliveryResult]) -> Dict[str, int]:
+        """Mark sent messages and reschedule (or give up on) the failed ones"""
+        attempts = {message.id: message.attempts for message in messages}
+        now = datetime.now(timezone.utc)
+        counts = {"sent": 0, "retried": 0, "failed": 0}
+
+        sent = [result.message_id for result in results if result.error is None]
+        if sent:
+            self.db.execute(
+                update(DeliveryDB).where(DeliveryDB.id.in_(sent)).values(
+                    status="sent", sent_at=now, locked_at=None, last_error=None
+                )
+            )
+            counts["sent"] = len(sent)
+
+        for result in results:
+            if result.error is None:
+                continue
+            if result.permanent or attempts[result.message_id] >= MAX_ATTEMPTS:
+                values = {"status": "failed"}
+                counts["failed"] += 1
+            else:
+                values = {
+                    "status": "pending",
+                    "next_attempt_at": now + timedelta(seconds=backoff_seconds(attempts[result.message_id]))
+                }
+                counts["retried"] += 1
+            self.db.execute(
+                update(DeliveryDB).where(DeliveryDB.id == result.message_id).values(
+                    locked_at=None, last_error=result.error[:1000], **values
+                )
+            )
+
+        self.db.commit()
+        return counts
+
+    def stats(self) -> DeliveryStats:
+        """Queue depth per channel and status, plus the recent send rate"""
+        recent = datetime.now(timezone.utc) - timedelta(minutes=5)
+        rows = self.db.query(
+            DeliveryDB.channel,
+            DeliveryDB.status,
+            func.count(DeliveryDB.id),
+            func.min(case((DeliveryDB.status == "pending", DeliveryDB.created_at))),
+            func.count(case((DeliveryDB.sent_at >= recent, 1)))
+        ).group_by(DeliveryDB.channel, DeliveryDB.status).all()
+
+        channels = {}
+        for channel, status, count, oldest_pending_at, sent_recently in rows:
+            stats = channels.setdefault(channel, ChannelStats())
+            setattr(stats, status, count)
+            if oldest_pending_at is not None:
+                stats.oldest_pending_at = oldest_pending_at
+            stats.sent_last_5_minutes += sent_recently
+        for stats in channels.values():
+            stats.messages_per_second = round(stats.sent_last_5_minutes / 300, 2)
+        return DeliveryStats(channels=channels)
+
+    def purge_sent(self, days: int = SENT_RETENTION_DAYS) -> int:
+        """Delete delivered messages older than `days` days"""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        result = self.db.execute(
+            delete(DeliveryDB).where(DeliveryDB.status == "sent", DeliveryDB.sent_at < cutoff)
+        )
+        self.db.commit()
+        return result.rowcount
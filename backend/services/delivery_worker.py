@@ -0,0 +1,284 @@
+from email.message import EmailMessage
+from typing import Dict, List, Optional
+import asyncio
+import json
+import logging
+import os
+import signal
+import smtplib
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from models import SessionLocal, engine
+from services.delivery_queue import DeliveryQueue, DeliveryResult, OutboxMessage, enabled_channels
+
+logger = logging.getLogger(__name__)
+
+SMTP_HOST = os.getenv("SMTP_HOST", "localhost")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "25"))
+SMTP_USER = os.getenv("SMTP_USER")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "false").lower() == "true"
+SMTP_FROM = os.getenv("SMTP_FROM", "noreply@kyzylzhar.kz")
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "4"))
+# Messages sent over one connection before it goes back to the pool
+SMTP_BATCH_SIZE = int(os.getenv("SMTP_BATCH_SIZE", "50"))
+SMTP_RATE_LIMIT = float(os.getenv("SMTP_RATE_LIMIT", "20"))  # messages/sec, 0 = unlimited
+
+SMS_GATEWAY_URL = os.getenv("SMS_GATEWAY_URL")
+SMS_GATEWAY_TOKEN = os.getenv("SMS_GATEWAY_TOKEN")
+SMS_CONCURRENCY = int(os.getenv("SMS_CONCURRENCY", "4"))
+SMS_RATE_LIMIT = float(os.getenv("SMS_RATE_LIMIT", "5"))
+
+CLAIM_BATCH_SIZE = int(os.getenv("DELIVERY_CLAIM_BATCH_SIZE", "200"))
+POLL_INTERVAL = float(os.getenv("DELIVERY_POLL_INTERVAL", "2"))
+
+class RateLimiter:
+    """Token bucket shared by every connection of one provider (thread-safe)"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst or max(rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class SmtpSender:
+    """Sends email batches over a pool of reused SMTP connections.
+
+    smtplib is blocking, so each batch runs on a worker thread holding one
+    pooled connection; the pool size bounds concurrent connections to the relay.
+    """
+    channel = "email"
+
+    def __init__(self, host: str = SMTP_HOST, port: int = SMTP_PORT, pool_size: int = SMTP_POOL_SIZE,
+                 batch_size: int = SMTP_BATCH_SIZE, rate_limit: float = SMTP_RATE_LIMIT,
+                 sender: str = SMTP_FROM):
+        self.host = host
+        self.port = port
+        self.batch_size = batch_size
+        self.sender = sender
+        self.limiter = RateLimiter(rate_limit)
+        self.pool = asyncio.Queue()
+        for _ in range(pool_size):
+            # Connections are opened lazily by the batch that first needs them
+            self.pool.put_nowait(None)
+
+    def connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.host, self.port, timeout=30)
+        if SMTP_STARTTLS:
+            connection.starttls()
+        if SMTP_USER:
+            connection.login(SMTP_USER, SMTP_PASSWORD)
+        return connection
+
+    def build(self, message: OutboxMessage) -> EmailMessage:
+        email = EmailMessage()
+        email["From"] = self.sender
+        email["To"] = message.recipient
+        email["Subject"] = message.subject
+        email.set_content(message.body)
+        return email
+
+    def send_on(self, connection: Optional[smtplib.SMTP], messages: List[OutboxMessage]):
+        """Send a batch on one connection (runs on a thread); returns the connection for the pool"""
+        results = []
+        for index, message in enumerate(messages):
+            self.limiter.acquire()
+            for attempt in range(2):
+                if connection is None:
+                    try:
+                        connection = self.connect()
+                    except (smtplib.SMTPException, OSError) as e:
+                        # The relay is unreachable: the rest of the batch would fail the same way
+                        results.extend(
+                            DeliveryResult(pending.id, f"SMTP connect failed: {e}") for pending in messages[index:]
+                        )
+                        return None, results
+                try:
+                    connection.send_message(self.build(message))
+                    results.append(DeliveryResult(message.id))
+                except smtplib.SMTPServerDisconnected as e:
+                    # The relay closed an idle pooled connection; reconnect once
+                    connection = None
+                    if attempt == 0:
+                        continue
+                    results.append(DeliveryResult(message.id, str(e)))
+                except smtplib.SMTPRecipientsRefused as e:
+                    results.append(DeliveryResult(message.id, str(e), permanent=True))
+                except smtplib.SMTPResponseException as e:
+                    # 5xx is a permanent rejection, 4xx a temporary one
+                    results.append(DeliveryResult(message.id, f"{e.smtp_code} {e.smtp_error!r}",
+                                                  permanent=e.smtp_code >= 500))
+                except (smtplib.SMTPException, OSError) as e:
+                    connection = None
+                    results.append(DeliveryResult(message.id, str(e)))
+                break
+        return connection, results
+
+    async def send_batch(self, messages: List[OutboxMessage]) -> List[DeliveryResult]:
+        async def send_chunk(chunk):
+            connection = await self.pool.get()
+            try:
+                connection, results = await asyncio.to_thread(self.send_on, connection, chunk)
+            except Exception as e:
+                connection, results = None, [DeliveryResult(message.id, str(e)) for message in chunk]
+            self.pool.put_nowait(connection)
+            return results
+
+        chunks = [messages[start:start + self.batch_size] for start in range(0, len(messages), self.batch_size)]
+        results = await asyncio.gather(*(send_chunk(chunk) for chunk in chunks))
+        return [result for chunk_results in results for result in chunk_results]
+
+    async def close(self):
+        while not self.pool.empty():
+            connection = self.pool.get_nowait()
+            if connection is not None:
+                try:
+                    connection.quit()
+                except (smtplib.SMTPException, OSError):
+                    pass
+
+class SmsSender:
+    """Posts each SMS to an HTTP gateway (JSON {"to", "text"}), SMS_CONCURRENCY at a time"""
+    channel = "sms"
+
+    def __init__(self, url: str = SMS_GATEWAY_URL, token: Optional[str] = SMS_GATEWAY_TOKEN,
+                 concurrency: int = SMS_CONCURRENCY, rate_limit: float = SMS_RATE_LIMIT):
+        self.url = url
+        self.token = token
+        self.limiter = RateLimiter(rate_limit)
+        self.slots = asyncio.Semaphore(concurrency)
+
+    def send_one(self, message: OutboxMessage) -> DeliveryResult:
+        self.limiter.acquire()
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"to": message.recipient, "text": f"{message.subject}. {message.body}"}).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        if self.token:
+            request.add_header("Authorization", f"Bearer {self.token}")
+        try:
+            with urllib.request.urlopen(request, timeout=30):
+                return DeliveryResult(message.id)
+        except urllib.error.HTTPError as e:
+            # 4xx: the gateway rejected the message itself (bad number, ...); 429 and 5xx are retried
+            return DeliveryResult(message.id, f"HTTP {e.code}", permanent=400 <= e.code < 500 and e.code != 429)
+        except (urllib.error.URLError, OSError) as e:
+            return DeliveryResult(message.id, str(e))
+
+    async def send_batch(self, messages: List[OutboxMessage]) -> List[DeliveryResult]:
+        async def send(message):
+            async with self.slots:
+                return await asyncio.to_thread(self.send_one, message)
+        return list(await asyncio.gather(*(send(message) for message in messages)))
+
+    async def close(self):
+        pass
+
+class DeliveryWorker:
+    """Drains the delivery outbox, one asyncio task per channel.
+
+    Claims are short transactions (FOR UPDATE SKIP LOCKED), so several worker
+    processes can share the outbox; sends happen outside any transaction.
+    """
+
+    def __init__(self, senders: Dict[str, object], claim_batch_size: int = CLAIM_BATCH_SIZE,
+                 poll_interval: float = POLL_INTERVAL):
+        self.senders = senders
+        self.claim_batch_size = claim_batch_size
+        self.poll_interval = poll_interval
+        self.is_running = False
+
+    def claim(self, channel: str) -> List[OutboxMessage]:
+        db = SessionLocal()
+        try:
+            return DeliveryQueue(db).claim(channel, self.claim_batch_size)
+        finally:
+            db.close()
+
+    def record(self, messages: List[OutboxMessage], results: List[DeliveryResult]) -> Dict[str, int]:
+        db = SessionLocal()
+        try:
+            return DeliveryQueue(db).record(messages, results)
+        finally:
+            db.close()
+
+    async def run_once(self, channel: str) -> int:
+        """Send one claimed batch; return how many messages were claimed"""
+        messages = await asyncio.to_thread(self.claim, channel)
+        if not messages:
+            return 0
+
+        started = time.perf_counter()
+        results = await self.senders[channel].send_batch(messages)
+        elapsed = time.perf_counter() - started
+        counts = await asyncio.to_thread(self.record, messages, results)
+
+        logger.info(f"{channel}: sent {counts['sent']}, retrying {counts['retried']}, failed {counts['failed']} "
+                    f"in {elapsed:.2f}s ({counts['sent'] / elapsed if elapsed else 0:.1f} msg/s)")
+        return len(messages)
+
+    async def run_channel(self, channel: str):
+        while self.is_running:
+            try:
+                if not await self.run_once(channel):
+                    await asyncio.sleep(self.poll_interval)
+            except Exception as e:
+                logger.error(f"Delivery worker error ({channel}): {e}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def run(self):
+        self.is_running = True
+        logger.info(f"Delivery worker {os.getpid()} started for {', '.join(sorted(self.senders))}")
+        try:
+            await asyncio.gather(*(self.run_channel(channel) for channel in self.senders))
+        finally:
+            for sender in self.senders.values():
+                await sender.close()
+
+    def stop(self):
+        self.is_running = False
+        logger.info(f"Delivery worker {os.getpid()} stopped")
+
+def build_senders() -> Dict[str, object]:
+    """A sender for every channel with a configured provider"""
+    senders = {}
+    channels = enabled_channels()
+    if "email" in channels:
+        senders["email"] = SmtpSender()
+    if "sms" in channels:
+        senders["sms"] = SmsSender()
+    return senders
+
+async def run_worker():
+    """Entry point: run until SIGTERM/SIGINT, finishing the batches in flight"""
+    engine.dispose()
+    senders = build_senders()
+    if not senders:
+        logger.warning("No delivery channel configured (set SMTP_HOST and/or SMS_GATEWAY_URL)")
+        return
+
+    worker = DeliveryWorker(senders)
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, worker.stop)
+    await worker.run()
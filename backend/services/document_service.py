@@ -1,67 +1,118 @@
 import os
-import shutil
+import hashlib
 import uuid
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from datetime import datetime, date
+from sqlalchemy import func
+from datetime import datetime, date, timedelta
 
-from models.document import DocumentDB, DocumentCreate
+from models.document import DocumentDB, DocumentCreate, DocumentSearchResult, Document
+from services.blob_store import blob_store
+from utils.file_handler import CHUNK_SIZE
+from utils.search_filters import tags_filter
+
+SEARCH_CONFIG = "russian"
+SNIPPET_OPTIONS = "MaxFragments=2, MaxWords=25, MinWords=8, StartSel=<b>, StopSel=</b>"
 
 class DocumentService:
     def __init__(self, db: Session):
         self.db = db
-        self.upload_dir = "uploads/documents"
-        os.makedirs(self.upload_dir, exist_ok=True)
+        self.blob_store = blob_store
 
-    def save_uploaded_file(self, file, filename: str = None) -> str:
-        """Save uploaded file and return file path"""
-        if not filename:
-            file_extension = os.path.splitext(file.filename)[1]
-            filename = f"{uuid.uuid4().hex}{file_extension}"
-        
-        file_path = os.path.join(self.upload_dir, filename)
-        
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        return file_path
+    def save_uploaded_file(self, file) -> dict:
+        """Save uploaded file into the blob store; return its path, size and SHA-256"""
+        file_extension = os.path.splitext(file.filename)[1]
+        temp_path = os.path.join(self.blob_store.incoming_dir, f"{uuid.uuid4().hex}{file_extension}")
+        sha256 = hashlib.sha256()
+        size = 0
+        
+        with open(temp_path, "wb") as buffer:
+            for chunk in iter(lambda: file.file.read(CHUNK_SIZE), b""):
+                sha256.update(chunk)
+                buffer.write(chunk)
+                size += len(chunk)
+        
+        digest = sha256.hexdigest()
+        return {
+            "file_path": self.blob_store.add(self.db, temp_path, digest, size),
+            "file_size": size,
+            "sha256": digest
+        }
 
     def create_document(self, document_data: DocumentCreate, file_path: str, 
-                       file_size: int, uploaded_by: int) -> DocumentDB:
+                       file_size: int, uploaded_by: int, sha256: str = None) -> DocumentDB:
         """Create document record in database"""
         db_document = DocumentDB(
             **document_data.dict(),
             file_path=file_path,
             file_size=file_size,
+            sha256=sha256,
             uploaded_by=uploaded_by
         )
         
         self.db.add(db_document)
-        self.db.commit()
+        try:
+            self.db.commit()
+        except Exception:
+            # save_uploaded_file's blob reference rolled back with the document
+            self.db.rollback()
+            if sha256:
+                self.blob_store.discard(self.db, sha256)
+            raise
         self.db.refresh(db_document)
         
         return db_document
 
     def search_documents(self, query: str, tags: List[str] = None, 
                         contract_id: int = None) -> List[DocumentDB]:
-        """Search documents by title, description, and tags"""
+        """Search documents by title, description, tags and file contents"""
         db_query = self.db.query(DocumentDB)
         
         if query:
-            db_query = db_query.filter(
-                DocumentDB.title.ilike(f"%{query}%") |
-                DocumentDB.description.ilike(f"%{query}%")
-            )
+            ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+            db_query = db_query.filter(DocumentDB.search_vector.bool_op("@@")(ts_query))
         
         if tags:
-            for tag in tags:
-                db_query = db_query.filter(DocumentDB.tags.contains([tag]))
+            db_query = db_query.filter(tags_filter(DocumentDB.tags, tags))
         
         if contract_id:
             db_query = db_query.filter(DocumentDB.contract_id == contract_id)
         
         return db_query.all()
 
+    def full_text_search(self, query: str, limit: int = 20,
+                         contract_id: int = None) -> List[DocumentSearchResult]:
+        """Ranked search over the GIN-indexed search_vector, with highlighted snippets"""
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        rank = func.ts_rank_cd(DocumentDB.search_vector, ts_query)
+        
+        # Rank using the index only; build snippets just for the returned page
+        top = self.db.query(DocumentDB.id.label("id"), rank.label("rank")).filter(
+            DocumentDB.search_vector.bool_op("@@")(ts_query)
+        )
+        if contract_id:
+            top = top.filter(DocumentDB.contract_id == contract_id)
+        top = top.order_by(rank.desc(), DocumentDB.id.desc()).limit(limit).subquery()
+        
+        snippet = func.ts_headline(
+            SEARCH_CONFIG,
+            func.coalesce(func.left(DocumentDB.content_text, 100000), DocumentDB.description, DocumentDB.title),
+            ts_query,
+            SNIPPET_OPTIONS
+        )
+        rows = self.db.query(DocumentDB, top.c.rank, snippet.label("snippet")).join(
+            top, DocumentDB.id == top.c.id
+        ).order_by(top.c.rank.desc(), DocumentDB.id.desc()).all()
+        
+        return [
+            DocumentSearchResult(
+                **Document.model_validate(document).model_dump(),
+                rank=document_rank,
+                snippet=document_snippet
+            )
+            for document, document_rank, document_snippet in rows
+        ]
+
     def get_documents_expiring_soon(self, days_ahead: int = 30) -> List[DocumentDB]:
         """Get documents that will expire soon"""
         expiry_threshold = date.today() + timedelta(days=days_ahead)
@@ -78,14 +129,21 @@ class DocumentService:
         if not document:
             return False
         
-        # Delete file from filesystem
-        if os.path.exists(document.file_path):
-            os.remove(document.file_path)
+        # Drop the blob reference; files uploaded before the blob store are owned by the document alone
+        sha256, file_path = document.sha256, document.file_path
+        in_store = self.blob_store.owns(sha256, file_path)
+        last_reference = in_store and self.blob_store.release(self.db, sha256)
         
         # Delete from database
         self.db.delete(document)
         self.db.commit()
         
+        # Files go only once the delete is committed
+        if last_reference:
+            self.blob_store.purge(self.db, sha256)
+        elif not in_store and os.path.exists(file_path):
+            os.remove(file_path)
+        
         return True
 
     def get_document_statistics(self) -> dict:
@@ -0,0 +1,114 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, update
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+import socket
+
+from models.job_run import JobRunDB, JobStats
+
+class JobRunService:
+    """Run history of scheduled jobs (the job_runs table)"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def start(self, job_name: str, scheduled_for: datetime) -> int:
+        run = JobRunDB(
+            job_name=job_name,
+            scheduled_for=scheduled_for,
+            status="running",
+            started_at=datetime.now(timezone.utc),
+            host=socket.gethostname()
+        )
+        self.db.add(run)
+        self.db.commit()
+        return run.id
+
+    def finish(self, run_id: int, status: str, rows_affected: Optional[int] = None,
+               error: Optional[str] = None) -> bool:
+        """Record the outcome; a run already marked timed out or abandoned is left as is"""
+        finished_at = datetime.now(timezone.utc)
+        result = self.db.execute(
+            update(JobRunDB).where(
+                JobRunDB.id == run_id,
+                JobRunDB.status == "running"
+            ).values(
+                status=status,
+                finished_at=finished_at,
+                duration_ms=func.floor(
+                    func.extract("epoch", finished_at - JobRunDB.started_at) * 1000
+                ),
+                rows_affected=rows_affected,
+                error=error
+            )
+        )
+        self.db.commit()
+        return result.rowcount > 0
+
+    def last_slot(self, job_name: str) -> Optional[datetime]:
+        """Latest schedule slot already covered by a run.
+
+        Abandoned runs (their scheduler died) do not count, so the slot runs again.
+        """
+        return self.db.query(func.max(JobRunDB.scheduled_for)).filter(
+            JobRunDB.job_name == job_name,
+            JobRunDB.status != "abandoned"
+        ).scalar()
+
+    def abandon_running(self) -> int:
+        """Close runs left open by a previous leader; called right after taking the lease"""
+        result = self.db.execute(
+            update(JobRunDB).where(JobRunDB.status == "running").values(
+                status="abandoned",
+                finished_at=datetime.now(timezone.utc),
+                error="Scheduler stopped before the job finished"
+            )
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def history(self, job_name: Optional[str] = None, limit: int = 50) -> List[JobRunDB]:
+        query = self.db.query(JobRunDB)
+        if job_name:
+            query = query.filter(JobRunDB.job_name == job_name)
+        return query.order_by(JobRunDB.started_at.desc(), JobRunDB.id.desc()).limit(limit).all()
+
+    def stats(self, days: int = 7) -> List[JobStats]:
+        """Run counts and duration percentiles per job over the last `days` days.
+
+        Unfinished runs have no duration; percentile_cont skips NULLs.
+        """
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        rows = self.db.query(
+            JobRunDB.job_name,
+            func.count(JobRunDB.id).label("runs"),
+            func.count(case((JobRunDB.status.in_(["failed", "timeout", "abandoned"]), 1))).label("failures"),
+            func.max(JobRunDB.started_at).label("last_started_at"),
+            func.percentile_cont(0.5).within_group(JobRunDB.duration_ms).label("p50_ms"),
+            func.percentile_cont(0.95).within_group(JobRunDB.duration_ms).label("p95_ms"),
+            func.percentile_cont(0.99).within_group(JobRunDB.duration_ms).label("p99_ms"),
+            func.max(JobRunDB.duration_ms).label("max_ms")
+        ).filter(
+            JobRunDB.started_at >= since
+        ).group_by(JobRunDB.job_name).order_by(JobRunDB.job_name).all()
+
+        last_status = dict(
+            self.db.query(JobRunDB.job_name, JobRunDB.status).distinct(JobRunDB.job_name).order_by(
+                JobRunDB.job_name, JobRunDB.started_at.desc(), JobRunDB.id.desc()
+            ).filter(JobRunDB.started_at >= since).all()
+        )
+
+        return [
+            JobStats(
+                job_name=row.job_name,
+                runs=row.runs,
+                failures=row.failures,
+                last_started_at=row.last_started_at,
+                last_status=last_status.get(row.job_name),
+                p50_ms=row.p50_ms,
+                p95_ms=row.p95_ms,
+                p99_ms=row.p99_ms,
+                max_ms=row.max_ms
+            )
+            for row in rows
+        ]
@@ -0,0 +1,151 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from collections import defaultdict
+from typing import Dict, Optional, Set
+import asyncio
+import json
+import logging
+import os
+import select as io_select
+import threading
+import time
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+from models import DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "notification_events"
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+QUEUE_SIZE = int(os.getenv("NOTIFICATION_STREAM_QUEUE_SIZE", "100"))
+LISTEN_POLL_SECONDS = 5
+RECONNECT_DELAY_SECONDS = 2
+
+def publish_event(db: Session, event: dict):
+    """Queue an event for every worker's hub; PostgreSQL delivers it when `db` commits.
+
+    `event["user_id"]` selects the recipient, None means every connected user.
+    A notification too large for a NOTIFY payload is sent without its body and
+    clients fetch it by id.
+    """
+    payload = json.dumps(event, ensure_ascii=False, default=str)
+    if len(payload.encode()) > MAX_PAYLOAD_BYTES and "notification" in event:
+        event = dict(event, id=event["notification"]["id"], notification=None)
+        payload = json.dumps(event, ensure_ascii=False, default=str)
+    db.execute(select(func.pg_notify(CHANNEL, payload)))
+
+class NotificationHub:
+    """Per-worker fan-out of notification events to streaming clients.
+
+    Every worker holds one LISTEN connection; events published by any worker or
+    background job (via NOTIFY) reach all workers' subscribers. A subscriber is just
+    a bounded asyncio.Queue, so idle connections cost no threads and no DB sessions.
+    """
+
+    def __init__(self, dsn: str = DATABASE_URL, channel: str = CHANNEL, queue_size: int = QUEUE_SIZE):
+        self.dsn = dsn
+        self.channel = channel
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.delivered = 0
+        self.dropped = 0
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        """Start the LISTEN thread delivering into `loop`"""
+        if self._running:
+            return
+        self._loop = loop
+        self._running = True
+        self._thread = threading.Thread(target=self._listen, name="notification-hub", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue):
+        queues = self._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+
+    def stats(self) -> dict:
+        return {
+            "connections": sum(len(queues) for queues in self._subscribers.values()),
+            "users": len(self._subscribers),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "listening": self._running,
+        }
+
+    def dispatch(self, event: dict):
+        """Deliver an event to its recipients' queues; runs on the event loop"""
+        user_id = event.get("user_id")
+        if user_id is None:
+            queues = [queue for queues in self._subscribers.values() for queue in queues]
+        else:
+            queues = list(self._subscribers.get(user_id, ()))
+
+        for queue in queues:
+            try:
+                queue.put_nowait(event)
+                self.delivered += 1
+            except asyncio.QueueFull:
+                # A client that stopped reading: discard its backlog and have it reload
+                self.dropped += queue.qsize()
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait({"event": "resync", "user_id": user_id})
+
+    def _dispatch_payload(self, payload: str):
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed notification event: {payload[:200]}")
+            return
+        self.dispatch(event)
+
+    def _listen(self):
+        reconnecting = False
+        while self._running:
+            conn = None
+            try:
+                conn = psycopg2.connect(self.dsn)
+                conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.channel}")
+                logger.info(f"Notification hub listening on '{self.channel}' (pid {os.getpid()})")
+
+                if reconnecting:
+                    # Events sent while disconnected are lost
+                    self._loop.call_soon_threadsafe(self.dispatch, {"event": "resync", "user_id": None})
+                reconnecting = True
+
+                while self._running:
+                    ready, _, _ = io_select.select([conn], [], [], LISTEN_POLL_SECONDS)
+                    if not ready:
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        self._loop.call_soon_threadsafe(self._dispatch_payload, notify.payload)
+            except Exception as e:
+                logger.error(f"Notification hub connection error: {e}")
+                time.sleep(RECONNECT_DELAY_SECONDS)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+notification_hub = NotificationHub()
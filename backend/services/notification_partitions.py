@@ -0,0 +1,75 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from datetime import date, datetime, timezone
+from typing import List, NamedTuple, Optional
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "notifications"
+DEFAULT_PARTITION = "notifications_default"
+PARTITION_NAME = re.compile(r"^notifications_p(\d{4})(\d{2})$")
+
+class Partition(NamedTuple):
+    name: str
+    start: datetime
+    end: datetime
+
+def month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+def add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+def partition_for(month: date) -> Partition:
+    """The monthly partition holding rows created in `month`"""
+    start = month_start(month)
+    end = add_months(start, 1)
+    return Partition(
+        name=f"{PARENT_TABLE}_p{start:%Y%m}",
+        start=datetime(start.year, start.month, 1, tzinfo=timezone.utc),
+        end=datetime(end.year, end.month, 1, tzinfo=timezone.utc),
+    )
+
+def list_partitions(db: Session) -> List[Partition]:
+    """Monthly partitions currently attached to notifications, oldest first"""
+    rows = db.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :parent"
+    ), {"parent": PARENT_TABLE}).scalars().all()
+
+    partitions = []
+    for name in rows:
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions.append(partition_for(date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda partition: partition.start)
+
+def ensure_partitions(db: Session, months_ahead: int = 3, today: Optional[date] = None) -> List[str]:
+    """Create monthly partitions from the current month to `months_ahead` months ahead.
+
+    Rows for a month without a partition land in notifications_default, which would
+    then block creating that month's partition, so this runs well ahead of time.
+    """
+    current = month_start(today or date.today())
+    existing = {partition.name for partition in list_partitions(db)}
+
+    created = []
+    for offset in range(months_ahead + 1):
+        partition = partition_for(add_months(current, offset))
+        if partition.name in existing:
+            continue
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition.name} PARTITION OF {PARENT_TABLE} "
+            f"FOR VALUES FROM ('{partition.start.isoformat()}') TO ('{partition.end.isoformat()}')"
+        ))
+        created.append(partition.name)
+
+    db.commit()
+    if created:
+        logger.info(f"Created notification partitions: {', '.join(created)}")
+    return created
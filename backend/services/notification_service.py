@@ -1,158 +1,470 @@
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta, date
-from typing import List
+from sqlalchemy import select, insert, update, exists, join, literal, func, and_, or_, union_all, cast, null, text, tuple_, case, DateTime
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.dialects.postgresql import insert as pg_insert, aggregate_order_by
+from collections import Counter
+from datetime import datetime, timedelta, date, timezone
+from typing import Callable, List, Optional
 import asyncio
 import logging
+import os
+import time
 
-from models.notification import NotificationDB, NotificationCreate
+from models.notification import (
+    NotificationDB, NotificationCreate, Notification,
+    BroadcastNotificationDB, BroadcastReceiptDB, BroadcastWatermarkDB, NotificationCounterDB, NotificationKeyDB,
+    NotificationDigestItemDB
+)
 from models.contract import ContractDB
 from models.document import DocumentDB
+from models.reminder_event import ReminderEventDB
 from models.user import UserDB
+from services.delivery_queue import enqueue_contract_messages, enqueue_user_messages
+from services.notification_hub import publish_event
+from services.notification_partitions import list_partitions
+from services.reminder_rules import ReminderRule, CONTRACT_EXPIRY, DOCUMENT_EXPIRY
 
 logger = logging.getLogger(__name__)
 
+CLEANUP_BATCH_SIZE = int(os.getenv("NOTIFICATION_CLEANUP_BATCH_SIZE", "5000"))
+CLEANUP_BATCH_PAUSE = float(os.getenv("NOTIFICATION_CLEANUP_BATCH_PAUSE", "0.2"))
+PARTITION_LOCK_TIMEOUT = "5s"
+# The feed only reads this far back, so queries touch recent partitions only
+FEED_WINDOW_DAYS = int(os.getenv("NOTIFICATION_FEED_DAYS", "365"))
+# Types collected into one digest per user (per run of send_digests) instead of one notification per item
+DIGEST_TYPES = {part.strip() for part in os.getenv("NOTIFICATION_DIGEST_TYPES", "payment_due").split(",") if part.strip()}
+DIGEST_TOP_N = int(os.getenv("NOTIFICATION_DIGEST_TOP_N", "5"))
+DIGEST_TITLES = {
+    "contract_expiry": "Истекающие договоры",
+    "payment_due": "Напоминания об оплате аренды",
+    "document_expiry": "Истекающие документы",
+}
+# Frontend lists the digest links to
+DIGEST_LINKS = {
+    "contract_expiry": "/contracts?expiring_soon=true",
+    "payment_due": "/contracts?status=active",
+    "document_expiry": "/documents?expiring_soon=true",
+}
+
 class NotificationService:
     def __init__(self, db: Session):
         self.db = db
 
     def create_notification(self, notification: NotificationCreate) -> NotificationDB:
-        """Create a new notification"""
+        """Create a new notification and push it to the recipient's open streams"""
         db_notification = NotificationDB(**notification.dict())
         self.db.add(db_notification)
+        self.db.flush()
+        self.db.refresh(db_notification)
+        unread_count = self._adjust_unread(db_notification.user_id, 1)
+        
+        # Delivered by PostgreSQL only if the insert commits
+        publish_event(self.db, {
+            "event": "notification",
+            "user_id": db_notification.user_id,
+            "notification": Notification.model_validate(db_notification).model_dump(mode="json"),
+            "unread_delta": 1,
+            "unread_count": unread_count
+        })
         self.db.commit()
         self.db.refresh(db_notification)
         return db_notification
 
-    def notify_contract_expiry(self, days_ahead: int = 30):
-        """Notify about contracts expiring soon"""
-        expiry_threshold = date.today() + timedelta(days=days_ahead)
+    def _run_bulk_job(self, job_name: str, statement, publish: Optional[Callable] = None) -> dict:
+        """Execute a set-based INSERT ... SELECT in a single transaction and time it.
+
+        `publish(result)` runs inside the transaction to announce the new rows.
+        """
+        started = time.perf_counter()
+        try:
+            result = self.db.execute(statement)
+            if publish is not None:
+                publish(result)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
         
-        expiring_contracts = self.db.query(ContractDB).filter(
-            ContractDB.end_date <= expiry_threshold,
-            ContractDB.end_date >= date.today(),
-            ContractDB.status.in_(['active', 'signed'])
-        ).all()
+        stats = {
+            "job": job_name,
+            "notifications_created": result.rowcount,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+        logger.info(f"{job_name}: created {stats['notifications_created']} notifications in {stats['duration_ms']} ms")
+        return stats
+
+    def _publish_broadcasts(self, count: int):
+        if count > 0:
+            # A new broadcast is unread for every existing user
+            self.db.execute(
+                update(NotificationCounterDB).values(
+                    unread_count=NotificationCounterDB.unread_count + count
+                )
+            )
+            publish_event(self.db, {
+                "event": "broadcast",
+                "user_id": None,
+                "count": count,
+                "unread_delta": count
+            })
+
+    def _publish_per_user(self, rows):
+        # One event per recipient rather than per row
+        for user_id, count in Counter(row.user_id for row in rows).items():
+            publish_event(self.db, {
+                "event": "unread",
+                "user_id": user_id,
+                "unread_delta": count,
+                "unread_count": self._adjust_unread(user_id, count)
+            })
+
+    def _publish_contract_broadcasts(self, result):
+        """Announce new contract broadcasts and queue their emails/SMS in the same transaction"""
+        broadcasts = result.all()
+        self._publish_broadcasts(len(broadcasts))
+        enqueue_contract_messages(self.db, broadcasts)
+
+    def _queue_digest_client_messages(self, result):
+        """Clients still get their own email/SMS per item; staff get the digest"""
+        enqueue_contract_messages(self.db, result.all(), staff=False)
+
+    def _collect_digest_items(self, job_name: str, items, columns: List[str],
+                              publish: Optional[Callable] = None, ctes: tuple = ()) -> dict:
+        """Digest mode: hold the new items for send_digests() instead of notifying now"""
+        statement = pg_insert(NotificationDigestItemDB).from_select(columns, items).on_conflict_do_nothing(
+            index_elements=['dedupe_key']
+        ).returning(
+            NotificationDigestItemDB.related_contract_id,
+            NotificationDigestItemDB.title,
+            NotificationDigestItemDB.message,
+            NotificationDigestItemDB.notification_type.label("type"),
+            NotificationDigestItemDB.dedupe_key
+        )
+        for cte in ctes:
+            statement = statement.add_cte(cte)
+        return self._run_bulk_job(job_name, statement, publish)
+
+    def _publish_user_notifications(self, result):
+        """Announce new personal notifications and queue their emails in the same transaction"""
+        notifications = result.all()
+        self._publish_per_user(notifications)
+        enqueue_user_messages(self.db, notifications)
+
+    def _preview(self, job_name: str, candidates, already_sent) -> dict:
+        """Dry run: list the candidates whose dedupe key has not fired yet"""
+        rows = self.db.execute(candidates.where(~already_sent)).mappings().all()
+        return {
+            "job": job_name,
+            "dry_run": True,
+            "would_create": len(rows),
+            "items": [dict(row) for row in rows],
+        }
+
+    def notify_contract_expiry(self, rule: ReminderRule = CONTRACT_EXPIRY, dry_run: bool = False,
+                               entity_ids: Optional[List[int]] = None) -> dict:
+        """Broadcast a notice about each contract reaching a reminder tier (one row for all users).
+
+        All tiers are evaluated in one range scan over end_date; each contract gets its
+        nearest tier, which fires once. The dedupe key (type, contract, end date, tier)
+        has a unique index, so reruns and concurrent schedulers insert nothing.
+        `entity_ids` limits the run to contracts whose reminder events are due.
+        """
+        today = date.today()
+        days_left = rule.days_left(today)
+        dedupe_key = rule.dedupe_key(today)
+        conditions = rule.window(today, entity_ids)
         
-        notifications_created = 0
+        if dry_run:
+            candidates = select(
+                ContractDB.id.label("contract_id"),
+                ContractDB.contract_number,
+                ContractDB.end_date,
+                days_left.label("days_left"),
+                rule.tier(today).label("tier"),
+                dedupe_key.label("dedupe_key")
+            ).where(*conditions)
+            already_sent = exists().where(BroadcastNotificationDB.dedupe_key == dedupe_key)
+            return self._preview(rule.notification_type, candidates, already_sent)
         
-        for contract in expiring_contracts:
-            # Check if notification already exists
-            existing_notification = self.db.query(NotificationDB).filter(
-                NotificationDB.related_contract_id == contract.id,
-                NotificationDB.type == 'contract_expiry',
-                NotificationDB.created_at >= datetime.now() - timedelta(days=7)
-            ).first()
-            
-            if not existing_notification:
-                # Get all users (in real app, you might want to notify specific roles)
-                users = self.db.query(UserDB).filter(UserDB.is_active == True).all()
-                
-                for user in users:
-                    days_until_expiry = (contract.end_date - date.today()).days
-                    
-                    notification = NotificationCreate(
-                        user_id=user.id,
-                        title="Скоро истекает договор аренды",
-                        message=f"Договор № {contract.contract_number} с клиентом {contract.client_name} "
-                               f"истекает через {days_until_expiry} дней ({contract.end_date.strftime('%d.%m.%Y')})",
-                        type="contract_expiry",
-                        related_contract_id=contract.id
-                    )
-                    
-                    self.create_notification(notification)
-                    notifications_created += 1
-        
-        logger.info(f"Created {notifications_created} contract expiry notifications")
-        return notifications_created
+        broadcasts = select(
+            literal("Скоро истекает договор аренды"),
+            func.concat(
+                "Договор № ", ContractDB.contract_number,
+                " с клиентом ", ContractDB.client_name,
+                " истекает через ", days_left,
+                " дней (", func.to_char(ContractDB.end_date, 'DD.MM.YYYY'), ")"
+            ),
+            literal(rule.notification_type),
+            ContractDB.id,
+            dedupe_key
+        ).where(*conditions)
+        
+        if rule.notification_type in DIGEST_TYPES:
+            items = broadcasts.add_columns(ContractDB.end_date).where(
+                # Already announced one by one before digest mode was switched on
+                ~exists().where(BroadcastNotificationDB.dedupe_key == dedupe_key)
+            )
+            return self._collect_digest_items(
+                rule.notification_type, items,
+                ['title', 'message', 'notification_type', 'related_contract_id', 'dedupe_key', 'due_date'],
+                self._queue_digest_client_messages
+            )
+        
+        statement = pg_insert(BroadcastNotificationDB).from_select(
+            ['title', 'message', 'type', 'related_contract_id', 'dedupe_key'],
+            broadcasts
+        ).on_conflict_do_nothing(index_elements=['dedupe_key']).returning(
+            BroadcastNotificationDB.related_contract_id,
+            BroadcastNotificationDB.title,
+            BroadcastNotificationDB.message,
+            BroadcastNotificationDB.type,
+            BroadcastNotificationDB.dedupe_key
+        )
+        return self._run_bulk_job(rule.notification_type, statement, self._publish_contract_broadcasts)
+
+    def notify_document_expiry(self, rule: ReminderRule = DOCUMENT_EXPIRY, dry_run: bool = False,
+                               entity_ids: Optional[List[int]] = None) -> dict:
+        """Notify the uploader and admins about documents reaching a reminder tier.
 
-    def notify_document_expiry(self, days_ahead: int = 30):
-        """Notify about documents expiring soon"""
-        expiry_threshold = date.today() + timedelta(days=days_ahead)
+        `notifications` is partitioned, so it cannot carry a global unique index;
+        keys are claimed in notification_keys first and only newly claimed keys
+        become notifications, in the same statement.
+        """
+        today = date.today()
+        dedupe_key = rule.dedupe_key(today, UserDB.id)
+        conditions = rule.window(today, entity_ids)
+        recipients_join = join(
+            DocumentDB, UserDB,
+            or_(
+                UserDB.id == DocumentDB.uploaded_by,
+                and_(UserDB.role == 'admin', UserDB.is_active == True)
+            )
+        )
         
-        expiring_documents = self.db.query(DocumentDB).filter(
-            DocumentDB.expiry_date <= expiry_threshold,
-            DocumentDB.expiry_date >= date.today()
-        ).all()
+        if dry_run:
+            candidates = select(
+                DocumentDB.id.label("document_id"),
+                UserDB.id.label("user_id"),
+                DocumentDB.expiry_date,
+                rule.days_left(today).label("days_left"),
+                rule.tier(today).label("tier"),
+                dedupe_key.label("dedupe_key")
+            ).select_from(recipients_join).where(*conditions)
+            already_sent = exists().where(NotificationKeyDB.dedupe_key == dedupe_key)
+            return self._preview(rule.notification_type, candidates, already_sent)
         
-        notifications_created = 0
+        candidates = select(
+            dedupe_key,
+            UserDB.id,
+            DocumentDB.id
+        ).select_from(recipients_join).where(*conditions)
         
-        for document in expiring_documents:
-            # Check if notification already exists
-            existing_notification = self.db.query(NotificationDB).filter(
-                NotificationDB.related_document_id == document.id,
-                NotificationDB.type == 'document_expiry',
-                NotificationDB.created_at >= datetime.now() - timedelta(days=7)
-            ).first()
-            
-            if not existing_notification:
-                # Notify the uploader and admins
-                users_to_notify = [document.uploader]
-                admin_users = self.db.query(UserDB).filter(
-                    UserDB.role == 'admin',
-                    UserDB.is_active == True
-                ).all()
-                users_to_notify.extend(admin_users)
-                
-                for user in users_to_notify:
-                    days_until_expiry = (document.expiry_date - date.today()).days
-                    
-                    notification = NotificationCreate(
-                        user_id=user.id,
-                        title="Скоро истекает срок действия документа",
-                        message=f"Документ '{document.title}' истекает через {days_until_expiry} дней "
-                               f"({document.expiry_date.strftime('%d.%m.%Y')})",
-                        type="document_expiry",
-                        related_document_id=document.id
-                    )
-                    
-                    self.create_notification(notification)
-                    notifications_created += 1
-        
-        logger.info(f"Created {notifications_created} document expiry notifications")
-        return notifications_created
+        new_keys = pg_insert(NotificationKeyDB).from_select(
+            ['dedupe_key', 'user_id', 'related_document_id'],
+            candidates
+        ).on_conflict_do_nothing(index_elements=['dedupe_key']).returning(
+            NotificationKeyDB.dedupe_key,
+            NotificationKeyDB.user_id,
+            NotificationKeyDB.related_document_id
+        ).cte("new_keys")
+        
+        recipients = select(
+            new_keys.c.user_id,
+            literal("Скоро истекает срок действия документа"),
+            func.concat(
+                "Документ '", DocumentDB.title,
+                "' истекает через ", rule.days_left(today),
+                " дней (", func.to_char(DocumentDB.expiry_date, 'DD.MM.YYYY'), ")"
+            ),
+            literal(rule.notification_type),
+            DocumentDB.id,
+            new_keys.c.dedupe_key
+        ).select_from(
+            join(new_keys, DocumentDB, DocumentDB.id == new_keys.c.related_document_id)
+        )
+        
+        if rule.notification_type in DIGEST_TYPES:
+            # The digest itself is emailed when it is sent
+            return self._collect_digest_items(
+                rule.notification_type, recipients.add_columns(DocumentDB.expiry_date),
+                ['user_id', 'title', 'message', 'notification_type', 'related_document_id', 'dedupe_key', 'due_date'],
+                ctes=(new_keys,)
+            )
+        
+        # Data-modifying CTEs must sit at the top level of the statement
+        statement = insert(NotificationDB).from_select(
+            ['user_id', 'title', 'message', 'type', 'related_document_id', 'dedupe_key'],
+            recipients
+        ).add_cte(new_keys).returning(
+            NotificationDB.user_id,
+            NotificationDB.related_document_id,
+            NotificationDB.title,
+            NotificationDB.message,
+            NotificationDB.type,
+            NotificationDB.dedupe_key
+        )
+        return self._run_bulk_job(rule.notification_type, statement, self._publish_user_notifications)
 
-    def notify_payment_due(self):
-        """Notify about upcoming rent payments"""
+    def preview_reminders(self) -> dict:
+        """Report what today's reminder jobs would create, without writing anything"""
+        return {
+            "contract_expiry": self.notify_contract_expiry(dry_run=True),
+            "document_expiry": self.notify_document_expiry(dry_run=True),
+        }
+
+    def notify_payment_due(self) -> dict:
+        """Broadcast reminders about upcoming rent payments, once per contract per month"""
         # This would typically be called monthly or based on contract terms
         today = date.today()
-        payment_due_date = date(today.year, today.month, 10)  # Assuming rent is due on 10th
-        
-        if today.day >= 5 and today.day <= 10:  # Notify 5 days before due date
-            active_contracts = self.db.query(ContractDB).filter(
-                ContractDB.status == 'active',
-                ContractDB.start_date <= today,
-                ContractDB.end_date >= today
-            ).all()
-            
-            notifications_created = 0
-            
-            for contract in active_contracts:
-                # Check if notification already sent this month
-                existing_notification = self.db.query(NotificationDB).filter(
-                    NotificationDB.related_contract_id == contract.id,
-                    NotificationDB.type == 'payment_due',
-                    NotificationDB.created_at >= datetime(today.year, today.month, 1)
-                ).first()
+        
+        if not (5 <= today.day <= 10):  # Notify 5 days before due date (rent is due on 10th)
+            return {"job": "payment_due", "notifications_created": 0, "duration_ms": 0.0}
+        
+        dedupe_key = func.concat("payment_due:", ContractDB.id, ":", f"{today:%Y-%m}")
+        broadcasts = select(
+            literal("Напоминание об оплате аренды"),
+            func.concat(
+                "Напоминаем об оплате аренды по договору № ", ContractDB.contract_number,
+                " с клиентом ", ContractDB.client_name,
+                ". Сумма: ", ContractDB.rental_amount,
+                " тенге. Срок оплаты: до 10 числа."
+            ),
+            literal("payment_due"),
+            ContractDB.id,
+            dedupe_key
+        ).where(
+            ContractDB.status == 'active',
+            ContractDB.start_date <= today,
+            ContractDB.end_date >= today
+        )
+        
+        if "payment_due" in DIGEST_TYPES:
+            items = broadcasts.where(~exists().where(BroadcastNotificationDB.dedupe_key == dedupe_key))
+            return self._collect_digest_items(
+                "payment_due", items,
+                ['title', 'message', 'notification_type', 'related_contract_id', 'dedupe_key'],
+                self._queue_digest_client_messages
+            )
+        
+        statement = pg_insert(BroadcastNotificationDB).from_select(
+            ['title', 'message', 'type', 'related_contract_id', 'dedupe_key'],
+            broadcasts
+        ).on_conflict_do_nothing(index_elements=['dedupe_key']).returning(
+            BroadcastNotificationDB.related_contract_id,
+            BroadcastNotificationDB.title,
+            BroadcastNotificationDB.message,
+            BroadcastNotificationDB.type,
+            BroadcastNotificationDB.dedupe_key
+        )
+        return self._run_bulk_job("payment_due", statement, self._publish_contract_broadcasts)
+
+    def send_digests(self) -> dict:
+        """Compress the collected digest items into one notification per user and type.
+
+        Items every user shares become one broadcast digest, personal items one digest
+        per recipient, so rows written scale with users, not users x items. Each digest
+        shows the count, the DIGEST_TOP_N items due soonest and a link to the full list.
+        """
+        started = time.perf_counter()
+        stats = {"job": "digests", "items_digested": 0, "notifications_created": 0}
+        
+        for notification_type in sorted(DIGEST_TYPES):
+            try:
+                digested_at = datetime.now(timezone.utc)
+                # Claim first: items collected while the digest is built wait for the next one
+                claimed = self.db.execute(
+                    update(NotificationDigestItemDB).where(
+                        NotificationDigestItemDB.notification_type == notification_type,
+                        NotificationDigestItemDB.digested_at.is_(None)
+                    ).values(digested_at=digested_at)
+                ).rowcount
+                if not claimed:
+                    self.db.rollback()
+                    continue
                 
-                if not existing_notification:
-                    users = self.db.query(UserDB).filter(UserDB.is_active == True).all()
-                    
-                    for user in users:
-                        notification = NotificationCreate(
-                            user_id=user.id,
-                            title="Напоминание об оплате аренды",
-                            message=f"Напоминаем об оплате аренды по договору № {contract.contract_number} "
-                                   f"с клиентом {contract.client_name}. "
-                                   f"Сумма: {contract.rental_amount} тенге. Срок оплаты: до 10 числа.",
-                            type="payment_due",
-                            related_contract_id=contract.id
-                        )
-                        
-                        self.create_notification(notification)
-                        notifications_created += 1
-            
-            logger.info(f"Created {notifications_created} payment due notifications")
-            return notifications_created
+                batch = and_(
+                    NotificationDigestItemDB.notification_type == notification_type,
+                    NotificationDigestItemDB.digested_at == digested_at
+                )
+                stats["notifications_created"] += self._send_broadcast_digest(notification_type, batch, digested_at)
+                stats["notifications_created"] += self._send_personal_digests(notification_type, batch, digested_at)
+                stats["items_digested"] += claimed
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+        
+        stats["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(f"Digests: {stats['items_digested']} items into {stats['notifications_created']} notifications "
+                    f"in {stats['duration_ms']} ms")
+        return stats
+
+    def _send_broadcast_digest(self, notification_type: str, batch, digested_at: datetime) -> int:
+        shared = and_(batch, NotificationDigestItemDB.user_id.is_(None))
+        count = self.db.query(func.count(NotificationDigestItemDB.id)).filter(shared).scalar()
+        if not count:
+            return 0
+        
+        top_items = self.db.query(NotificationDigestItemDB.message).filter(shared).order_by(
+            NotificationDigestItemDB.due_date.asc().nulls_last(), NotificationDigestItemDB.id
+        ).limit(DIGEST_TOP_N).all()
+        message = "\n".join(f"• {item.message}" for item in top_items)
+        if count > DIGEST_TOP_N:
+            message += f"\n… и ещё {count - DIGEST_TOP_N}"
+        
+        self.db.add(BroadcastNotificationDB(
+            title=f"{DIGEST_TITLES.get(notification_type, notification_type)}: {count}",
+            message=message,
+            type=notification_type,
+            link=DIGEST_LINKS.get(notification_type),
+            dedupe_key=f"digest:{notification_type}:{digested_at.isoformat()}"
+        ))
+        self.db.flush()
+        self._publish_broadcasts(1)
+        return 1
+
+    def _send_personal_digests(self, notification_type: str, batch, digested_at: datetime) -> int:
+        ranked = select(
+            NotificationDigestItemDB.user_id,
+            NotificationDigestItemDB.message,
+            func.row_number().over(
+                partition_by=NotificationDigestItemDB.user_id,
+                order_by=(NotificationDigestItemDB.due_date.asc().nulls_last(), NotificationDigestItemDB.id)
+            ).label("position")
+        ).where(batch, NotificationDigestItemDB.user_id.isnot(None)).subquery("ranked")
+        
+        count = func.count()
+        top_items = func.string_agg(
+            func.concat("• ", ranked.c.message), aggregate_order_by(literal("\n"), ranked.c.position)
+        ).filter(ranked.c.position <= DIGEST_TOP_N)
+        digests = select(
+            ranked.c.user_id,
+            func.concat(DIGEST_TITLES.get(notification_type, notification_type), ": ", count),
+            func.concat(
+                top_items,
+                case((count > DIGEST_TOP_N, func.concat("\n… и ещё ", count - DIGEST_TOP_N)), else_="")
+            ),
+            literal(notification_type),
+            literal(DIGEST_LINKS.get(notification_type)),
+            func.concat(f"digest:{notification_type}:{digested_at.isoformat()}:", ranked.c.user_id)
+        ).group_by(ranked.c.user_id)
+        
+        result = self.db.execute(
+            insert(NotificationDB).from_select(
+                ['user_id', 'title', 'message', 'type', 'link', 'dedupe_key'], digests
+            ).returning(
+                NotificationDB.user_id,
+                NotificationDB.related_document_id,
+                NotificationDB.title,
+                NotificationDB.message,
+                NotificationDB.type,
+                NotificationDB.dedupe_key
+            )
+        )
+        notifications = result.all()
+        self._publish_per_user(notifications)
+        enqueue_user_messages(self.db, notifications)
+        return len(notifications)
 
     def send_custom_notification(self, user_ids: List[int], title: str, message: str, 
                                 notification_type: str = "info", contract_id: int = None, 
@@ -175,15 +487,370 @@ class NotificationService:
         
         return notifications_created
 
-    def cleanup_old_notifications(self, days_old: int = 90):
-        """Remove old read notifications"""
-        cutoff_date = datetime.now() - timedelta(days=days_old)
+    def feed(self, user: UserDB):
+        """The user's personal notifications merged with the broadcasts visible to them.
+
+        Returns a UNION ALL subquery with the Notification schema's columns. Each branch
+        is backed by a (created_at, id) index, so ordered pages are a merge of two range scans.
+        The FEED_WINDOW_DAYS bound is a constant, so the planner prunes older partitions.
+        """
+        window_start = datetime.now(timezone.utc) - timedelta(days=FEED_WINDOW_DAYS)
+        personal = select(
+            NotificationDB.id,
+            NotificationDB.user_id,
+            NotificationDB.title,
+            NotificationDB.message,
+            NotificationDB.type,
+            NotificationDB.is_read,
+            NotificationDB.related_contract_id,
+            NotificationDB.related_document_id,
+            NotificationDB.scheduled_date,
+            NotificationDB.link,
+            NotificationDB.created_at,
+            literal(False).label("is_broadcast")
+        ).where(
+            NotificationDB.user_id == user.id,
+            NotificationDB.created_at >= window_start
+        )
+        
+        watermark = select(BroadcastWatermarkDB.read_up_to_id).where(
+            BroadcastWatermarkDB.user_id == user.id
+        ).scalar_subquery()
+        
+        broadcast = select(
+            BroadcastNotificationDB.id,
+            literal(user.id).label("user_id"),
+            BroadcastNotificationDB.title,
+            BroadcastNotificationDB.message,
+            BroadcastNotificationDB.type,
+            # An explicit receipt wins over "mark all read"
+            func.coalesce(
+                BroadcastReceiptDB.is_read,
+                BroadcastNotificationDB.id <= func.coalesce(watermark, 0)
+            ).label("is_read"),
+            BroadcastNotificationDB.related_contract_id,
+            BroadcastNotificationDB.related_document_id,
+            cast(null(), DateTime(timezone=True)).label("scheduled_date"),
+            BroadcastNotificationDB.link,
+            BroadcastNotificationDB.created_at,
+            literal(True).label("is_broadcast")
+        ).select_from(
+            BroadcastNotificationDB.__table__.outerjoin(
+                BroadcastReceiptDB,
+                and_(
+                    BroadcastReceiptDB.broadcast_id == BroadcastNotificationDB.id,
+                    BroadcastReceiptDB.user_id == user.id
+                )
+            )
+        ).where(
+            # Users only see broadcasts sent while they had an account
+            BroadcastNotificationDB.created_at >= user.created_at,
+            BroadcastNotificationDB.created_at >= window_start,
+            BroadcastReceiptDB.deleted_at.is_(None)
+        )
+        
+        return union_all(personal, broadcast).subquery("feed")
+
+    def _adjust_unread(self, user_id: int, delta: int) -> Optional[int]:
+        """Shift the user's unread counter in the current transaction; return the new value.
+
+        Users without a counter row yet are skipped, their count is computed on first read.
+        """
+        statement = update(NotificationCounterDB).where(
+            NotificationCounterDB.user_id == user_id
+        ).values(
+            unread_count=func.greatest(NotificationCounterDB.unread_count + delta, 0)
+        ).returning(NotificationCounterDB.unread_count)
+        return self.db.execute(statement).scalar()
+
+    def _set_unread(self, user_id: int, unread_count: int):
+        statement = pg_insert(NotificationCounterDB).values(
+            user_id=user_id, unread_count=unread_count
+        ).on_conflict_do_update(
+            index_elements=[NotificationCounterDB.user_id],
+            set_={"unread_count": unread_count, "updated_at": func.now()}
+        )
+        self.db.execute(statement)
+
+    def unread_count(self, user: UserDB) -> int:
+        """The user's unread count from the counter table (a primary key lookup)"""
+        unread_count = self.db.query(NotificationCounterDB.unread_count).filter(
+            NotificationCounterDB.user_id == user.id
+        ).scalar()
+        if unread_count is not None:
+            return unread_count
+        
+        unread_count = self.count_unread(user)
+        self.db.execute(
+            pg_insert(NotificationCounterDB).values(
+                user_id=user.id, unread_count=unread_count
+            ).on_conflict_do_nothing()
+        )
+        self.db.commit()
+        return unread_count
+
+    def reconcile_unread_counters(self) -> dict:
+        """Recount every stored counter from the feed and fix the ones that drifted"""
+        started = time.perf_counter()
+        users = self.db.query(UserDB.id, UserDB.created_at).join(
+            NotificationCounterDB, NotificationCounterDB.user_id == UserDB.id
+        ).all()
+        
+        fixed = 0
+        for user in users:
+            # The row lock holds off concurrent increments while recounting
+            stored = self.db.query(NotificationCounterDB).filter(
+                NotificationCounterDB.user_id == user.id
+            ).with_for_update().first()
+            if stored is None:
+                self.db.rollback()
+                continue
+            
+            actual = self.count_unread(user)
+            if stored.unread_count != actual:
+                logger.warning(f"Unread counter drift for user {user.id}: {stored.unread_count} -> {actual}")
+                stored.unread_count = actual
+                fixed += 1
+            self.db.commit()
+        
+        stats = {
+            "users_checked": len(users),
+            "counters_fixed": fixed,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+        logger.info(f"Reconciled {stats['users_checked']} unread counters, fixed {fixed} in {stats['duration_ms']} ms")
+        return stats
+
+    def unread_count_query(self, user: UserDB):
+        """Scalar subquery counting the user's unread personal and broadcast notifications"""
+        feed = self.feed(user)
+        return select(func.count()).select_from(feed).where(
+            feed.c.is_read.is_not(True)
+        ).scalar_subquery()
+
+    def count_unread(self, user: UserDB) -> int:
+        """Count unread items by scanning the feed (used to seed and reconcile counters)"""
+        return self.db.execute(select(self.unread_count_query(user))).scalar()
+
+    def get_feed_item(self, user: UserDB, notification_id: int):
+        """Return a single personal or broadcast notification as seen by the user"""
+        feed = self.feed(user)
+        return self.db.query(feed).filter(feed.c.id == notification_id).first()
+
+    def _upsert_receipt(self, user_id: int, broadcast_id: int, values: dict):
+        statement = pg_insert(BroadcastReceiptDB).values(
+            broadcast_id=broadcast_id, user_id=user_id, **values
+        ).on_conflict_do_update(
+            index_elements=[BroadcastReceiptDB.broadcast_id, BroadcastReceiptDB.user_id],
+            set_=values
+        )
+        self.db.execute(statement)
+
+    def set_read(self, user_id: int, item, is_read: bool):
+        """Mark a feed item (personal or broadcast) read or unread"""
+        if item.is_broadcast:
+            self._upsert_receipt(user_id, item.id, {"is_read": is_read})
+            changed = bool(item.is_read) != is_read
+        else:
+            # Only a real state change moves the counter, even under concurrent requests
+            changed = self.db.query(NotificationDB).filter(
+                NotificationDB.id == item.id,
+                NotificationDB.created_at == item.created_at,
+                NotificationDB.is_read.is_distinct_from(is_read)
+            ).update({"is_read": is_read}, synchronize_session=False) > 0
         
-        deleted_count = self.db.query(NotificationDB).filter(
+        if changed:
+            delta = -1 if is_read else 1
+            publish_event(self.db, {
+                "event": "read",
+                "user_id": user_id,
+                "id": item.id,
+                "is_read": is_read,
+                "unread_delta": delta,
+                "unread_count": self._adjust_unread(user_id, delta)
+            })
+        self.db.commit()
+
+    def delete(self, user_id: int, item):
+        """Delete a personal notification; a broadcast is only hidden for this user"""
+        if item.is_broadcast:
+            self._upsert_receipt(user_id, item.id, {"deleted_at": func.now()})
+        else:
+            self.db.query(NotificationDB).filter(
+                NotificationDB.id == item.id,
+                NotificationDB.created_at == item.created_at
+            ).delete(
+                synchronize_session=False
+            )
+        
+        delta = 0 if item.is_read else -1
+        publish_event(self.db, {
+            "event": "deleted",
+            "user_id": user_id,
+            "id": item.id,
+            "unread_delta": delta,
+            "unread_count": self._adjust_unread(user_id, delta) if delta else None
+        })
+        self.db.commit()
+
+    def mark_all_read(self, user: UserDB):
+        """Mark personal rows read and write read receipts for the unread broadcasts in the feed.
+
+        Only broadcasts committed by now are marked. A max(id) watermark would also
+        cover a broadcast with a lower id that commits afterwards (ids come from a
+        shared sequence), and hide it as read.
+        """
+        marked = self.db.query(NotificationDB).filter(
+            NotificationDB.user_id == user.id,
+            NotificationDB.is_read == False
+        ).update({"is_read": True}, synchronize_session=False)
+        
+        # Explicit "unread" receipts are overwritten as well
+        feed = self.feed(user)
+        unread_broadcasts = select(feed.c.id, literal(user.id), literal(True)).where(
+            feed.c.is_broadcast,
+            feed.c.is_read.is_not(True)
+        )
+        statement = pg_insert(BroadcastReceiptDB).from_select(
+            ["broadcast_id", "user_id", "is_read"], unread_broadcasts
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[BroadcastReceiptDB.broadcast_id, BroadcastReceiptDB.user_id],
+            set_={"is_read": True}
+        )
+        marked += self.db.execute(statement).rowcount
+        
+        # Relative, so a broadcast counted in concurrently stays counted
+        unread_count = self._adjust_unread(user.id, -marked) if marked else None
+        publish_event(self.db, {"event": "read_all", "user_id": user.id, "unread_count": unread_count})
+        self.db.commit()
+
+    def cleanup_old_notifications(self, days_old: int = 90, batch_size: int = CLEANUP_BATCH_SIZE,
+                                  batch_pause: float = CLEANUP_BATCH_PAUSE) -> dict:
+        """Remove old read notifications, expired broadcasts and fired reminder events.
+
+        Monthly partitions entirely older than the cutoff and holding no unread rows
+        are dropped whole. Everything else is deleted in small batches, each in its
+        own short transaction with a pause in between, so no long lock or WAL burst.
+        """
+        started = time.perf_counter()
+        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_old)
+        stats = {
+            "partitions_dropped": [], "notifications_deleted": 0, "broadcasts_deleted": 0,
+            "keys_deleted": 0, "digest_items_deleted": 0, "reminder_events_deleted": 0
+        }
+        
+        for partition in list_partitions(self.db):
+            if partition.end > cutoff_date:
+                break
+            if self._drop_partition_if_read(partition):
+                stats["partitions_dropped"].append(partition.name)
+        
+        # Partitions straddling the cutoff, kept ones with unread rows, and the default partition
+        read_batch = select(NotificationDB.id, NotificationDB.created_at).where(
             NotificationDB.is_read == True,
             NotificationDB.created_at < cutoff_date
-        ).delete()
+        ).limit(batch_size)
+        stats["notifications_deleted"] = self._delete_in_batches(
+            "notifications",
+            lambda: self.db.query(NotificationDB).filter(
+                tuple_(NotificationDB.id, NotificationDB.created_at).in_(read_batch)
+            ).delete(synchronize_session=False),
+            batch_pause
+        )
         
-        self.db.commit()
-        logger.info(f"Cleaned up {deleted_count} old notifications")
-        return deleted_count
\ No newline at end of file
+        # Receipts go with their broadcast (ON DELETE CASCADE)
+        expired_batch = select(BroadcastNotificationDB.id).where(
+            BroadcastNotificationDB.created_at < cutoff_date
+        ).limit(batch_size)
+        stats["broadcasts_deleted"] = self._delete_in_batches(
+            "broadcasts",
+            lambda: self.db.query(BroadcastNotificationDB).filter(
+                BroadcastNotificationDB.id.in_(expired_batch)
+            ).delete(synchronize_session=False),
+            batch_pause
+        )
+        
+        # Keys only guard items that are still upcoming, older ones can go
+        expired_keys = select(NotificationKeyDB.dedupe_key).where(
+            NotificationKeyDB.created_at < cutoff_date
+        ).limit(batch_size)
+        stats["keys_deleted"] = self._delete_in_batches(
+            "dedupe keys",
+            lambda: self.db.query(NotificationKeyDB).filter(
+                NotificationKeyDB.dedupe_key.in_(expired_keys)
+            ).delete(synchronize_session=False),
+            batch_pause
+        )
+        
+        # Digested items double as dedupe keys, the same retention applies
+        expired_items = select(NotificationDigestItemDB.id).where(
+            NotificationDigestItemDB.created_at < cutoff_date
+        ).limit(batch_size)
+        stats["digest_items_deleted"] = self._delete_in_batches(
+            "digest items",
+            lambda: self.db.query(NotificationDigestItemDB).filter(
+                NotificationDigestItemDB.id.in_(expired_items)
+            ).delete(synchronize_session=False),
+            batch_pause
+        )
+        
+        # Fired reminder events are only history; the queue reads unfired ones
+        fired_events = select(ReminderEventDB.id).where(
+            ReminderEventDB.fired_at < cutoff_date
+        ).limit(batch_size)
+        stats["reminder_events_deleted"] = self._delete_in_batches(
+            "fired reminder events",
+            lambda: self.db.query(ReminderEventDB).filter(
+                ReminderEventDB.id.in_(fired_events)
+            ).delete(synchronize_session=False),
+            batch_pause
+        )
+        
+        stats["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(f"Notification cleanup: dropped partitions {stats['partitions_dropped'] or 'none'}, "
+                    f"deleted {stats['notifications_deleted']} notifications and "
+                    f"{stats['broadcasts_deleted']} broadcasts in {stats['duration_ms']} ms")
+        
+        # Expired broadcasts may still have been unread for some users
+        if stats["broadcasts_deleted"]:
+            self.reconcile_unread_counters()
+        return stats
+
+    def _drop_partition_if_read(self, partition) -> bool:
+        """Drop a whole monthly partition when none of its notifications is unread"""
+        try:
+            # Do not queue behind long readers while holding the parent's lock
+            self.db.execute(text(f"SET LOCAL lock_timeout = '{PARTITION_LOCK_TIMEOUT}'"))
+            # Hold off writes (a mark-unread, a late insert) between the check and the drop
+            self.db.execute(text(f"LOCK TABLE {partition.name} IN SHARE ROW EXCLUSIVE MODE"))
+            has_unread = self.db.execute(text(
+                f"SELECT EXISTS (SELECT 1 FROM {partition.name} WHERE is_read IS NOT TRUE)"
+            )).scalar()
+            if has_unread:
+                self.db.rollback()
+                return False
+            self.db.execute(text(f"DROP TABLE {partition.name}"))
+            self.db.commit()
+        except OperationalError as e:
+            self.db.rollback()
+            logger.warning(f"Could not drop partition {partition.name}, falling back to batched deletes: {e}")
+            return False
+        
+        logger.info(f"Dropped notification partition {partition.name}")
+        return True
+
+    def _delete_in_batches(self, label: str, delete_batch: Callable[[], int], batch_pause: float) -> int:
+        """Run `delete_batch` in separate transactions until it deletes nothing"""
+        deleted = 0
+        started = time.perf_counter()
+        while True:
+            count = delete_batch()
+            self.db.commit()
+            if count == 0:
+                return deleted
+            
+            deleted += count
+            elapsed = time.perf_counter() - started
+            logger.info(f"Cleanup {label}: {deleted} rows deleted ({deleted / elapsed:.0f} rows/s)")
+            time.sleep(batch_pause)
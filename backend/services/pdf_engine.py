@@ -0,0 +1,186 @@
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.lib.fonts import addMapping
+from reportlab.platypus import Paragraph, TableStyle
+import copy
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Any Unicode TTF with Cyrillic glyphs; the defaults come with fonts-dejavu-core
+PDF_FONT_PATH = os.getenv("PDF_FONT_PATH", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf")
+PDF_FONT_BOLD_PATH = os.getenv("PDF_FONT_BOLD_PATH", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf")
+CONTRACT_DIR = "uploads/contracts"
+
+FONT_NAME = "ContractSans"
+BOLD_FONT_NAME = "ContractSans-Bold"
+
+LESSOR_TEXT = (
+    "<b>АРЕНДОДАТЕЛЬ:</b><br/>"
+    "ТОО 'Кызыл Жар'<br/>"
+    "БИН: 123456789012<br/>"
+    "Адрес: г. Алматы, ул. Абая, 123<br/>"
+    "Телефон: +7 (727) 123-45-67<br/>"
+    "Email: info@kyzylzhar.kz"
+)
+
+TERMS_TEXT = (
+    "<b>УСЛОВИЯ ДОГОВОРА:</b><br/><br/>"
+    "1. Арендатор обязуется использовать арендованное имущество исключительно по назначению.<br/>"
+    "2. Арендная плата вносится до 10 числа каждого месяца.<br/>"
+    "3. Арендатор несет ответственность за сохранность арендованного имущества.<br/>"
+    "4. При досрочном расторжении договора залоговая сумма не возвращается.<br/>"
+    "5. Все споры решаются в соответствии с законодательством Республики Казахстан."
+)
+
+_fonts_lock = threading.Lock()
+_fonts = None
+
+def register_fonts():
+    """Register the Unicode font family once per process; return (regular, bold) font names.
+
+    Without the TTF files the built-in Helvetica is used, which has no Cyrillic glyphs.
+    """
+    global _fonts
+    with _fonts_lock:
+        if _fonts is None:
+            try:
+                pdfmetrics.registerFont(TTFont(FONT_NAME, PDF_FONT_PATH))
+                pdfmetrics.registerFont(TTFont(BOLD_FONT_NAME, PDF_FONT_BOLD_PATH))
+                # <b> inside paragraphs switches to the bold face
+                addMapping(FONT_NAME, 0, 0, FONT_NAME)
+                addMapping(FONT_NAME, 1, 0, BOLD_FONT_NAME)
+                addMapping(FONT_NAME, 0, 1, FONT_NAME)
+                addMapping(FONT_NAME, 1, 1, BOLD_FONT_NAME)
+                _fonts = (FONT_NAME, BOLD_FONT_NAME)
+            except Exception as e:
+                logger.warning(f"PDF font {PDF_FONT_PATH} not available ({e}); Cyrillic text will not render")
+                _fonts = ("Helvetica", "Helvetica-Bold")
+        return _fonts
+
+class PdfEngine:
+    """Fonts, styles and fixed fragments shared by every PDF a process renders.
+
+    Built once (get_pdf_engine()); a render only creates the flowables that
+    depend on its data. Prebuilt paragraphs are handed out as copies, since
+    laying out a flowable stores its size on the instance.
+    """
+
+    def __init__(self):
+        self.font, self.bold_font = register_fonts()
+        os.makedirs(CONTRACT_DIR, exist_ok=True)
+        self.contract_dir = CONTRACT_DIR
+        
+        styles = getSampleStyleSheet()
+        self.contract_title_style = ParagraphStyle(
+            'ContractTitle',
+            parent=styles['Heading1'],
+            fontSize=16,
+            spaceAfter=30,
+            alignment=1,  # Center
+            fontName=self.bold_font
+        )
+        self.contract_normal_style = ParagraphStyle(
+            'ContractNormal',
+            parent=styles['Normal'],
+            fontSize=12,
+            spaceAfter=12,
+            fontName=self.font
+        )
+        self.report_title_style = ParagraphStyle(
+            'ReportTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            spaceAfter=30,
+            alignment=1,
+            fontName=self.bold_font
+        )
+        self.report_subtitle_style = ParagraphStyle(
+            'ReportSubtitle',
+            parent=styles['Heading2'],
+            fontSize=14,
+            spaceAfter=20,
+            fontName=self.bold_font
+        )
+        self.report_normal_style = ParagraphStyle(
+            'ReportNormal',
+            parent=styles['Normal'],
+            fontSize=11,
+            spaceAfter=12,
+            fontName=self.font
+        )
+        
+        self.details_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), self.bold_font),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('FONTNAME', (0, 1), (-1, -1), self.font),
+            ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ])
+        self.signature_table_style = TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, -1), self.font),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ])
+        self.report_summary_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), self.bold_font),
+            ('FONTNAME', (0, 1), (-1, -1), self.font),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+        self.report_list_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), self.bold_font),
+            ('FONTNAME', (0, 1), (-1, -1), self.font),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+        
+        # Parsed once; the markup parser is the costly part of a Paragraph
+        self._contract_title = Paragraph("ДОГОВОР АРЕНДЫ НЕДВИЖИМОСТИ", self.contract_title_style)
+        self._extension_title = Paragraph("ДОПОЛНИТЕЛЬНОЕ СОГЛАШЕНИЕ К ДОГОВОРУ АРЕНДЫ", self.contract_title_style)
+        self._lessor = Paragraph(LESSOR_TEXT, self.contract_normal_style)
+        self._terms = Paragraph(TERMS_TEXT, self.contract_normal_style)
+
+    def contract_title(self) -> Paragraph:
+        return copy.copy(self._contract_title)
+
+    def extension_title(self) -> Paragraph:
+        return copy.copy(self._extension_title)
+
+    def lessor_block(self) -> Paragraph:
+        return copy.copy(self._lessor)
+
+    def terms_block(self) -> Paragraph:
+        return copy.copy(self._terms)
+
+_engine_lock = threading.Lock()
+_engine = None
+
+def get_pdf_engine() -> PdfEngine:
+    """The process-wide engine, built on first use"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = PdfEngine()
+    return _engine
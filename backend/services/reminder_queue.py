@@ -0,0 +1,188 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, delete, func, event, inspect
+from datetime import date, datetime, time as time_of_day, timedelta, timezone
+from typing import List, Optional, Tuple
+import logging
+import os
+import select as io_select
+import time
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+from models import DATABASE_URL
+from models.contract import ContractDB
+from models.document import DocumentDB
+from models.reminder_event import ReminderEventDB
+from services.notification_service import NotificationService
+from services.reminder_rules import ReminderRule, CONTRACT_EXPIRY, DOCUMENT_EXPIRY
+
+logger = logging.getLogger(__name__)
+
+REMINDER_CHANNEL = "reminder_events"
+# Local time of day at which a tier fires
+FIRE_TIME = time_of_day.fromisoformat(os.getenv("REMINDER_FIRE_TIME", "09:00"))
+FIRE_BATCH_SIZE = 500
+REBUILD_BATCH_SIZE = 1000
+
+RULES = {rule.notification_type: rule for rule in (CONTRACT_EXPIRY, DOCUMENT_EXPIRY)}
+
+def fire_times(rule: ReminderRule, due_date: Optional[date], now: datetime) -> List[Tuple[int, datetime]]:
+    """(tier, fire_at) pairs for a due date.
+
+    Tiers whose time has already passed collapse into the nearest of them, firing
+    now, matching ReminderRule.tier(): a contract created 5 days before its end
+    gets the 7-day reminder immediately, not a late 30-day one.
+    """
+    if due_date is None or due_date < now.date():
+        return []
+
+    events = []
+    reached = None
+    for tier in sorted(rule.tiers, reverse=True):
+        fire_at = datetime.combine(due_date - timedelta(days=tier), FIRE_TIME).astimezone()
+        if fire_at <= now:
+            reached = tier
+        else:
+            events.append((tier, fire_at))
+    if reached is not None:
+        events.append((reached, now))
+    return events
+
+def schedule_reminders(connection, rule: ReminderRule, entity_id: int, due_date: Optional[date]):
+    """Replace the entity's unfired reminder events; runs in the caller's transaction"""
+    connection.execute(
+        delete(ReminderEventDB).where(
+            ReminderEventDB.notification_type == rule.notification_type,
+            ReminderEventDB.entity_id == entity_id,
+            ReminderEventDB.fired_at.is_(None)
+        )
+    )
+
+    events = fire_times(rule, due_date, datetime.now(timezone.utc))
+    if not events:
+        return
+    connection.execute(insert(ReminderEventDB), [
+        {
+            "notification_type": rule.notification_type,
+            "entity_id": entity_id,
+            "due_date": due_date,
+            "tier": tier,
+            "fire_at": fire_at,
+        }
+        for tier, fire_at in events
+    ])
+    # Wake the scheduler in case the new event is due before its current wake-up time
+    connection.execute(select(func.pg_notify(REMINDER_CHANNEL, "")))
+
+@event.listens_for(ContractDB, "after_insert")
+@event.listens_for(ContractDB, "after_update")
+def schedule_contract_reminders(mapper, connection, target):
+    state = inspect(target)
+    # A tier that came due while the contract was not active/signed fired without a
+    # notice; rescheduling on a status change fires the reached tier again
+    if state.attrs.end_date.history.has_changes() or state.attrs.status.history.has_changes():
+        schedule_reminders(connection, CONTRACT_EXPIRY, target.id, target.end_date)
+
+@event.listens_for(DocumentDB, "after_insert")
+@event.listens_for(DocumentDB, "after_update")
+def schedule_document_reminders(mapper, connection, target):
+    if inspect(target).attrs.expiry_date.history.has_changes():
+        schedule_reminders(connection, DOCUMENT_EXPIRY, target.id, target.expiry_date)
+
+class ReminderQueue:
+    """Persistent queue of reminder fire times; work scales with due events, not table size"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def next_fire_at(self) -> Optional[datetime]:
+        """Fire time of the queue head (a single index lookup)"""
+        return self.db.query(func.min(ReminderEventDB.fire_at)).filter(
+            ReminderEventDB.fired_at.is_(None)
+        ).scalar()
+
+    def fire_due(self, limit: int = FIRE_BATCH_SIZE) -> dict:
+        """Fire every due event, one batch and notification type per transaction"""
+        stats = {"events_fired": 0, "notifications_created": 0}
+        service = NotificationService(self.db)
+        notify = {
+            CONTRACT_EXPIRY.notification_type: service.notify_contract_expiry,
+            DOCUMENT_EXPIRY.notification_type: service.notify_document_expiry,
+        }
+
+        for notification_type, rule in RULES.items():
+            while True:
+                now = datetime.now(timezone.utc)
+                events = self.db.query(ReminderEventDB).filter(
+                    ReminderEventDB.notification_type == notification_type,
+                    ReminderEventDB.fired_at.is_(None),
+                    ReminderEventDB.fire_at <= now
+                ).order_by(ReminderEventDB.fire_at).limit(limit).with_for_update(skip_locked=True).all()
+                if not events:
+                    self.db.rollback()
+                    break
+
+                for reminder in events:
+                    reminder.fired_at = now
+                # Commits the fired marks together with the notifications
+                result = notify[notification_type](rule, entity_ids=sorted({e.entity_id for e in events}))
+                stats["events_fired"] += len(events)
+                stats["notifications_created"] += result["notifications_created"]
+
+        if stats["events_fired"]:
+            logger.info(f"Fired {stats['events_fired']} reminder events, "
+                        f"created {stats['notifications_created']} notifications")
+        return stats
+
+    def is_empty(self) -> bool:
+        return self.db.query(ReminderEventDB.id).first() is None
+
+    def rebuild(self) -> int:
+        """Recompute events for every contract and document with a future due date.
+
+        Only needed once for rows written before the queue existed (or outside the ORM).
+        """
+        scheduled = 0
+        today = date.today()
+        for rule in RULES.values():
+            rows = self.db.query(rule.id_column, rule.due_column).filter(
+                rule.due_column >= today
+            ).order_by(rule.id_column).all()
+            for start in range(0, len(rows), REBUILD_BATCH_SIZE):
+                connection = self.db.connection()
+                for entity_id, due_date in rows[start:start + REBUILD_BATCH_SIZE]:
+                    schedule_reminders(connection, rule, entity_id, due_date)
+                self.db.commit()
+            scheduled += len(rows)
+        logger.info(f"Scheduled reminders for {scheduled} contracts and documents")
+        return scheduled
+
+class ReminderWakeup:
+    """A LISTEN connection the scheduler sleeps on; schedule changes wake it early"""
+
+    def __init__(self, dsn: str = DATABASE_URL):
+        self.dsn = dsn
+        self.conn = None
+
+    def wait(self, timeout: float):
+        try:
+            if self.conn is None:
+                self.conn = psycopg2.connect(self.dsn)
+                self.conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                with self.conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {REMINDER_CHANNEL}")
+
+            ready, _, _ = io_select.select([self.conn], [], [], timeout)
+            if ready:
+                self.conn.poll()
+                self.conn.notifies.clear()
+        except Exception as e:
+            logger.warning(f"Reminder wake-up connection failed, sleeping instead: {e}")
+            self.close()
+            time.sleep(timeout)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
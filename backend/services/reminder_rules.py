@@ -0,0 +1,72 @@
+from sqlalchemy import literal, case, func
+from datetime import date, timedelta
+from typing import List, NamedTuple, Optional, Tuple
+import os
+
+from models.contract import ContractDB
+from models.document import DocumentDB
+
+def parse_tiers(value: str) -> Tuple[int, ...]:
+    """Parse "30,7,1" into reminder tiers (days before the due date), largest first"""
+    tiers = sorted({int(part) for part in value.split(",") if part.strip()}, reverse=True)
+    if not tiers or tiers[-1] < 0:
+        raise ValueError(f"Invalid reminder tiers: {value!r}")
+    return tuple(tiers)
+
+class ReminderRule(NamedTuple):
+    """Remind `tiers` days before `due_column` of each matching row"""
+    notification_type: str
+    id_column: object
+    due_column: object
+    tiers: Tuple[int, ...]
+    conditions: tuple = ()
+
+    def days_left(self, today: date):
+        return self.due_column - today
+
+    def tier(self, today: date):
+        """SQL expression: the nearest tier the row has reached.
+
+        A row 5 days from its due date is in the 7-day tier, so the larger tiers it
+        already passed never fire late and the tiers never overlap.
+        """
+        ordered = sorted(self.tiers)
+        if len(ordered) == 1:
+            return literal(ordered[0])
+        days_left = self.days_left(today)
+        return case(*[(days_left <= tier, tier) for tier in ordered[:-1]], else_=ordered[-1])
+
+    def window(self, today: date, entity_ids: Optional[List[int]] = None) -> list:
+        """Filters selecting every row inside the largest tier: one range scan on the due date index"""
+        filters = [
+            self.due_column >= today,
+            self.due_column <= today + timedelta(days=max(self.tiers)),
+            *self.conditions,
+        ]
+        if entity_ids is not None:
+            filters.append(self.id_column.in_(entity_ids))
+        return filters
+
+    def dedupe_key(self, today: date, *suffix):
+        """type:id:due_date:tier[:suffix] - a tier fires once per due date"""
+        parts = [
+            f"{self.notification_type}:", self.id_column, ":", self.due_column, ":", self.tier(today)
+        ]
+        for part in suffix:
+            parts.extend([":", part])
+        return func.concat(*parts)
+
+CONTRACT_EXPIRY = ReminderRule(
+    notification_type="contract_expiry",
+    id_column=ContractDB.id,
+    due_column=ContractDB.end_date,
+    tiers=parse_tiers(os.getenv("CONTRACT_REMINDER_TIERS", "30,7,1")),
+    conditions=(ContractDB.status.in_(['active', 'signed']),),
+)
+
+DOCUMENT_EXPIRY = ReminderRule(
+    notification_type="document_expiry",
+    id_column=DocumentDB.id,
+    due_column=DocumentDB.expiry_date,
+    tiers=parse_tiers(os.getenv("DOCUMENT_REMINDER_TIERS", "30,7,1")),
+)
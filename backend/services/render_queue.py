@@ -0,0 +1,175 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import or_, and_
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import logging
+import os
+import signal
+import time
+
+from models import SessionLocal, engine
+from models.contract import ContractDB
+from models.render_job import RenderJobDB
+from services.contract_generator import ContractGenerator, contract_fingerprint
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = int(os.getenv("RENDER_MAX_ATTEMPTS", "3"))
+STALE_JOB_MINUTES = int(os.getenv("RENDER_STALE_JOB_MINUTES", "10"))
+POLL_INTERVAL = float(os.getenv("RENDER_POLL_INTERVAL", "1"))
+
+def enqueue_render(db: Session, contract: ContractDB) -> Optional[RenderJobDB]:
+    """Queue a PDF render for the contract; the caller commits.
+
+    A contract already waiting in the queue is not queued twice.
+    """
+    contract.render_status = "pending"
+
+    if contract.id is not None:
+        queued = db.query(RenderJobDB).filter(
+            RenderJobDB.contract_id == contract.id,
+            RenderJobDB.status == "pending"
+        ).first()
+        if queued:
+            return queued
+
+    job = RenderJobDB(contract=contract, status="pending")
+    db.add(job)
+    return job
+
+def get_latest_job(db: Session, contract_id: int) -> Optional[RenderJobDB]:
+    """Return the most recent render job for a contract"""
+    return db.query(RenderJobDB).filter(
+        RenderJobDB.contract_id == contract_id
+    ).order_by(RenderJobDB.id.desc()).first()
+
+class RenderWorker:
+    """Claims render jobs from the queue and builds the PDFs.
+
+    Several workers (threads or processes) can run against the same queue:
+    jobs are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so throughput
+    grows with the number of worker processes.
+    """
+
+    def __init__(self, poll_interval: float = POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self.generator = ContractGenerator()
+        self.is_running = False
+
+    def claim_next_job(self, db: Session) -> Optional[RenderJobDB]:
+        """Atomically take the oldest pending (or abandoned) job"""
+        stale_before = datetime.now(timezone.utc) - timedelta(minutes=STALE_JOB_MINUTES)
+        abandoned = and_(RenderJobDB.status == "running", RenderJobDB.started_at < stale_before)
+
+        # A render that keeps killing its worker never reaches the exception path in
+        # process_job, so the attempt limit is enforced when reclaiming as well
+        exhausted = db.query(RenderJobDB).filter(
+            abandoned,
+            RenderJobDB.attempts >= MAX_ATTEMPTS
+        ).with_for_update(skip_locked=True).all()
+        for job in exhausted:
+            logger.error(f"Render job {job.id} for contract {job.contract_id} abandoned {job.attempts} times, giving up")
+            job.status = "failed"
+            job.error = job.error or "The worker stopped during the render"
+            job.finished_at = datetime.now(timezone.utc)
+            job.contract.render_status = "failed"
+        if exhausted:
+            db.commit()
+
+        job = db.query(RenderJobDB).filter(
+            or_(
+                RenderJobDB.status == "pending",
+                # A worker died mid-render
+                and_(abandoned, RenderJobDB.attempts < MAX_ATTEMPTS)
+            )
+        ).order_by(RenderJobDB.id).with_for_update(skip_locked=True).first()
+
+        if job is None:
+            return None
+
+        job.status = "running"
+        job.attempts += 1
+        job.started_at = datetime.now(timezone.utc)
+        job.contract.render_status = "rendering"
+        db.commit()
+        return job
+
+    def process_job(self, db: Session, job: RenderJobDB):
+        """Render the contract PDF and record the outcome"""
+        contract = job.contract
+        fingerprint = contract_fingerprint(contract)
+        try:
+            if (fingerprint == contract.content_fingerprint and contract.contract_file_path
+                    and os.path.exists(contract.contract_file_path)):
+                # Edited back to the content already on disk
+                contract_path = contract.contract_file_path
+            else:
+                contract_path = self.generator.generate_contract(contract)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Render job {job.id} for contract {job.contract_id} failed: {e}")
+            job.error = str(e)
+            if job.attempts >= MAX_ATTEMPTS:
+                job.status = "failed"
+                job.finished_at = datetime.now(timezone.utc)
+                contract.render_status = "failed"
+            else:
+                job.status = "pending"
+                contract.render_status = "pending"
+            db.commit()
+            return
+
+        # The contract may have been edited (and re-queued) while this render ran
+        requeued = db.query(RenderJobDB.id).filter(
+            RenderJobDB.contract_id == contract.id,
+            RenderJobDB.status == "pending"
+        ).first()
+
+        contract.contract_file_path = contract_path
+        contract.content_fingerprint = fingerprint
+        contract.render_status = "pending" if requeued else "ready"
+        job.status = "done"
+        job.error = None
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+
+    def run_once(self) -> bool:
+        """Process a single job; return False when the queue is empty"""
+        db = SessionLocal()
+        try:
+            job = self.claim_next_job(db)
+            if job is None:
+                return False
+            self.process_job(db, job)
+            return True
+        finally:
+            db.close()
+
+    def run(self):
+        """Process jobs until stopped, sleeping while the queue is empty"""
+        self.is_running = True
+        logger.info(f"Render worker {os.getpid()} started")
+
+        while self.is_running:
+            try:
+                if not self.run_once():
+                    time.sleep(self.poll_interval)
+            except Exception as e:
+                logger.error(f"Render worker error: {e}")
+                time.sleep(self.poll_interval)
+
+    def stop(self):
+        self.is_running = False
+        logger.info(f"Render worker {os.getpid()} stopped")
+
+def run_worker_process():
+    """Entry point for a worker process"""
+    # Never share pooled connections inherited from the parent process
+    engine.dispose()
+    worker = RenderWorker()
+
+    # Finish the current render before exiting
+    signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop())
+    signal.signal(signal.SIGINT, lambda signum, frame: worker.stop())
+
+    worker.run()
@@ -0,0 +1,108 @@
+from typing import BinaryIO, Iterable, Optional
+import os
+import threading
+import uuid
+
+REPORT_CACHE_MAX_MB = float(os.getenv("REPORT_CACHE_MAX_MB", "200"))
+REPORT_CACHE_MAX_ENTRIES = int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "100"))
+
+class ReportCache:
+    """Finished report files on disk (uploads/reports/<key>.pdf), shared by all workers.
+
+    Keys already include the data version, so an entry never goes stale; it is
+    only evicted, least recently used first, once the cache exceeds its size or
+    entry limit. Recency is the file mtime, refreshed on every hit. Hit counters
+    are per worker process.
+    """
+
+    def __init__(self, root: str = "uploads/reports", max_bytes: int = int(REPORT_CACHE_MAX_MB * 1024 * 1024),
+                 max_entries: int = REPORT_CACHE_MAX_ENTRIES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(self.root, exist_ok=True)
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.pdf")
+
+    def open(self, key: str) -> Optional[BinaryIO]:
+        """The cached report opened for reading, or None.
+
+        The open file stays readable even if another worker evicts the entry meanwhile.
+        """
+        path = self.path_for(key)
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another worker after the open; the handle still reads the file
+            pass
+        with self._lock:
+            self.hits += 1
+        return f
+
+    def put(self, key: str, parts: Iterable[bytes]):
+        """Store a report atomically, then evict down to the limits"""
+        temp_path = os.path.join(self.root, f".{uuid.uuid4().hex}.tmp")
+        try:
+            with open(temp_path, "wb") as f:
+                for part in parts:
+                    f.write(part)
+            os.replace(temp_path, self.path_for(key))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self.evict()
+
+    def _entries(self) -> list:
+        entries = []
+        for entry in os.scandir(self.root):
+            if entry.name.endswith(".pdf"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self) -> int:
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        while entries and (total > self.max_bytes or len(entries) > self.max_entries):
+            _, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+                evicted += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        with self._lock:
+            self.evictions += evicted
+        return evicted
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+report_cache = ReportCache()
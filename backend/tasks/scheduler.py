@@ -1,101 +1,435 @@
-import asyncio
-import schedule
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time as time_of_day, timedelta, timezone
+from typing import Callable, NamedTuple, Tuple
+import os
 import time
-from datetime import datetime
+
+import psycopg2
+from psycopg2.errors import QueryCanceled
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
-from models import get_db
+from models import get_db, SessionLocal, DATABASE_URL
+from services.delivery_queue import DeliveryQueue
+from services.job_runs import JobRunService
 from services.notification_service import NotificationService
+from services.notification_partitions import ensure_partitions
+from services.reminder_queue import ReminderQueue, ReminderWakeup
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Upper bound on one sleep; new reminder events also wake the loop via NOTIFY
+MAX_SLEEP_SECONDS = 300
+# Jobs running at the same time; a due job waits while every worker is busy
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", "2"))
+# How often a standby scheduler tries to take over the lease
+LEASE_RETRY_SECONDS = float(os.getenv("SCHEDULER_LEASE_RETRY_SECONDS", "30"))
+# Local time at which the notification digests go out
+DIGEST_TIME = os.getenv("NOTIFICATION_DIGEST_TIME", "10:30")
+# Postgres advisory lock key held by the active scheduler
+SCHEDULER_LOCK_KEY = 72010117
+
+Slots = Callable[[datetime], Tuple[datetime, datetime]]
+
+def local_time(day: date, at: time_of_day) -> datetime:
+    return datetime.combine(day, at).astimezone()
+
+def hourly() -> Slots:
+    def slots(now: datetime):
+        previous = now.replace(minute=0, second=0, microsecond=0)
+        return previous, previous + timedelta(hours=1)
+    return slots
+
+def daily(at: str) -> Slots:
+    at_time = time_of_day.fromisoformat(at)
+    def slots(now: datetime):
+        day = now.date()
+        if local_time(day, at_time) > now:
+            day -= timedelta(days=1)
+        return local_time(day, at_time), local_time(day + timedelta(days=1), at_time)
+    return slots
+
+def weekly(weekday: int, at: str) -> Slots:
+    at_time = time_of_day.fromisoformat(at)
+    def slots(now: datetime):
+        day = now.date() - timedelta(days=(now.weekday() - weekday) % 7)
+        if local_time(day, at_time) > now:
+            day -= timedelta(days=7)
+        return local_time(day, at_time), local_time(day + timedelta(days=7), at_time)
+    return slots
+
+def monthly(day_of_month: int, at: str) -> Slots:
+    """`day_of_month` up to 28, so every month has it"""
+    at_time = time_of_day.fromisoformat(at)
+    def slots(now: datetime):
+        day = now.date().replace(day=day_of_month)
+        if local_time(day, at_time) > now:
+            day = (day.replace(day=1) - timedelta(days=1)).replace(day=day_of_month)
+        following = (day.replace(day=1) + timedelta(days=32)).replace(day=day_of_month)
+        return local_time(day, at_time), local_time(following, at_time)
+    return slots
+
+class Job(NamedTuple):
+    name: str
+    run: Callable[[Session], int]  # returns rows affected
+    slots: Slots  # now -> (latest slot at or before now, next slot)
+    timeout: float  # seconds
+
+class RunningJob(NamedTuple):
+    job: Job
+    run_id: int
+    future: object
+    started: float
+
+class SchedulerLease:
+    """Postgres advisory lock held on a dedicated connection.
+
+    Only the holder runs jobs. If its process or connection dies, Postgres drops
+    the lock and a standby scheduler takes over on its next attempt.
+    """
+
+    def __init__(self, dsn: str = DATABASE_URL, key: int = SCHEDULER_LOCK_KEY):
+        self.dsn = dsn
+        self.key = key
+        self.conn = None
+
+    def acquire(self) -> bool:
+        try:
+            if self.conn is None:
+                # Keepalives so a half-open connection is noticed and the lock freed
+                self.conn = psycopg2.connect(
+                    self.dsn, keepalives=1, keepalives_idle=30, keepalives_interval=10, keepalives_count=3
+                )
+                self.conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            with self.conn.cursor() as cursor:
+                cursor.execute("SELECT pg_try_advisory_lock(%s)", (self.key,))
+                acquired = cursor.fetchone()[0]
+            if not acquired:
+                # Another scheduler holds it; an open connection must not pass for the lease
+                self.close()
+            return acquired
+        except psycopg2.Error as e:
+            logger.warning(f"Could not take the scheduler lease: {e}")
+            self.close()
+            return False
+
+    def is_held(self) -> bool:
+        """Whether this connection still holds the lock (it lives as long as the connection)"""
+        if self.conn is None:
+            return False
+        try:
+            with self.conn.cursor() as cursor:
+                # A bigint advisory key is stored as classid (high half) / objid (low half), objsubid 1
+                cursor.execute(
+                    "SELECT EXISTS (SELECT 1 FROM pg_locks WHERE locktype = 'advisory' "
+                    "AND classid = %s AND objid = %s AND objsubid = 1 AND pid = pg_backend_pid() AND granted)",
+                    (self.key >> 32, self.key & 0xFFFFFFFF)
+                )
+                held = cursor.fetchone()[0]
+            if not held:
+                logger.error("Scheduler lease connection no longer holds the lock")
+                self.close()
+            return held
+        except psycopg2.Error as e:
+            logger.error(f"Scheduler lease connection lost: {e}")
+            self.close()
+            return False
+
+    def release(self):
+        if self.conn is not None:
+            try:
+                with self.conn.cursor() as cursor:
+                    cursor.execute("SELECT pg_advisory_unlock(%s)", (self.key,))
+            except psycopg2.Error:
+                pass
+            self.close()
+
+    def close(self):
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except psycopg2.Error:
+                pass
+            self.conn = None
+
 class TaskScheduler:
-    def __init__(self):
+    def __init__(self, workers: int = SCHEDULER_WORKERS):
         self.is_running = False
+        self.is_leader = False
+        self.workers = workers
+        self.wakeup = ReminderWakeup()
+        self.lease = SchedulerLease()
+        self.executor = None
+        self.jobs = []
+        self.last_slots = {}
+        self.running = {}
 
     def setup_jobs(self):
         """Setup scheduled jobs"""
-        # Check for expiring contracts daily at 9 AM
-        schedule.every().day.at("09:00").do(self.check_contract_expiry)
-        
-        # Check for expiring documents daily at 9:15 AM
-        schedule.every().day.at("09:15").do(self.check_document_expiry)
-        
-        # Send payment reminders monthly on the 5th at 10 AM
-        schedule.every().month.do(self.send_payment_reminders)
-        
-        # Cleanup old notifications weekly on Sunday at 2 AM
-        schedule.every().sunday.at("02:00").do(self.cleanup_notifications)
+        # Contract and document expiry reminders are not polled: they fire from the
+        # reminder event queue (see fire_due_reminders)
+        self.jobs = [
+            # Payment reminders monthly on the 5th at 10 AM
+            Job("send_payment_reminders", self.send_payment_reminders, monthly(5, "10:00"), timeout=600),
+            # Cleanup old notifications weekly on Sunday at 2 AM
+            Job("cleanup_notifications", self.cleanup_notifications, weekly(6, "02:00"), timeout=3600),
+            # Drop delivered emails/SMS past their retention weekly on Sunday at 2:30 AM
+            Job("cleanup_delivery_outbox", self.cleanup_delivery_outbox, weekly(6, "02:30"), timeout=600),
+            # Keep monthly notification partitions created ahead of time
+            Job("create_notification_partitions", self.create_notification_partitions, daily("01:00"), timeout=300),
+            # Compress the reminders collected for digest types (NOTIFICATION_DIGEST_TYPES) daily,
+            # after the 09:00 reminders and the 10:00 payment run
+            Job("send_notification_digests", self.send_notification_digests, daily(DIGEST_TIME), timeout=600),
+            # Correct drift in the per-user unread counters hourly
+            Job("reconcile_unread_counters", self.reconcile_unread_counters, hourly(), timeout=600),
+        ]
         
         logger.info("Scheduled jobs configured")
 
     def check_contract_expiry(self):
-        """Check for contracts expiring soon"""
+        """Check all contracts for reminder tiers (full scan; the event queue normally covers this)"""
         try:
             db = next(get_db())
             notification_service = NotificationService(db)
             
-            # Check for contracts expiring in 30, 7, and 1 days
-            for days in [30, 7, 1]:
-                count = notification_service.notify_contract_expiry(days)
-                logger.info(f"Created {count} notifications for contracts expiring in {days} days")
+            # One pass over all reminder tiers (CONTRACT_REMINDER_TIERS); each tier fires once per contract
+            result = notification_service.notify_contract_expiry()
+            logger.info(f"Created {result['notifications_created']} notifications for expiring contracts "
+                        f"({result['duration_ms']} ms)")
             
             db.close()
         except Exception as e:
             logger.error(f"Error checking contract expiry: {e}")
 
     def check_document_expiry(self):
-        """Check for documents expiring soon"""
+        """Check all documents for reminder tiers (full scan; the event queue normally covers this)"""
         try:
             db = next(get_db())
             notification_service = NotificationService(db)
             
-            # Check for documents expiring in 30, 7, and 1 days
-            for days in [30, 7, 1]:
-                count = notification_service.notify_document_expiry(days)
-                logger.info(f"Created {count} notifications for documents expiring in {days} days")
+            # One pass over all reminder tiers (DOCUMENT_REMINDER_TIERS); each tier fires once per document
+            result = notification_service.notify_document_expiry()
+            logger.info(f"Created {result['notifications_created']} notifications for expiring documents "
+                        f"({result['duration_ms']} ms)")
             
             db.close()
         except Exception as e:
             logger.error(f"Error checking document expiry: {e}")
 
-    def send_payment_reminders(self):
+    def send_payment_reminders(self, db: Session) -> int:
         """Send payment reminder notifications"""
+        result = NotificationService(db).notify_payment_due()
+        logger.info(f"Created {result['notifications_created']} payment reminder notifications "
+                    f"({result['duration_ms']} ms)")
+        return result['notifications_created']
+
+    def cleanup_notifications(self, db: Session) -> int:
+        """Clean up old notifications"""
+        result = NotificationService(db).cleanup_old_notifications(90)
+        logger.info(f"Cleaned up old notifications: dropped {len(result['partitions_dropped'])} partitions, "
+                    f"deleted {result['notifications_deleted']} notifications and "
+                    f"{result['broadcasts_deleted']} broadcasts ({result['duration_ms']} ms)")
+        return result['notifications_deleted'] + result['broadcasts_deleted']
+
+    def cleanup_delivery_outbox(self, db: Session) -> int:
+        """Delete delivered messages past the retention period"""
+        deleted = DeliveryQueue(db).purge_sent()
+        logger.info(f"Deleted {deleted} delivered messages from the outbox")
+        return deleted
+
+    def send_notification_digests(self, db: Session) -> int:
+        """Send one digest per user for each digest notification type"""
+        result = NotificationService(db).send_digests()
+        return result['notifications_created']
+
+    def create_notification_partitions(self, db: Session) -> int:
+        """Create upcoming monthly notification partitions"""
+        created = ensure_partitions(db, months_ahead=3)
+        logger.info(f"Created {len(created)} notification partitions")
+        return len(created)
+
+    def reconcile_unread_counters(self, db: Session) -> int:
+        """Recount unread notification counters"""
+        result = NotificationService(db).reconcile_unread_counters()
+        logger.info(f"Checked {result['users_checked']} unread counters, fixed {result['counters_fixed']} "
+                    f"({result['duration_ms']} ms)")
+        return result['counters_fixed']
+
+    def execute_job(self, job: Job, run_id: int):
+        """Run one job on an executor thread and record the outcome in job_runs"""
+        db = SessionLocal()
+        rows_affected, error = None, None
         try:
+            # Postgres cancels any single statement that outlives the job's timeout
+            db.execute(text(f"SET statement_timeout = {int(job.timeout * 1000)}"))
+            rows_affected = job.run(db)
+            status = "success"
+        except OperationalError as e:
+            status = "timeout" if isinstance(e.orig, QueryCanceled) else "failed"
+            error = str(e.orig)
+            logger.error(f"Job {job.name} {status}: {error}")
+        except Exception as e:
+            status, error = "failed", str(e)
+            logger.exception(f"Job {job.name} failed")
+        finally:
+            try:
+                db.rollback()
+                db.execute(text("RESET statement_timeout"))
+            except Exception:
+                pass
+            db.close()
+        
+        runs_db = SessionLocal()
+        try:
+            JobRunService(runs_db).finish(run_id, status, rows_affected, error)
+        finally:
+            runs_db.close()
+
+    def become_leader(self) -> bool:
+        """Take the lease if no other scheduler holds it and pick up where the last leader stopped"""
+        if not self.lease.acquire():
+            return False
+        
+        db = next(get_db())
+        job_runs = JobRunService(db)
+        abandoned = job_runs.abandon_running()
+        if abandoned:
+            logger.warning(f"Marked {abandoned} unfinished job runs of the previous scheduler as abandoned")
+        
+        now = datetime.now().astimezone()
+        for job in self.jobs:
+            self.last_slots[job.name] = job_runs.last_slot(job.name)
+            previous, _ = job.slots(now)
+            last = self.last_slots[job.name]
+            if last is not None and last < previous:
+                # Several missed slots collapse into a single run
+                logger.info(f"Catching up {job.name}: last run covered {last.isoformat()}")
+        db.close()
+        
+        self.is_leader = True
+        logger.info("Scheduler lease acquired, running jobs")
+        self.rebuild_reminders_if_empty()
+        return True
+
+    def run_due_jobs(self):
+        """Submit every job whose latest slot has no run yet (a missed slot counts too)"""
+        now = datetime.now().astimezone()
+        for job in self.jobs:
+            if job.name in self.running or len(self.running) >= self.workers:
+                continue
+            previous, _ = job.slots(now)
+            last = self.last_slots.get(job.name)
+            if last is not None and last >= previous:
+                continue
+            
             db = next(get_db())
-            notification_service = NotificationService(db)
+            run_id = JobRunService(db).start(job.name, previous)
+            db.close()
+            
+            self.last_slots[job.name] = previous
+            future = self.executor.submit(self.execute_job, job, run_id)
+            self.running[job.name] = RunningJob(job, run_id, future, time.monotonic())
+
+    def reap_jobs(self):
+        """Forget finished jobs; mark the ones past their timeout.
+        
+        A thread cannot be killed: a timed-out job keeps its worker until it
+        returns (statement_timeout normally ends it), and is not started again meanwhile.
+        """
+        for name, running in list(self.running.items()):
+            if running.future.done():
+                del self.running[name]
+            elif time.monotonic() - running.started > running.job.timeout:
+                db = next(get_db())
+                if JobRunService(db).finish(running.run_id, "timeout",
+                                            error=f"Exceeded {running.job.timeout:.0f}s"):
+                    logger.error(f"Job {name} exceeded its {running.job.timeout:.0f}s timeout")
+                db.close()
+
+    def fire_due_reminders(self):
+        """Fire due reminder events; return when the next one is due (None if the queue is empty)"""
+        try:
+            db = next(get_db())
+            reminder_queue = ReminderQueue(db)
             
-            count = notification_service.notify_payment_due()
-            logger.info(f"Created {count} payment reminder notifications")
+            reminder_queue.fire_due()
+            next_fire_at = reminder_queue.next_fire_at()
             
             db.close()
+            return next_fire_at
         except Exception as e:
-            logger.error(f"Error sending payment reminders: {e}")
+            logger.error(f"Error firing reminders: {e}")
+            return None
 
-    def cleanup_notifications(self):
-        """Clean up old notifications"""
+    def rebuild_reminders_if_empty(self):
+        """Seed the reminder queue from existing contracts and documents on first start"""
         try:
             db = next(get_db())
-            notification_service = NotificationService(db)
+            reminder_queue = ReminderQueue(db)
             
-            count = notification_service.cleanup_old_notifications(90)
-            logger.info(f"Cleaned up {count} old notifications")
+            if reminder_queue.is_empty():
+                count = reminder_queue.rebuild()
+                logger.info(f"Reminder queue seeded for {count} contracts and documents")
             
             db.close()
         except Exception as e:
-            logger.error(f"Error cleaning up notifications: {e}")
+            logger.error(f"Error seeding reminder queue: {e}")
+
+    def seconds_until_next_wakeup(self, next_fire_at):
+        """Sleep until the next reminder, job slot or job timeout, whichever comes first"""
+        now = datetime.now(timezone.utc)
+        timeout = MAX_SLEEP_SECONDS
+        
+        for job in self.jobs:
+            _, following = job.slots(now.astimezone())
+            timeout = min(timeout, (following - now).total_seconds())
+        
+        for running in self.running.values():
+            timeout = min(timeout, running.started + running.job.timeout - time.monotonic())
+        
+        if self.running and len(self.running) >= self.workers:
+            # A due job is waiting for a free worker
+            timeout = min(timeout, 5)
+        
+        if next_fire_at is not None:
+            timeout = min(timeout, (next_fire_at - now).total_seconds())
+        
+        # Never spin, even when due events are held by another scheduler
+        return max(timeout, 1)
 
     def run_scheduler(self):
-        """Run the scheduler"""
+        """Run the scheduler; standby copies wait for the lease"""
         self.is_running = True
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scheduler-job")
         logger.info("Task scheduler started")
         
-        while self.is_running:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
+        try:
+            while self.is_running:
+                try:
+                    if not (self.is_leader and self.lease.is_held()):
+                        if self.is_leader:
+                            logger.error("Scheduler lease lost, waiting to take it again")
+                            self.is_leader = False
+                        if not self.become_leader():
+                            time.sleep(LEASE_RETRY_SECONDS)
+                            continue
+                    
+                    self.reap_jobs()
+                    self.run_due_jobs()
+                    next_fire_at = self.fire_due_reminders()
+                    self.wakeup.wait(self.seconds_until_next_wakeup(next_fire_at))
+                except Exception as e:
+                    logger.error(f"Scheduler error: {e}")
+                    time.sleep(LEASE_RETRY_SECONDS)
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.lease.release()
+            self.wakeup.close()
 
     def stop_scheduler(self):
         """Stop the scheduler"""
         self.is_running = False
-        logger.info("Task scheduler stopped")
\ No newline at end of file
+        logger.info("Task scheduler stopped")
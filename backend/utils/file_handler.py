@@ -1,13 +1,18 @@
 import os
 import uuid
+import hashlib
 import mimetypes
 from typing import List, Optional
 from fastapi import UploadFile, HTTPException
+from starlette.concurrency import run_in_threadpool
+
+MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", 10 * 1024 * 1024))  # 10MB
+CHUNK_SIZE = 1024 * 1024
 
 class FileHandler:
     def __init__(self, upload_dir: str = "uploads"):
         self.upload_dir = upload_dir
-        self.max_file_size = 10 * 1024 * 1024  # 10MB
+        self.max_file_size = MAX_FILE_SIZE
         self.allowed_extensions = {
             '.pdf', '.doc', '.docx', '.txt', '.jpg', '.jpeg', '.png', '.gif',
             '.xls', '.xlsx', '.ppt', '.pptx', '.zip', '.rar'
@@ -17,22 +22,68 @@ class FileHandler:
     def validate_file(self, file: UploadFile) -> bool:
         """Validate uploaded file"""
         # Check file size
-        if file.size > self.max_file_size:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File size exceeds maximum allowed size of {self.max_file_size // (1024*1024)}MB"
-            )
+        if file.size is not None and file.size > self.max_file_size:
+            self._raise_too_large()
         
-        # Check file extension
-        file_extension = os.path.splitext(file.filename)[1].lower()
+        self.validate_extension(file.filename)
+        return True
+
+    def validate_extension(self, filename: str) -> bool:
+        """Check that the file extension is allowed"""
+        file_extension = os.path.splitext(filename or "")[1].lower()
         if file_extension not in self.allowed_extensions:
             raise HTTPException(
                 status_code=400,
                 detail=f"File type not allowed. Allowed types: {', '.join(self.allowed_extensions)}"
             )
-        
         return True
 
+    def _raise_too_large(self):
+        raise HTTPException(
+            status_code=413,
+            detail=f"File size exceeds maximum allowed size of {self.max_file_size // (1024*1024)}MB"
+        )
+
+    async def save_upload(self, file: UploadFile) -> dict:
+        """Stream an upload to disk in chunks off the event loop.
+
+        The size limit is enforced while copying (the partial file is removed as
+        soon as it is exceeded) and the SHA-256 and real byte count are computed
+        in the same pass.
+        """
+        self.validate_extension(file.filename)
+        
+        file_path = os.path.join(self.upload_dir, self.generate_unique_filename(file.filename))
+        sha256 = hashlib.sha256()
+        size = 0
+        
+        buffer = await run_in_threadpool(open, file_path, "wb")
+        try:
+            while True:
+                chunk = await file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > self.max_file_size:
+                    self._raise_too_large()
+                await run_in_threadpool(self._write_chunk, buffer, sha256, chunk)
+        except BaseException:
+            await run_in_threadpool(buffer.close)
+            await run_in_threadpool(os.remove, file_path)
+            raise
+        await run_in_threadpool(buffer.close)
+        
+        return {
+            'file_path': file_path,
+            'file_size': size,
+            'sha256': sha256.hexdigest()
+        }
+
+    @staticmethod
+    def _write_chunk(buffer, sha256, chunk: bytes):
+        sha256.update(chunk)
+        buffer.write(chunk)
+
     def generate_unique_filename(self, original_filename: str) -> str:
         """Generate unique filename while preserving extension"""
         file_extension = os.path.splitext(original_filename)[1]
@@ -0,0 +1,63 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(sort_key: str, values: list) -> str:
+    """Encode the last row's sort values into an opaque cursor token"""
+    payload = {
+        "k": sort_key,
+        "v": [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(token: str, sort_key: str, columns: list) -> list:
+    """Decode a cursor token back into typed sort values"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        if payload["k"] != sort_key or len(payload["v"]) != len(columns):
+            raise ValueError("cursor does not match this listing")
+
+        values = []
+        for column, value in zip(columns, payload["v"]):
+            python_type = column.type.python_type
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+            values.append(value)
+        return values
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def paginate(query, sort_key: str, columns: list, limit: int,
+             cursor: Optional[str] = None, descending: bool = True) -> Tuple[List, Optional[str]]:
+    """Apply keyset pagination ordered by `columns`; return (rows, next_cursor).
+
+    `columns` must be unique together (end with the primary key) and be backed
+    by a composite index in the same order, so every page is a single index range scan.
+    """
+    if cursor:
+        values = decode_cursor(cursor, sort_key, columns)
+        # The redundant bound on the leading column lets the planner prune partitions
+        if descending:
+            query = query.filter(tuple_(*columns) < tuple_(*values), columns[0] <= values[0])
+        else:
+            query = query.filter(tuple_(*columns) > tuple_(*values), columns[0] >= values[0])
+
+    order_by = [c.desc() for c in columns] if descending else [c.asc() for c in columns]
+    rows = query.order_by(*order_by).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort_key, [getattr(last, c.key) for c in columns])
+
+    return rows, next_cursor
@@ -0,0 +1,48 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+class PasswordHasher:
+    """Runs bcrypt hashing and verification on a small dedicated thread pool.
+
+    bcrypt releases the GIL, so a bounded pool keeps a login burst from using
+    more than `max_workers` cores of a worker process. Requests beyond
+    `max_workers + max_pending` are rejected with 503 instead of queueing.
+    Callers await the result on the event loop, so a waiting login does not
+    hold one of the threads that serve sync routes.
+    """
+
+    def __init__(self, context: CryptContext, max_workers: int = 2, max_pending: int = 32):
+        self.context = context
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hasher")
+        self.slots = threading.BoundedSemaphore(max_workers + max_pending)
+
+    async def _run(self, fn, *args):
+        if not self.slots.acquire(blocking=False):
+            raise HTTPException(
+                status_code=503,
+                detail="Authentication service is busy, please retry",
+                headers={"Retry-After": "1"}
+            )
+        try:
+            future = self.executor.submit(fn, *args)
+        except Exception:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda f: self.slots.release())
+        return await asyncio.wrap_future(future)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(self.context.verify, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+password_hasher = PasswordHasher(
+    CryptContext(schemes=["bcrypt"], deprecated="auto"),
+    max_workers=int(os.getenv("PASSWORD_HASH_WORKERS", "2")),
+    max_pending=int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+)
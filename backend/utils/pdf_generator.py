@@ -1,90 +1,99 @@
 from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
 from reportlab.lib.units import cm
-import os
 from datetime import datetime
+from decimal import Decimal
+from typing import Iterable, NamedTuple
 
-class PDFGenerator:
-    def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self.setup_custom_styles()
+from services.pdf_engine import PdfEngine, get_pdf_engine
 
-    def setup_custom_styles(self):
-        """Setup custom paragraph styles"""
-        self.title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=18,
-            spaceAfter=30,
-            alignment=1,  # Center
-            fontName='Helvetica-Bold'
-        )
-        
-        self.subtitle_style = ParagraphStyle(
-            'CustomSubtitle',
-            parent=self.styles['Heading2'],
-            fontSize=14,
-            spaceAfter=20,
-            fontName='Helvetica-Bold'
-        )
-        
-        self.normal_style = ParagraphStyle(
-            'CustomNormal',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            spaceAfter=12,
-            fontName='Helvetica'
-        )
+# Contract rows per table chunk: one A4 page of the list at font size 8
+REPORT_PAGE_ROWS = 40
+
+class ReportSummary(NamedTuple):
+    total_contracts: int
+    active_contracts: int
+    active_rental_amount: Decimal
+
+class FlowableStream(list):
+    """The story of a document, pulled from an iterator as the doc template consumes it.
+
+    The template only ever looks at the front of the story, so keeping a couple
+    of flowables buffered is enough; finished ones are dropped as pages are laid out.
+    """
+
+    def __init__(self, flowables: Iterable, buffered: int = 2):
+        super().__init__()
+        self.source = iter(flowables)
+        self.buffered = buffered
+
+    def __len__(self):
+        while super().__len__() < self.buffered:
+            flowable = next(self.source, None)
+            if flowable is None:
+                break
+            self.append(flowable)
+        return super().__len__()
+
+class PDFGenerator:
+    def __init__(self, engine: PdfEngine = None):
+        # Styles are built once per process by the shared engine
+        self.engine = engine or get_pdf_engine()
+        self.title_style = self.engine.report_title_style
+        self.subtitle_style = self.engine.report_subtitle_style
+        self.normal_style = self.engine.report_normal_style
 
     def create_contract_summary_report(self, contracts: list, output_path: str):
-        """Generate contract summary report"""
-        doc = SimpleDocTemplate(output_path, pagesize=A4, rightMargin=2*cm, leftMargin=2*cm)
-        story = []
+        """Generate contract summary report from a list of contracts"""
+        total_contracts = active_contracts = 0
+        active_rental_amount = Decimal(0)
+        for contract in contracts:
+            total_contracts += 1
+            if contract.status == 'active':
+                active_contracts += 1
+                active_rental_amount += contract.rental_amount
         
+        summary = ReportSummary(total_contracts, active_contracts, active_rental_amount)
+        return self.build_contract_summary_report(summary, contracts, output_path)
+
+    def build_contract_summary_report(self, summary: ReportSummary, contracts: Iterable, output):
+        """Write the report to `output` (a path or file object), consuming `contracts` as it goes.
+
+        The list is laid out as one table per page of rows, so memory holds a page of
+        contracts plus the finished PDF pages, and no huge table has to be split.
+        """
+        doc = SimpleDocTemplate(output, pagesize=A4, rightMargin=2*cm, leftMargin=2*cm)
+        doc.build(FlowableStream(self._report_story(summary, contracts)))
+        return output
+
+    def _report_story(self, summary: ReportSummary, contracts: Iterable):
         # Title
-        title = Paragraph("ОТЧЕТ ПО ДОГОВОРАМ АРЕНДЫ", self.title_style)
-        story.append(title)
+        yield Paragraph("ОТЧЕТ ПО ДОГОВОРАМ АРЕНДЫ", self.title_style)
         
         # Date
-        date_text = Paragraph(f"Дата формирования: {datetime.now().strftime('%d.%m.%Y')}", self.normal_style)
-        story.append(date_text)
-        story.append(Spacer(1, 20))
+        yield Paragraph(f"Дата формирования: {datetime.now().strftime('%d.%m.%Y')}", self.normal_style)
+        yield Spacer(1, 20)
         
         # Summary statistics
-        total_contracts = len(contracts)
-        active_contracts = len([c for c in contracts if c.status == 'active'])
-        total_revenue = sum(c.rental_amount for c in contracts if c.status == 'active')
-        
         summary_data = [
             ['Показатель', 'Значение'],
-            ['Общее количество договоров', str(total_contracts)],
-            ['Активные договоры', str(active_contracts)],
-            ['Общая сумма аренды (активные)', f"{total_revenue:,.2f} тенге"]
+            ['Общее количество договоров', str(summary.total_contracts)],
+            ['Активные договоры', str(summary.active_contracts)],
+            ['Общая сумма аренды (активные)', f"{summary.active_rental_amount:,.2f} тенге"]
         ]
         
         summary_table = Table(summary_data, colWidths=[8*cm, 6*cm])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        summary_table.setStyle(self.engine.report_summary_table_style)
         
-        story.append(summary_table)
-        story.append(Spacer(1, 30))
+        yield summary_table
+        yield Spacer(1, 30)
         
         # Contracts table
-        if contracts:
-            story.append(Paragraph("СПИСОК ДОГОВОРОВ", self.subtitle_style))
-            
-            contract_data = [['№ Договора', 'Клиент', 'Адрес', 'Сумма', 'Статус', 'Срок']]
+        if summary.total_contracts:
+            yield Paragraph("СПИСОК ДОГОВОРОВ", self.subtitle_style)
             
+            header = ['№ Договора', 'Клиент', 'Адрес', 'Сумма', 'Статус', 'Срок']
+            contract_data = [header]
             for contract in contracts:
                 contract_data.append([
                     contract.contract_number,
@@ -94,20 +103,13 @@ class PDFGenerator:
                     contract.status,
                     f"{contract.start_date.strftime('%d.%m.%y')} - {contract.end_date.strftime('%d.%m.%y')}"
                 ])
-            
-            contracts_table = Table(contract_data, colWidths=[3*cm, 3.5*cm, 4*cm, 2*cm, 2*cm, 3*cm])
-            contracts_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            
-            story.append(contracts_table)
-        
-        doc.build(story)
-        return output_path
\ No newline at end of file
+                if len(contract_data) > REPORT_PAGE_ROWS:
+                    yield self._contracts_table(contract_data)
+                    contract_data = [header]
+            if len(contract_data) > 1:
+                yield self._contracts_table(contract_data)
+
+    def _contracts_table(self, contract_data: list) -> Table:
+        contracts_table = Table(contract_data, colWidths=[3*cm, 3.5*cm, 4*cm, 2*cm, 2*cm, 3*cm])
+        contracts_table.setStyle(self.engine.report_list_table_style)
+        return contracts_table
@@ -0,0 +1,28 @@
+from typing import List
+
+from sqlalchemy import or_
+
+from models.contract import ContractDB
+
+# Each column has a pg_trgm GIN index, so substring search stays index-backed
+CONTRACT_SEARCH_COLUMNS = (
+    ContractDB.contract_number,
+    ContractDB.client_name,
+    ContractDB.property_address,
+)
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards in user input"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def contains_any(columns, term: str):
+    """Case-insensitive substring match on any of the columns"""
+    pattern = f"%{escape_like(term)}%"
+    return or_(*[column.ilike(pattern, escape="\\") for column in columns])
+
+def contract_search_filter(term: str):
+    return contains_any(CONTRACT_SEARCH_COLUMNS, term)
+
+def tags_filter(column, tags: List[str], match_all: bool = True):
+    """One array predicate for all tags: `@>` (has all) or `&&` (has any), both GIN-indexable"""
+    return column.contains(tags) if match_all else column.overlap(tags)
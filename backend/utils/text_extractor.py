@@ -0,0 +1,123 @@
+import os
+import zipfile
+import logging
+import xml.etree.ElementTree as ET
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Keeps the tsvector well under PostgreSQL's 1MB limit
+MAX_TEXT_CHARS = 500_000
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+# DOCX/XLSX are zip archives: bound what they may unpack to (zip bombs)
+MAX_MEMBER_BYTES = 64 * 1024 * 1024
+MAX_ARCHIVE_BYTES = 256 * 1024 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+
+def extract_text(file_path: str, filename: str) -> Optional[str]:
+    """Extract plain text from PDF, DOCX, XLSX and TXT files for indexing.
+
+    `filename` supplies the extension (stored blobs have none). Returns None for
+    unsupported types or unreadable files.
+    """
+    extension = os.path.splitext(filename or "")[1].lower()
+    extractor = EXTRACTORS.get(extension)
+    if extractor is None:
+        return None
+
+    try:
+        text = extractor(file_path)
+    except Exception as e:
+        logger.warning(f"Text extraction failed for {filename}: {e}")
+        return None
+
+    text = " ".join(text.split()) if text else ""
+    return text[:MAX_TEXT_CHARS] or None
+
+def _extract_txt(file_path: str) -> str:
+    with open(file_path, "rb") as f:
+        raw = f.read(MAX_TEXT_CHARS * 4)
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode("cp1251", errors="replace")
+
+def _check_archive(archive: zipfile.ZipFile):
+    """Refuse archives that unpack past the limits.
+
+    zipfile never returns more than a member's declared size, so the central
+    directory bounds what reading the members can produce.
+    """
+    total = 0
+    for info in archive.infolist():
+        if info.file_size > MAX_MEMBER_BYTES:
+            raise ValueError(f"{info.filename} unpacks to {info.file_size} bytes")
+        total += info.file_size
+    if total > MAX_ARCHIVE_BYTES:
+        raise ValueError(f"archive unpacks to {total} bytes")
+
+def _extract_docx(file_path: str) -> str:
+    paragraphs = []
+    length = 0
+    with zipfile.ZipFile(file_path) as archive:
+        _check_archive(archive)
+        # Parsed as it is read, so only the current paragraph is held as a tree
+        parser = ET.XMLPullParser(events=("end",))
+        with archive.open("word/document.xml") as member:
+            for chunk in iter(lambda: member.read(READ_CHUNK_SIZE), b""):
+                parser.feed(chunk)
+                for _, element in parser.read_events():
+                    if element.tag != f"{WORD_NS}p":
+                        continue
+                    paragraph = "".join(node.text or "" for node in element.iter(f"{WORD_NS}t"))
+                    paragraphs.append(paragraph)
+                    length += len(paragraph)
+                    element.clear()
+                if length > MAX_TEXT_CHARS:
+                    break
+    return "\n".join(paragraphs)
+
+def _extract_xlsx(file_path: str) -> str:
+    from openpyxl import load_workbook
+
+    with zipfile.ZipFile(file_path) as archive:
+        _check_archive(archive)
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    parts = []
+    length = 0
+    try:
+        for sheet in workbook.worksheets:
+            for row in sheet.iter_rows(values_only=True):
+                line = " ".join(str(value) for value in row if value is not None)
+                if line:
+                    parts.append(line)
+                    length += len(line)
+                if length > MAX_TEXT_CHARS:
+                    return "\n".join(parts)
+    finally:
+        workbook.close()
+    return "\n".join(parts)
+
+def _extract_pdf(file_path: str) -> str:
+    from pypdf import PdfReader
+
+    reader = PdfReader(file_path)
+    parts = []
+    length = 0
+    for page in reader.pages:
+        page_text = page.extract_text() or ""
+        parts.append(page_text)
+        length += len(page_text)
+        if length > MAX_TEXT_CHARS:
+            break
+    return "\n".join(parts)
+
+EXTRACTORS = {
+    ".txt": _extract_txt,
+    ".docx": _extract_docx,
+    ".xlsx": _extract_xlsx,
+    ".pdf": _extract_pdf,
+}
@@ -29,10 +29,27 @@ interface NotificationProviderProps {
 
 export const NotificationProvider: React.FC<NotificationProviderProps> = ({ children }) => {
   const [notifications, setNotifications] = useState<Notification[]>([]);
+  const [unreadCount, setUnreadCount] = useState(0);
   const [loading, setLoading] = useState(false);
   const { isAuthenticated } = useAuth();
 
-  const unreadCount = notifications.filter(n => !n.is_read).length;
+  const loadUnreadCount = async () => {
+    try {
+      const response = await notificationService.getUnreadCount();
+      setUnreadCount(response.data.unread_count);
+    } catch (error) {
+      console.error('Error loading unread count:', error);
+    }
+  };
+
+  // Events carry the new total when the server knows it, otherwise a delta
+  const applyUnread = (data: any) => {
+    if (data.unread_count !== undefined && data.unread_count !== null) {
+      setUnreadCount(data.unread_count);
+    } else if (data.unread_delta) {
+      setUnreadCount(prev => Math.max(prev + data.unread_delta, 0));
+    }
+  };
 
   const loadNotifications = async () => {
     if (!isAuthenticated) return;
@@ -50,10 +67,12 @@ export const NotificationProvider: React.FC<NotificationProviderProps> = ({ chil
 
   const markAsRead = async (id: number) => {
     try {
+      const wasUnread = notifications.some(n => n.id === id && !n.is_read);
       await notificationService.update(id, { is_read: true });
       setNotifications(prev => 
         prev.map(n => n.id === id ? { ...n, is_read: true } : n)
       );
+      if (wasUnread) setUnreadCount(prev => Math.max(prev - 1, 0));
     } catch (error) {
       console.error('Error marking notification as read:', error);
     }
@@ -65,6 +84,7 @@ export const NotificationProvider: React.FC<NotificationProviderProps> = ({ chil
       setNotifications(prev => 
         prev.map(n => ({ ...n, is_read: true }))
       );
+      setUnreadCount(0);
     } catch (error) {
       console.error('Error marking all notifications as read:', error);
     }
@@ -72,21 +92,68 @@ export const NotificationProvider: React.FC<NotificationProviderProps> = ({ chil
 
   const deleteNotification = async (id: number) => {
     try {
+      const wasUnread = notifications.some(n => n.id === id && !n.is_read);
       await notificationService.delete(id);
       setNotifications(prev => prev.filter(n => n.id !== id));
+      if (wasUnread) setUnreadCount(prev => Math.max(prev - 1, 0));
     } catch (error) {
       console.error('Error deleting notification:', error);
     }
   };
 
   useEffect(() => {
-    if (isAuthenticated) {
+    if (!isAuthenticated) return;
+
+    // Changes are pushed by the server; the list is (re)loaded on every
+    // (re)connect, since events sent while disconnected are not replayed
+    const source = notificationService.subscribe();
+    source.onopen = () => {
       loadNotifications();
-      
-      // Poll for new notifications every 30 seconds
-      const interval = setInterval(loadNotifications, 30000);
-      return () => clearInterval(interval);
-    }
+      loadUnreadCount();
+    };
+
+    source.addEventListener('notification', (e) => {
+      const data = JSON.parse((e as MessageEvent).data);
+      applyUnread(data);
+      if (!data.notification) {
+        loadNotifications();
+        return;
+      }
+      setNotifications(prev => [
+        data.notification,
+        ...prev.filter(n => n.id !== data.notification.id),
+      ]);
+    });
+    source.addEventListener('read', (e) => {
+      const data = JSON.parse((e as MessageEvent).data);
+      applyUnread(data);
+      setNotifications(prev =>
+        prev.map(n => n.id === data.id ? { ...n, is_read: data.is_read } : n)
+      );
+    });
+    source.addEventListener('deleted', (e) => {
+      const data = JSON.parse((e as MessageEvent).data);
+      applyUnread(data);
+      setNotifications(prev => prev.filter(n => n.id !== data.id));
+    });
+    source.addEventListener('read_all', (e) => {
+      const data = JSON.parse((e as MessageEvent).data);
+      setNotifications(prev => prev.map(n => ({ ...n, is_read: true })));
+      // Broadcasts that arrived meanwhile stay unread
+      setUnreadCount(data.unread_count ?? 0);
+    });
+    ['broadcast', 'unread'].forEach(eventName =>
+      source.addEventListener(eventName, (e) => {
+        applyUnread(JSON.parse((e as MessageEvent).data));
+        loadNotifications();
+      })
+    );
+    source.addEventListener('resync', () => {
+      loadNotifications();
+      loadUnreadCount();
+    });
+
+    return () => source.close();
   }, [isAuthenticated]);
 
   const value: NotificationContextType = {
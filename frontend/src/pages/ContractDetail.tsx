@@ -82,8 +82,12 @@ const ContractDetail: React.FC = () => {
       link.click();
       link.remove();
       window.URL.revokeObjectURL(url);
-    } catch (error) {
-      message.error('Ошибка скачивания договора');
+    } catch (error: any) {
+      if (error.response?.status === 409) {
+        message.info('Договор ещё формируется, попробуйте через несколько секунд');
+      } else {
+        message.error('Ошибка скачивания договора');
+      }
     }
   };
 
@@ -26,7 +26,7 @@ import {
   DeleteOutlined,
   EyeOutlined,
 } from '@ant-design/icons';
-import { Link } from 'react-router-dom';
+import { Link, useSearchParams } from 'react-router-dom';
 import dayjs from 'dayjs';
 import { contractService, Contract, ContractCreate } from '../services/api';
 
@@ -40,17 +40,19 @@ const Contracts: React.FC = () => {
   const [modalVisible, setModalVisible] = useState(false);
   const [editingContract, setEditingContract] = useState<Contract | null>(null);
   const [searchText, setSearchText] = useState('');
-  const [statusFilter, setStatusFilter] = useState<string>('');
+  const [searchParams] = useSearchParams();
+  const [statusFilter, setStatusFilter] = useState<string>(searchParams.get('status') || '');
+  const expiringSoon = searchParams.get('expiring_soon') === 'true';
   const [form] = Form.useForm();
 
   useEffect(() => {
     loadContracts();
-  }, []);
+  }, [expiringSoon]);
 
   const loadContracts = async () => {
     try {
       setLoading(true);
-      const response = await contractService.getAll();
+      const response = await contractService.getAll(expiringSoon ? { expiring_soon: true } : undefined);
       setContracts(response.data);
     } catch (error) {
       message.error('Ошибка загрузки договоров');
@@ -119,8 +121,31 @@ const Contracts: React.FC = () => {
       link.click();
       link.remove();
       window.URL.revokeObjectURL(url);
+    } catch (error: any) {
+      if (error.response?.status === 409) {
+        message.info('Договор ещё формируется, попробуйте через несколько секунд');
+      } else {
+        message.error('Ошибка скачивания договора');
+      }
+    }
+  };
+
+  const handleDownloadReport = async () => {
+    try {
+      const params: any = {};
+      if (statusFilter) params.status = statusFilter;
+      if (expiringSoon) params.expiring_soon = true;
+      const response = await contractService.downloadReport(params);
+      const url = window.URL.createObjectURL(new Blob([response.data]));
+      const link = document.createElement('a');
+      link.href = url;
+      link.setAttribute('download', `contracts_report_${dayjs().format('YYYY-MM-DD')}.pdf`);
+      document.body.appendChild(link);
+      link.click();
+      link.remove();
+      window.URL.revokeObjectURL(url);
     } catch (error) {
-      message.error('Ошибка скачивания договора');
+      message.error('Ошибка формирования отчёта');
     }
   };
 
@@ -257,6 +282,13 @@ const Contracts: React.FC = () => {
             </Select>
           </Col>
           <Col xs={24} sm={24} md={12} style={{ textAlign: 'right' }}>
+            <Button
+              icon={<DownloadOutlined />}
+              onClick={handleDownloadReport}
+              style={{ marginRight: 8 }}
+            >
+              Отчёт (PDF)
+            </Button>
             <Button
               type="primary"
               icon={<PlusOutlined />}
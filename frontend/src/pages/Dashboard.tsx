@@ -23,7 +23,7 @@ import {
 } from '@ant-design/icons';
 import { Link } from 'react-router-dom';
 import dayjs from 'dayjs';
-import { contractService, documentService, notificationService, Contract, Document, Notification } from '../services/api';
+import { dashboardService, DashboardContract, DashboardNotification, DashboardSummary } from '../services/api';
 import { useAuth } from '../contexts/AuthContext';
 
 const { Title, Text } = Typography;
@@ -38,9 +38,10 @@ const Dashboard: React.FC = () => {
     unreadNotifications: 0,
     monthlyRevenue: 0,
   });
-  const [recentContracts, setRecentContracts] = useState<Contract[]>([]);
-  const [expiringContracts, setExpiringContracts] = useState<Contract[]>([]);
-  const [recentNotifications, setRecentNotifications] = useState<Notification[]>([]);
+  const [recentContracts, setRecentContracts] = useState<DashboardContract[]>([]);
+  const [expiringContracts, setExpiringContracts] = useState<DashboardContract[]>([]);
+  const [expiringCount, setExpiringCount] = useState(0);
+  const [recentNotifications, setRecentNotifications] = useState<DashboardNotification[]>([]);
 
   useEffect(() => {
     loadDashboardData();
@@ -49,50 +50,23 @@ const Dashboard: React.FC = () => {
   const loadDashboardData = async () => {
     try {
       setLoading(true);
-      
-      // Load contracts
-      const contractsResponse = await contractService.getAll({ limit: 100 });
-      const contracts = contractsResponse.data;
-      
-      // Load documents
-      const documentsResponse = await documentService.getAll({ limit: 100 });
-      const documents = documentsResponse.data;
-      
-      // Load notifications
-      const notificationsResponse = await notificationService.getAll({ limit: 10 });
-      const notifications = notificationsResponse.data;
 
-      // Calculate statistics
-      const totalContracts = contracts.length;
-      const activeContracts = contracts.filter((c: Contract) => c.status === 'active').length;
-      const totalDocuments = documents.length;
-      const unreadNotifications = notifications.filter((n: Notification) => !n.is_read).length;
-      const monthlyRevenue = contracts
-        .filter((c: Contract) => c.status === 'active')
-        .reduce((sum: number, c: Contract) => sum + Number(c.rental_amount), 0);
+      // All statistics are aggregated on the server
+      const summaryResponse = await dashboardService.getSummary({ expiring_days: 30, recent_limit: 5 });
+      const summary: DashboardSummary = summaryResponse.data;
 
       setStats({
-        totalContracts,
-        activeContracts,
-        totalDocuments,
-        unreadNotifications,
-        monthlyRevenue,
+        totalContracts: summary.total_contracts,
+        activeContracts: summary.active_contracts,
+        totalDocuments: summary.total_documents,
+        unreadNotifications: summary.unread_notifications,
+        monthlyRevenue: Number(summary.monthly_revenue),
       });
 
-      // Set recent contracts (last 5)
-      setRecentContracts(contracts.slice(0, 5));
-
-      // Find expiring contracts (next 30 days)
-      const thirtyDaysFromNow = dayjs().add(30, 'day');
-      const expiring = contracts.filter((c: Contract) => 
-        dayjs(c.end_date).isBefore(thirtyDaysFromNow) && 
-        dayjs(c.end_date).isAfter(dayjs()) &&
-        c.status === 'active'
-      );
-      setExpiringContracts(expiring);
-
-      // Set recent notifications
-      setRecentNotifications(notifications.slice(0, 5));
+      setRecentContracts(summary.recent_contracts);
+      setExpiringContracts(summary.expiring_soon);
+      setExpiringCount(summary.expiring_contracts);
+      setRecentNotifications(summary.recent_notifications);
 
     } catch (error) {
       console.error('Error loading dashboard data:', error);
@@ -106,7 +80,7 @@ const Dashboard: React.FC = () => {
       title: 'Номер договора',
       dataIndex: 'contract_number',
       key: 'contract_number',
-      render: (text: string, record: Contract) => (
+      render: (text: string, record: DashboardContract) => (
         <Link to={`/contracts/${record.id}`}>{text}</Link>
       ),
     },
@@ -119,7 +93,7 @@ const Dashboard: React.FC = () => {
       title: 'Сумма аренды',
       dataIndex: 'rental_amount',
       key: 'rental_amount',
-      render: (amount: number) => `${amount.toLocaleString()} ₸`,
+      render: (amount: number) => `${Number(amount).toLocaleString()} ₸`,
     },
     {
       title: 'Статус',
@@ -218,10 +192,10 @@ const Dashboard: React.FC = () => {
       </Row>
 
       {/* Alerts for expiring contracts */}
-      {expiringContracts.length > 0 && (
+      {expiringCount > 0 && (
         <Alert
           message="Внимание!"
-          description={`${expiringContracts.length} договор(ов) истекают в ближайшие 30 дней`}
+          description={`${expiringCount} договор(ов) истекают в ближайшие 30 дней`}
           type="warning"
           icon={<WarningOutlined />}
           style={{ marginBottom: '24px' }}
@@ -33,6 +33,7 @@ import {
   FileUnknownOutlined,
   EyeOutlined,
 } from '@ant-design/icons';
+import { useSearchParams } from 'react-router-dom';
 import dayjs from 'dayjs';
 import { documentService, contractService, Document, Contract } from '../services/api';
 
@@ -49,18 +50,20 @@ const Documents: React.FC = () => {
   const [searchText, setSearchText] = useState('');
   const [contractFilter, setContractFilter] = useState<number | undefined>();
   const [uploading, setUploading] = useState(false);
+  const [searchParams] = useSearchParams();
+  const expiringSoon = searchParams.get('expiring_soon') === 'true';
   const [uploadForm] = Form.useForm();
   const [editForm] = Form.useForm();
 
   useEffect(() => {
     loadDocuments();
     loadContracts();
-  }, []);
+  }, [expiringSoon]);
 
   const loadDocuments = async () => {
     try {
       setLoading(true);
-      const response = await documentService.getAll();
+      const response = await documentService.getAll(expiringSoon ? { expiring_soon: true } : undefined);
       setDocuments(response.data);
     } catch (error) {
       message.error('Ошибка загрузки документов');
@@ -25,6 +25,7 @@ import {
   CheckOutlined,
   CheckCircleOutlined,
 } from '@ant-design/icons';
+import { Link } from 'react-router-dom';
 import dayjs from 'dayjs';
 import relativeTime from 'dayjs/plugin/relativeTime';
 import { useNotifications } from '../contexts/NotificationContext';
@@ -259,11 +260,17 @@ const Notifications: React.FC = () => {
                           fontSize: '14px', 
                           color: notification.is_read ? '#8c8c8c' : '#595959',
                           display: 'block',
-                          marginBottom: '8px'
+                          marginBottom: '8px',
+                          whiteSpace: 'pre-line'
                         }}
                       >
                         {notification.message}
                       </Text>
+                      {notification.link && (
+                        <Link to={notification.link} style={{ display: 'block', marginBottom: '8px' }}>
+                          Открыть список
+                        </Link>
+                      )}
                       <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center' }}>
                         <Text 
                           type="secondary" 
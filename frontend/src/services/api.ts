@@ -20,6 +20,10 @@ export const notificationsAPI = axios.create({
   baseURL: `${API_BASE_URL}/api/notifications`,
 });
 
+export const dashboardAPI = axios.create({
+  baseURL: `${API_BASE_URL}/api/dashboard`,
+});
+
 // Add token to requests
 const addAuthToken = (config: any) => {
   const token = localStorage.getItem('token');
@@ -32,6 +36,7 @@ const addAuthToken = (config: any) => {
 contractsAPI.interceptors.request.use(addAuthToken);
 documentsAPI.interceptors.request.use(addAuthToken);
 notificationsAPI.interceptors.request.use(addAuthToken);
+dashboardAPI.interceptors.request.use(addAuthToken);
 
 // Response interceptor to handle 401 errors
 const handle401 = (error: any) => {
@@ -62,6 +67,11 @@ notificationsAPI.interceptors.response.use(
   handle401
 );
 
+dashboardAPI.interceptors.response.use(
+  (response) => response,
+  handle401
+);
+
 // Types
 export interface Contract {
   id: number;
@@ -77,6 +87,7 @@ export interface Contract {
   end_date: string;
   status: string;
   contract_file_path?: string;
+  render_status?: string;
   created_by: number;
   created_at: string;
   updated_at: string;
@@ -119,9 +130,44 @@ export interface Notification {
   related_contract_id?: number;
   related_document_id?: number;
   scheduled_date?: string;
+  link?: string;
+  created_at: string;
+  is_broadcast?: boolean;
+}
+
+export interface DashboardContract {
+  id: number;
+  contract_number: string;
+  client_name: string;
+  rental_amount: number;
+  status: string;
+  end_date: string;
+}
+
+export interface DashboardNotification {
+  id: number;
+  title: string;
+  message: string;
+  type: string;
+  is_read: boolean;
   created_at: string;
 }
 
+export interface DashboardSummary {
+  total_contracts: number;
+  active_contracts: number;
+  contracts_by_status: Record<string, number>;
+  monthly_revenue: number;
+  expiring_contracts: number;
+  expiring_days: number;
+  total_documents: number;
+  unread_notifications: number;
+  recent_contracts: DashboardContract[];
+  expiring_soon: DashboardContract[];
+  recent_notifications: DashboardNotification[];
+  generated_at: string;
+}
+
 // API Functions
 export const contractService = {
   getAll: (params?: any) => contractsAPI.get('/', { params }),
@@ -130,6 +176,8 @@ export const contractService = {
   update: (id: number, data: Partial<ContractCreate>) => contractsAPI.put(`/${id}`, data),
   delete: (id: number) => contractsAPI.delete(`/${id}`),
   download: (id: number) => contractsAPI.get(`/${id}/download`, { responseType: 'blob' }),
+  downloadReport: (params?: any) => contractsAPI.get('/report', { params, responseType: 'blob' }),
+  getRenderStatus: (id: number) => contractsAPI.get(`/${id}/render-status`),
 };
 
 export const documentService = {
@@ -148,6 +196,18 @@ export const notificationService = {
   getById: (id: number) => notificationsAPI.get(`/${id}`),
   create: (data: any) => notificationsAPI.post('/', data),
   update: (id: number, data: any) => notificationsAPI.put(`/${id}`, data),
+  getUnreadCount: () => notificationsAPI.get('/unread-count'),
   markAllRead: () => notificationsAPI.put('/mark-all-read'),
   delete: (id: number) => notificationsAPI.delete(`/${id}`),
+  // Server-Sent Events; EventSource cannot set headers, so the token goes in the URL
+  subscribe: () => {
+    const token = localStorage.getItem('token') || '';
+    return new EventSource(
+      `${API_BASE_URL}/api/notifications/stream?token=${encodeURIComponent(token)}`
+    );
+  },
+};
+
+export const dashboardService = {
+  getSummary: (params?: any) => dashboardAPI.get('/summary', { params }),
 };
\ No newline at end of file